@@ -1,38 +1,18 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import warnings
 import logging
-import io
 import os
-from datetime import datetime
-
-# Configure logging
-if not os.path.exists('logs'):
-    os.makedirs('logs')
-
-log_filename = f"logs/app_{datetime.now().strftime('%Y%m%d')}.log"
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_filename),
-        logging.StreamHandler(io.StringIO()) # Keep stream handler for UI display
-    ]
-)
 
-# Capture log stream for UI display
-log_capture_string = io.StringIO()
-ch = logging.StreamHandler(log_capture_string)
-ch.setLevel(logging.INFO)
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-ch.setFormatter(formatter)
-logging.getLogger().addHandler(ch)
+from netflix_core import analytics, figures, logbuffer, logpipeline, profiling, schema, snapshot, streaming
+from netflix_core.filters import Filters
+from netflix_core.catalog import CatalogSource
+
+# Configure logging: records are queued here and written by a background
+# listener (rotating file + in-memory buffer). Installed once per process.
+log_pipeline = logpipeline.install()
+log_buffer = log_pipeline.buffer
 
 logging.info("Application started")
 
@@ -272,1013 +252,1118 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+# Simulator market status label and accent colour per saturation band
+SATURATION_STYLE = {
+    "Blue Ocean": ("🔵 Blue Ocean (High Opportunity)", "#38ef7d"),
+    "Competitive": ("🟡 Competitive (Moderate)", "#fb923c"),
+    "Saturated": ("🔴 Saturated (High Competition)", "#ff6b6b"),
+}
+
 # --- Data Loading and Preprocessing ---
-@st.cache_data
-def load_data():
-    logging.info("Attempting to load data from netflix.csv")
-    try:
-        df = pd.read_csv("netflix.csv")
-        logging.info(f"Data loaded successfully. Shape: {df.shape}")
-    except FileNotFoundError:
-        logging.error("File 'netflix.csv' not found.")
-        st.error("❌ File 'netflix.csv' not found in the current directory.")
+DATA_PATH = "netflix.csv"
+
+@st.cache_resource
+def catalog_source():
+    # Survives changes to the CSV, so appended rows extend the previous catalog
+    return CatalogSource(DATA_PATH)
+
+@st.cache_resource(max_entries=1)
+def load_catalog(source_stat):
+    # source_stat only keys the in-process cache; the on-disk snapshot is keyed on content.
+    # One Catalog per process, shared by every session without copying: treat it as read-only
+    logging.info(f"Attempting to load data from {DATA_PATH}")
+    if not os.path.exists(DATA_PATH):
+        logging.error(f"File '{DATA_PATH}' not found.")
+        st.error(f"❌ File '{DATA_PATH}' not found in the current directory.")
         return None
+    data = catalog_source().get()
+    # Build what every session needs up front; the co-occurrence matrix waits for the heatmap
+    for stage, part in [("load_kpis", "kpis"), ("load_unnested_data", "bridges"),
+                        ("load_catalog_index", "index"), ("load_saturation_cube", "saturation_cube"),
+                        ("load_aggregates", "aggregates")]:
+        with profiler().span(stage):
+            data.warm(part)
+    return data
 
-    # Handling missing values
-    logging.info("Preprocessing: Handling missing values")
-    df["director"].fillna("Unknown", inplace=True)
-    df["cast"].fillna("Unknown", inplace=True)
-    df["country"].fillna("Unknown", inplace=True)
-    
-    # Date processing
-    logging.info("Preprocessing: Parsing dates")
-    df["date_added"] = pd.to_datetime(df["date_added"], errors='coerce')
-    df["year_added"] = df["date_added"].dt.year
-    df["month_added"] = df["date_added"].dt.month_name()
-    
-    # Duration processing
-    logging.info("Preprocessing: Extracting durations")
-    df["Movie_duration"] = df.loc[df["type"] == "Movie", "duration"].astype(str).str.split(" ").str[0].astype(float)
-    df["Series_duration"] = df.loc[df["type"] == "TV Show", "duration"].astype(str).str.split(" ").str[0].astype(float)
-    
-    # Rating categorization
-    logging.info("Preprocessing: Categorizing ratings")
-    rating_map = {
-        "TV-MA": "Adults", "R": "Adults", "NC-17": "Adults", "UR": "Adults", "NR": "Adults",
-        "TV-14": "Teens", "PG-13": "Teens",
-        "TV-PG": "Older Kids", "TV-Y7": "Older Kids", "TV-Y7-FV": "Older Kids", "PG": "Older Kids",
-        "TV-Y": "Kids", "TV-G": "Kids", "G": "Kids"
-    }
-    df["Content_For"] = df["rating"].map(rating_map)
-    
-    return df
-
-@st.cache_data
-def load_unnested_data(df):
-    logging.info("Preprocessing: Unnesting multi-value columns")
-    def unnest_col(df, col, new_col_name):
-        return df[col].astype(str).str.split(", ").explode().reset_index().rename(columns={col: new_col_name, "index": "original_index"})
-
-    actors = unnest_col(df, "cast", "actor")
-    directors = unnest_col(df, "director", "director_unnested")
-    countries = unnest_col(df, "country", "country_unnested")
-    genres = unnest_col(df, "listed_in", "genre")
-    
-    return actors, directors, countries, genres
+@st.cache_resource(max_entries=1)
+def stream_catalog(source_stat):
+    # Above NETFLIX_STREAMING_BYTES the catalog never sits in memory: only its aggregates, folded chunk by chunk
+    logging.info(f"{DATA_PATH} is larger than {streaming.STREAMING_BYTES:,} bytes; streaming its aggregates")
+    return streaming.stream_aggregates(DATA_PATH)
 
-df = load_data()
+@st.cache_resource
+def figure_cache():
+    # One LRU per server process, shared by every session
+    return figures.FigureCache(max_entries=128, max_bytes=64 * 1024 * 1024)
 
-if df is not None:
-    actors_df, directors_df, countries_df, genres_df = load_unnested_data(df)
+@st.cache_resource
+def profiler():
+    # Recent stage timings for the whole process, shown under App Logs > Performance
+    return profiling.Profiler()
 
-    # Enhanced Feature Cards
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.markdown("""
-        <div class='card' style='background: linear-gradient(135deg, #E50914 0%, #b20710 100%);'>
-            <div style='font-size: 2rem; margin-bottom: 0.25rem;'>📊</div>
-            <h3 style='color: white !important; margin: 0.25rem 0; font-size: 1.1rem;'>Data</h3>
-            <p style='margin: 0; font-size: 0.8rem; color: rgba(255,255,255,0.8);'>Content Library</p>
+def chart_selection(chart_id):
+    # Sidebar filters apply to every chart, a cross-filter to every chart but the one it was clicked in.
+    # Returns (packed row bitmap or None for every row, digests identifying it)
+    if streamed is not None:
+        # Streamed aggregates cover every row; there is nothing to filter
+        return None, []
+    engine = catalog.filter_engine
+    bitmap, digests = None, []
+    if active_filters.active:
+        bitmap, digests = engine.bitmap(active_filters), [active_filters.digest]
+    cross = st.session_state.get("cross_filter")
+    if cross is not None and cross[0] != chart_id:
+        # Each clicked point selects its own rows; several points select any of them
+        clicked = engine.union(*cross[1])
+        bitmap = clicked if bitmap is None else bitmap & clicked
+        digests.append("|".join(point.digest for point in cross[1]))
+    return bitmap, digests
+
+def cached_chart(chart_id, build, **params):
+    # Aggregation and Plotly construction run once per dataset version, row selection and parameter set;
+    # builders count the selected rows of the full catalog through its shared aggregation engine
+    selection, digests = chart_selection(chart_id)
+    fingerprint = "+".join([dataset_version] + digests)
+
+    def timed_build(**kwargs):
+        with profiler().span(f"build:{chart_id}"):
+            return build(selection, **kwargs)
+
+    with profiler().span(f"chart:{chart_id}"):
+        return figure_cache().get_or_build(chart_id, fingerprint, timed_build, **params)
+
+# Charts whose clicks cross-filter every other chart: chart id -> (title, clicked point -> Filters).
+# A heatmap cell is one genre AND one country, so clicking two cells never selects the other two corners
+CROSS_FILTER_CHARTS = {
+    "top_countries": ("Top 15 Countries", lambda point: Filters.make(countries=[point["x"]])),
+    "opportunity_heatmap": ("Opportunity Heatmap",
+                            lambda point: Filters.make(genres=[point["y"]], countries=[point["x"]])),
+}
+
+def select_cross_filter(chart_id):
+    points = st.session_state[f"select_{chart_id}"]["selection"]["points"]
+    if points:
+        to_filters = CROSS_FILTER_CHARTS[chart_id][1]
+        st.session_state["cross_filter"] = (chart_id, tuple(sorted({to_filters(point) for point in points})))
+    elif st.session_state.get("cross_filter", (None,))[0] == chart_id:
+        del st.session_state["cross_filter"]
+
+def clear_cross_filter():
+    cross = st.session_state.pop("cross_filter", None)
+    if cross is not None:
+        # Drops the chart's selection too, so it is not restored on the next click
+        st.session_state.pop(f"select_{cross[0]}", None)
+
+def selectable_chart(fig, chart_id):
+    # Clicking points (bars, heatmap cells) sets the cross-filter; clearing the selection removes it
+    st.plotly_chart(fig, use_container_width=True, key=f"select_{chart_id}", selection_mode="points",
+                    on_select=lambda: select_cross_filter(chart_id))
+
+# --- Chart Builders ---
+# Each returns the figure (plus any summary its caption needs); see cached_chart()
+def chart_data(name, *args, selection=None, **kwargs):
+    # The streamed aggregates mirror the analytics functions, for every row of the catalog
+    if streamed is not None:
+        return getattr(streamed, name)(*args, **kwargs)
+    return getattr(analytics, name)(catalog, *args, selection=selection, **kwargs)
+
+
+def duration_values(content_type, selection):
+    # (values, weights) to bin: raw durations, or distinct durations weighted by their titles when streaming
+    if streamed is not None:
+        histogram = streamed.duration_histogram(content_type)
+        return histogram.index.to_numpy(dtype=np.float64), histogram.to_numpy()
+    return analytics.durations(catalog, content_type, selection=selection), None
+
+
+# plotly.express is imported inside each builder so it loads on the first
+# figure cache miss, not on a cold start that lands on a chart-free tab
+def build_type_distribution(selection):
+    import plotly.express as px
+
+    type_counts = chart_data('type_distribution', selection=selection)
+
+    fig = px.pie(type_counts, values='Count', names='Type', 
+                color='Type', color_discrete_map={'Movie':'#E50914', 'TV Show':'#564d4d'},
+                title='Content Type Distribution',
+                hole=0.4)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig, type_counts
+
+
+def build_top_countries(selection):
+    import plotly.express as px
+
+    top_countries = chart_data('top_entities', 'country', 15, exclude=['Unknown'], label='Country', selection=selection)
+
+    fig = px.bar(top_countries, x='Country', y='Count',
+                color='Count', color_continuous_scale='Reds',
+                title='Top 15 Countries by Content Volume')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1'),
+        xaxis_tickangle=-45
+    )
+    return fig, top_countries
+
+
+def build_country_type(selection):
+    import plotly.express as px
+
+    country_type_df = chart_data('country_type_counts', 5, selection=selection)
+    fig = px.bar(country_type_df, x='Country', y='Count', color='Type',
+                color_discrete_map={'Movie':'#E50914', 'TV Show':'#564d4d'},
+                title='Content Type Distribution by Top 5 Countries',
+                barmode='group')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig
+
+
+def build_addition_trend(selection):
+    import plotly.express as px
+
+    df_year = chart_data('additions_by_year', selection=selection)
+
+    fig = px.area(df_year, x='year_added', y='Count', color='type',
+                color_discrete_map={'Movie':'#E50914', 'TV Show':'#ffffff'},
+                title='Content Addition Trend Over Time')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig, df_year
+
+
+def build_monthly_additions(selection):
+    import plotly.express as px
+
+    month_counts = chart_data('monthly_additions', selection=selection)
+
+    fig = px.bar(month_counts, x='Month', y='Count',
+                color='Count', color_continuous_scale='Reds',
+                title='Content Addition by Month')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1'),
+        xaxis_tickangle=-45
+    )
+    return fig
+
+
+def build_top_genres(selection):
+    import plotly.express as px
+
+    top_genres = chart_data('top_entities', 'genre', 15, label='Genre', selection=selection)
+
+    fig = px.bar(top_genres, x='Count', y='Genre', orientation='h',
+                color='Count', color_continuous_scale='Reds',
+                title='Most Popular Genres on Netflix')
+    fig.update_layout(
+        yaxis={'categoryorder':'total ascending'},
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig, top_genres
+
+
+def build_movie_duration(selection):
+    # Binned server-side: only the bars are sent to the browser
+    values, weights = duration_values('Movie', selection)
+    fig = figures.binned_histogram(values, weights=weights,
+                                   nbins=30, x_label='Movie_duration', color='#E50914',
+                                   title='Distribution of Movie Duration (Minutes)')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig
+
+
+def build_series_duration(selection):
+    values, weights = duration_values('TV Show', selection)
+    fig = figures.binned_histogram(values, weights=weights,
+                                   nbins=15, x_label='Series_duration', color='#ffffff',
+                                   title='Distribution of TV Show Duration (Seasons)')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig
+
+
+def build_release_years(selection):
+    import plotly.express as px
+
+    year_counts = chart_data('release_year_counts', 30, selection=selection)
+
+    fig = px.bar(year_counts, x='release_year', y='Count', color='type',
+                color_discrete_map={'Movie':'#E50914', 'TV Show':'#ffffff'},
+                title='Content Released in Last 30 Years',
+                barmode='stack')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig
+
+
+def build_audience_distribution(selection):
+    import plotly.express as px
+
+    audience_counts = chart_data('audience_distribution', selection=selection)
+
+    fig = px.pie(audience_counts, values='Count', names='Audience',
+                color_discrete_sequence=['#E50914', '#ff6b6b', '#c92a2a', '#862e9c'],
+                title='Target Audience Distribution',
+                hole=0.4)
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig, audience_counts
+
+
+def build_top_ratings(selection):
+    import plotly.express as px
+
+    rating_counts = chart_data('rating_counts', 10, selection=selection)
+
+    fig = px.bar(rating_counts, x='Rating', y='Count',
+                color='Count', color_continuous_scale='Reds',
+                title='Top 10 Content Ratings')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig, rating_counts
+
+
+def build_audience_by_type(selection):
+    import plotly.express as px
+
+    rating_type = chart_data('audience_by_type', selection=selection)
+
+    fig = px.bar(rating_type, x='Content_For', y='Count', color='type',
+                color_discrete_map={'Movie':'#E50914', 'TV Show':'#ffffff'},
+                title='Content Type Distribution Across Audience Categories',
+                barmode='group')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig
+
+
+def build_opportunity_heatmap(selection, top_n=10):
+    import plotly.express as px
+
+    # Data Prep for Heatmap
+    # Slice the top N genres x top N countries out of the precomputed co-occurrence matrix
+    heatmap_data = chart_data('genre_country_block', top_n, selection=selection)
+
+    fig_heat = px.imshow(heatmap_data,
+                         labels=dict(x="Country", y="Genre", color="Content Count"),
+                         x=heatmap_data.columns,
+                         y=heatmap_data.index,
+                         color_continuous_scale='Reds',
+                         aspect="auto")
+    # Invisible markers on the cells make them clickable for cross-filtering
+    genres, countries = np.meshgrid(heatmap_data.index, heatmap_data.columns, indexing='ij')
+    fig_heat.add_scatter(x=countries.ravel(), y=genres.ravel(), mode='markers', showlegend=False,
+                         marker=dict(symbol='square', size=24, opacity=0),
+                         customdata=heatmap_data.to_numpy().ravel(),
+                         hovertemplate='Country=%{x}<br>Genre=%{y}<br>Content Count=%{customdata}<extra></extra>')
+    fig_heat.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig_heat
+
+
+def build_audience_share(selection):
+    import plotly.express as px
+
+    audience_counts = chart_data('audience_distribution', selection=selection)
+
+    fig = px.pie(audience_counts, values='Count', names='Audience',
+                title='Content Distribution by Audience',
+                color_discrete_sequence=['#E50914', '#ff6b6b', '#c92a2a', '#862e9c'])
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig
+
+
+def build_top_10_genres(selection):
+    import plotly.express as px
+
+    top_genres = chart_data('top_entities', 'genre', 10, label='Genre', selection=selection)
+
+    fig = px.bar(top_genres, x='Count', y='Genre', orientation='h',
+                title='Top 10 Genres',
+                color='Count', color_continuous_scale='Reds')
+    fig.update_layout(
+        yaxis={'categoryorder':'total ascending'},
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig
+
+
+def build_top_10_countries(selection):
+    import plotly.express as px
+
+    top_countries = chart_data('top_entities', 'country', 10, label='Country', selection=selection)
+    top_countries = top_countries[top_countries['Country'] != 'Unknown']
+
+    fig = px.bar(top_countries, x='Country', y='Count',
+                title='Top Production Countries',
+                color='Count', color_continuous_scale='Reds')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig
+
+
+def build_movie_duration_overview(selection):
+    values, weights = duration_values('Movie', selection)
+    fig = figures.binned_histogram(values, weights=weights,
+                                   nbins=30, x_label='Movie_duration', color='#E50914',
+                                   title='Movie Duration Distribution')
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#cbd5e1')
+    )
+    return fig
+
+
+# --- Tab Renderers ---
+# TAB 1: Problem Statement
+def render_problem_statement():
+    logging.info("Rendering Tab: Problem Statement")
+    st.header("📊 Netflix Business Case")
+
+    # Enhanced Metrics
+    kpis = analytics.kpis(catalog, selection=filter_selection)
+    m1, m2, m3, m4 = st.columns(4)
+
+    with m1:
+        st.markdown(f"""
+        <div class="metric-container" style='background: linear-gradient(135deg, rgba(229, 9, 20, 0.15), rgba(229, 9, 20, 0.05));'>
+            <div class="metric-icon" style="color: #E50914;">📊</div>
+            <div class="metric-value">{kpis.total_titles:,}</div>
+            <div class="metric-label">Total Titles</div>
+            <div style="font-size: 0.85rem; color: #E50914; margin-top: 0.5rem; font-weight: 500;">Content Library</div>
         </div>
         """, unsafe_allow_html=True)
-    with col2:
-        st.markdown("""
-        <div class='card' style='background: linear-gradient(135deg, #ff6b6b 0%, #ee5a6f 100%);'>
-            <div style='font-size: 2rem; margin-bottom: 0.25rem;'>🔍</div>
-            <h3 style='color: white !important; margin: 0.25rem 0; font-size: 1.1rem;'>EDA</h3>
-            <p style='margin: 0; font-size: 0.8rem; color: rgba(255,255,255,0.8);'>Visual Analysis</p>
+
+    with m2:
+        st.markdown(f"""
+        <div class="metric-container" style='background: linear-gradient(135deg, rgba(255, 107, 107, 0.15), rgba(255, 107, 107, 0.05));'>
+            <div class="metric-icon" style="color: #ff6b6b;">🌍</div>
+            <div class="metric-value">{kpis.countries:,}</div>
+            <div class="metric-label">Countries</div>
+            <div style="font-size: 0.85rem; color: #ff6b6b; margin-top: 0.5rem; font-weight: 500;">Global Reach</div>
         </div>
         """, unsafe_allow_html=True)
-    with col3:
-        st.markdown("""
-        <div class='card' style='background: linear-gradient(135deg, #c92a2a 0%, #a61e4d 100%);'>
-            <div style='font-size: 2rem; margin-bottom: 0.25rem;'>📈</div>
-            <h3 style='color: white !important; margin: 0.25rem 0; font-size: 1.1rem;'>Trends</h3>
-            <p style='margin: 0; font-size: 0.8rem; color: rgba(255,255,255,0.8);'>Growth Patterns</p>
+
+    with m3:
+        st.markdown(f"""
+        <div class="metric-container" style='background: linear-gradient(135deg, rgba(201, 42, 42, 0.15), rgba(201, 42, 42, 0.05));'>
+            <div class="metric-icon" style="color: #c92a2a;">🎭</div>
+            <div class="metric-value">{kpis.movies:,}</div>
+            <div class="metric-label">Movies</div>
+            <div style="font-size: 0.85rem; color: #c92a2a; margin-top: 0.5rem; font-weight: 500;">Film Collection</div>
         </div>
         """, unsafe_allow_html=True)
-    with col4:
-        st.markdown("""
-        <div class='card' style='background: linear-gradient(135deg, #862e9c 0%, #5f3dc4 100%);'>
-            <div style='font-size: 2rem; margin-bottom: 0.25rem;'>💡</div>
-            <h3 style='color: white !important; margin: 0.25rem 0; font-size: 1.1rem;'>Insights</h3>
-            <p style='margin: 0; font-size: 0.8rem; color: rgba(255,255,255,0.8);'>Recommendations</p>
+
+    with m4:
+        st.markdown(f"""
+        <div class="metric-container" style='background: linear-gradient(135deg, rgba(134, 46, 156, 0.15), rgba(134, 46, 156, 0.05));'>
+            <div class="metric-icon" style="color: #862e9c;">📺</div>
+            <div class="metric-value">{kpis.tv_shows:,}</div>
+            <div class="metric-label">TV Shows</div>
+            <div style="font-size: 0.85rem; color: #862e9c; margin-top: 0.5rem; font-weight: 500;">Series Collection</div>
         </div>
         """, unsafe_allow_html=True)
 
     st.markdown("<br>", unsafe_allow_html=True)
 
-    # Enhanced Sidebar
-    with st.sidebar:
-        st.markdown("## 📑 Navigation")
-        st.markdown("---")
+    # Business Context
+    st.markdown("""
+    <div style='background: linear-gradient(135deg, rgba(229, 9, 20, 0.1), rgba(255, 107, 107, 0.1)); 
+                padding: 1.5rem; border-radius: 15px; border-left: 5px solid #E50914; margin-bottom: 2rem;'>
+        <h3 style='color: #E50914; margin-top: 0; display: flex; align-items: center; gap: 10px;'>
+            <span style='font-size: 1.8rem;'>🎯</span> Business Objective
+        </h3>
+        <p style='color: #cbd5e1; line-height: 1.8; font-size: 1.05rem; margin: 0;'>
+            Netflix aims to understand content distribution patterns and identify strategic opportunities for growth. 
+            The analysis focuses on <strong style='color: #ff6b6b;'>content type distribution, regional production trends, 
+            genre preferences, and audience targeting</strong> to inform data-driven decisions for content acquisition, 
+            production, and marketing strategies.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    c1, c2 = st.columns([1.5, 1])
+
+    with c1:
         st.markdown("""
-        <div style='background: rgba(229, 9, 20, 0.1); padding: 1rem; border-radius: 10px; border: 1px solid rgba(229, 9, 20, 0.3);'>
-            <h3 style='color: #E50914 !important; margin-top: 0;'>📊 Project Overview</h3>
-            <p><strong>Company:</strong> Netflix Inc.</p>
-            <p><strong>Goal:</strong> Analyze content strategy</p>
-            <p><strong>Focus:</strong> Growth opportunities</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        st.markdown(f"""
-        <div style='background: rgba(255, 107, 107, 0.1); padding: 1rem; border-radius: 10px; border: 1px solid rgba(255, 107, 107, 0.3);'>
-            <h3 style='color: #ff6b6b !important; margin-top: 0;'>📈 Key Metrics</h3>
-            <p>📺 <strong>Total Titles:</strong> {len(df):,}</p>
-            <p>🌍 <strong>Countries:</strong> {df['country'].nunique()}</p>
-            <p>🎭 <strong>Genres:</strong> {df['listed_in'].nunique()}</p>
+        <div style='background: linear-gradient(145deg, rgba(30, 20, 20, 0.8), rgba(15, 10, 10, 0.9)); 
+                    padding: 2rem; border-radius: 20px; border: 1px solid rgba(229, 9, 20, 0.3); height: 100%;'>
+            <h3 style='color: #E50914 !important; margin-top: 0; display: flex; align-items: center; gap: 10px;'>
+                <span style='font-size: 2rem;'>🎬</span> About Netflix
+            </h3>
+            <p style='color: #cbd5e1; line-height: 1.8; font-size: 1.05rem;'>
+                <strong style='color: #E50914;'>Netflix Inc.</strong> is the world's leading streaming entertainment service 
+                with over 230 million paid memberships in more than 190 countries. Founded in 1997, Netflix has revolutionized 
+                how people watch TV shows and movies, offering a vast library of content across various genres and languages.
+            </p>
+            <div style='background: rgba(229, 9, 20, 0.1); padding: 1.2rem; border-radius: 12px; margin-top: 1.5rem;'>
+                <p style='color: #ff6b6b; margin: 0; font-size: 0.95rem; line-height: 1.6;'>
+                    <strong>📊 Data Context:</strong> This dataset contains information about movies and TV shows available 
+                    on Netflix as of 2021, including details about directors, cast, countries, release years, ratings, 
+                    and genres.
+                </p>
+            </div>
+            <div style='margin-top: 1rem; padding: 1rem; background: rgba(229, 9, 20, 0.05); border-radius: 10px;'>
+                <p style='color: #94a3b8; margin: 0; font-size: 0.9rem;'>
+                    <strong>🌍 Global Presence:</strong> 190+ countries | <strong>👥</strong> 230M+ subscribers
+                </p>
+            </div>
         </div>
         """, unsafe_allow_html=True)
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
+
+    with c2:
         st.markdown("""
-        <div style='background: rgba(201, 42, 42, 0.1); padding: 1rem; border-radius: 10px; border: 1px solid rgba(201, 42, 42, 0.3);'>
-            <h3 style='color: #c92a2a !important; margin-top: 0;'>🔍 Analysis Steps</h3>
-            <ul style='margin: 0; padding-left: 1.2rem;'>
-                <li>Data Loading & Preprocessing</li>
-                <li>Content Distribution Analysis</li>
-                <li>Trend & Pattern Identification</li>
-                <li>Genre & Regional Insights</li>
-                <li>Strategic Recommendations</li>
+        <div style='background: linear-gradient(145deg, rgba(30, 20, 20, 0.8), rgba(15, 10, 10, 0.9)); 
+                    padding: 2rem; border-radius: 20px; border: 1px solid rgba(255, 107, 107, 0.3); height: 100%;'>
+            <h3 style='color: #ff6b6b !important; margin-top: 0; display: flex; align-items: center; gap: 10px;'>
+                <span style='font-size: 2rem;'>❓</span> Research Questions
+            </h3>
+            <div style='background: rgba(255, 107, 107, 0.1); padding: 1.2rem; border-radius: 12px; margin-bottom: 1rem;'>
+                <p style='color: #fbbf24; line-height: 1.6; font-size: 1.05rem; margin: 0; font-weight: 600;'>
+                    "What content strategies should Netflix pursue for sustainable growth?"
+                </p>
+            </div>
+            <h4 style='color: #ff6b6b; font-size: 1rem; margin-top: 1.5rem;'>🔍 Analysis Scope:</h4>
+            <ul style='color: #cbd5e1; margin-bottom: 0; line-height: 1.8;'>
+                <li style='margin-bottom: 0.7rem;'>📊 Content type distribution analysis</li>
+                <li style='margin-bottom: 0.7rem;'>🌍 Regional production patterns</li>
+                <li style='margin-bottom: 0.7rem;'>🎭 Genre popularity trends</li>
+                <li style='margin-bottom: 0.7rem;'>👥 Target audience segmentation</li>
+                <li style='margin-bottom: 0.7rem;'>📈 Growth trend analysis</li>
             </ul>
         </div>
         """, unsafe_allow_html=True)
 
-    # Main Tabs
-    tabs = st.tabs([
-        "📊 Problem Statement",
-        "🔍 Interactive EDA", 
-        "🎥 Content Analysis",
-        "⭐ Rating Analysis",
-        "💡 Recommendations",
-        "📑 Complete Analysis",
-        "📝 App Logs"
-    ])
+    st.markdown("---")
 
-    # TAB 1: Problem Statement
-    with tabs[0]:
-        logging.info("Rendering Tab: Problem Statement")
-        st.header("📊 Netflix Business Case")
-        
-        # Enhanced Metrics
-        m1, m2, m3, m4 = st.columns(4)
-        
-        with m1:
-            st.markdown(f"""
-            <div class="metric-container" style='background: linear-gradient(135deg, rgba(229, 9, 20, 0.15), rgba(229, 9, 20, 0.05));'>
-                <div class="metric-icon" style="color: #E50914;">📊</div>
-                <div class="metric-value">{len(df):,}</div>
-                <div class="metric-label">Total Titles</div>
-                <div style="font-size: 0.85rem; color: #E50914; margin-top: 0.5rem; font-weight: 500;">Content Library</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with m2:
-            st.markdown(f"""
-            <div class="metric-container" style='background: linear-gradient(135deg, rgba(255, 107, 107, 0.15), rgba(255, 107, 107, 0.05));'>
-                <div class="metric-icon" style="color: #ff6b6b;">🌍</div>
-                <div class="metric-value">{df['country'].nunique():,}</div>
-                <div class="metric-label">Countries</div>
-                <div style="font-size: 0.85rem; color: #ff6b6b; margin-top: 0.5rem; font-weight: 500;">Global Reach</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with m3:
-            st.markdown(f"""
-            <div class="metric-container" style='background: linear-gradient(135deg, rgba(201, 42, 42, 0.15), rgba(201, 42, 42, 0.05));'>
-                <div class="metric-icon" style="color: #c92a2a;">🎭</div>
-                <div class="metric-value">{df['type'].value_counts()['Movie']:,}</div>
-                <div class="metric-label">Movies</div>
-                <div style="font-size: 0.85rem; color: #c92a2a; margin-top: 0.5rem; font-weight: 500;">Film Collection</div>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with m4:
-            st.markdown(f"""
-            <div class="metric-container" style='background: linear-gradient(135deg, rgba(134, 46, 156, 0.15), rgba(134, 46, 156, 0.05));'>
-                <div class="metric-icon" style="color: #862e9c;">📺</div>
-                <div class="metric-value">{df['type'].value_counts()['TV Show']:,}</div>
-                <div class="metric-label">TV Shows</div>
-                <div style="font-size: 0.85rem; color: #862e9c; margin-top: 0.5rem; font-weight: 500;">Series Collection</div>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Business Context
-        st.markdown("""
-        <div style='background: linear-gradient(135deg, rgba(229, 9, 20, 0.1), rgba(255, 107, 107, 0.1)); 
-                    padding: 1.5rem; border-radius: 15px; border-left: 5px solid #E50914; margin-bottom: 2rem;'>
-            <h3 style='color: #E50914; margin-top: 0; display: flex; align-items: center; gap: 10px;'>
-                <span style='font-size: 1.8rem;'>🎯</span> Business Objective
-            </h3>
-            <p style='color: #cbd5e1; line-height: 1.8; font-size: 1.05rem; margin: 0;'>
-                Netflix aims to understand content distribution patterns and identify strategic opportunities for growth. 
-                The analysis focuses on <strong style='color: #ff6b6b;'>content type distribution, regional production trends, 
-                genre preferences, and audience targeting</strong> to inform data-driven decisions for content acquisition, 
-                production, and marketing strategies.
+    # Data Dictionary
+    st.markdown("""
+    <div style='margin-bottom: 1rem;'>
+        <h3 style='color: #E50914; display: flex; align-items: center; gap: 10px;'>
+            <span style='font-size: 1.5rem;'>📚</span> Data Dictionary
+        </h3>
+        <p style='color: #94a3b8; font-size: 0.95rem;'>
+            Understanding the dataset structure and feature definitions
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    data_dict = pd.DataFrame({
+        'Column': ['show_id', 'type', 'title', 'director', 'cast', 'country', 'date_added', 
+                   'release_year', 'rating', 'duration', 'listed_in', 'description'],
+        'Data Type': ['Text', 'Categorical', 'Text', 'Text', 'Text', 'Text', 'Date', 
+                      'Numerical', 'Categorical', 'Text', 'Text', 'Text'],
+        'Description': [
+            'Unique identifier for each title',
+            'Content type: Movie or TV Show',
+            'Title of the content',
+            'Director(s) of the content',
+            'Main cast members',
+            'Country/countries of production',
+            'Date when added to Netflix',
+            'Original release year',
+            'Content rating (TV-MA, PG-13, etc.)',
+            'Duration in minutes or seasons',
+            'Genre categories',
+            'Brief description of the content'
+        ]
+    })
+
+    st.dataframe(data_dict, use_container_width=True, hide_index=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Dataset Preview
+    st.markdown("""
+    <div style='margin-bottom: 1rem;'>
+        <h3 style='color: #E50914; display: flex; align-items: center; gap: 10px;'>
+            <span style='font-size: 1.5rem;'>👀</span> Dataset Preview
+        </h3>
+        <p style='color: #94a3b8; font-size: 0.95rem;'>
+            First 10 rows of the Netflix content data
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.dataframe(analytics.head(catalog, 10, selection=filter_selection), use_container_width=True)
+
+    # Key Statistics
+    st.markdown("<br>", unsafe_allow_html=True)
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown(f"""
+        <div style='background: rgba(229, 9, 20, 0.1); padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(229, 9, 20, 0.3);'>
+            <h4 style='color: #E50914; margin-top: 0;'>📊 Dataset Size</h4>
+            <p style='color: #cbd5e1; margin: 0;'>
+                <strong>Rows:</strong> {kpis.rows:,}<br>
+                <strong>Columns:</strong> {kpis.columns}<br>
+                <strong>Memory:</strong> {kpis.memory_mb:.2f} MB
             </p>
         </div>
         """, unsafe_allow_html=True)
-        
-        c1, c2 = st.columns([1.5, 1])
-        
-        with c1:
-            st.markdown("""
-            <div style='background: linear-gradient(145deg, rgba(30, 20, 20, 0.8), rgba(15, 10, 10, 0.9)); 
-                        padding: 2rem; border-radius: 20px; border: 1px solid rgba(229, 9, 20, 0.3); height: 100%;'>
-                <h3 style='color: #E50914 !important; margin-top: 0; display: flex; align-items: center; gap: 10px;'>
-                    <span style='font-size: 2rem;'>🎬</span> About Netflix
-                </h3>
-                <p style='color: #cbd5e1; line-height: 1.8; font-size: 1.05rem;'>
-                    <strong style='color: #E50914;'>Netflix Inc.</strong> is the world's leading streaming entertainment service 
-                    with over 230 million paid memberships in more than 190 countries. Founded in 1997, Netflix has revolutionized 
-                    how people watch TV shows and movies, offering a vast library of content across various genres and languages.
-                </p>
-                <div style='background: rgba(229, 9, 20, 0.1); padding: 1.2rem; border-radius: 12px; margin-top: 1.5rem;'>
-                    <p style='color: #ff6b6b; margin: 0; font-size: 0.95rem; line-height: 1.6;'>
-                        <strong>📊 Data Context:</strong> This dataset contains information about movies and TV shows available 
-                        on Netflix as of 2021, including details about directors, cast, countries, release years, ratings, 
-                        and genres.
-                    </p>
-                </div>
-                <div style='margin-top: 1rem; padding: 1rem; background: rgba(229, 9, 20, 0.05); border-radius: 10px;'>
-                    <p style='color: #94a3b8; margin: 0; font-size: 0.9rem;'>
-                        <strong>🌍 Global Presence:</strong> 190+ countries | <strong>👥</strong> 230M+ subscribers
-                    </p>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
 
-        with c2:
-            st.markdown("""
-            <div style='background: linear-gradient(145deg, rgba(30, 20, 20, 0.8), rgba(15, 10, 10, 0.9)); 
-                        padding: 2rem; border-radius: 20px; border: 1px solid rgba(255, 107, 107, 0.3); height: 100%;'>
-                <h3 style='color: #ff6b6b !important; margin-top: 0; display: flex; align-items: center; gap: 10px;'>
-                    <span style='font-size: 2rem;'>❓</span> Research Questions
-                </h3>
-                <div style='background: rgba(255, 107, 107, 0.1); padding: 1.2rem; border-radius: 12px; margin-bottom: 1rem;'>
-                    <p style='color: #fbbf24; line-height: 1.6; font-size: 1.05rem; margin: 0; font-weight: 600;'>
-                        "What content strategies should Netflix pursue for sustainable growth?"
-                    </p>
-                </div>
-                <h4 style='color: #ff6b6b; font-size: 1rem; margin-top: 1.5rem;'>🔍 Analysis Scope:</h4>
-                <ul style='color: #cbd5e1; margin-bottom: 0; line-height: 1.8;'>
-                    <li style='margin-bottom: 0.7rem;'>📊 Content type distribution analysis</li>
-                    <li style='margin-bottom: 0.7rem;'>🌍 Regional production patterns</li>
-                    <li style='margin-bottom: 0.7rem;'>🎭 Genre popularity trends</li>
-                    <li style='margin-bottom: 0.7rem;'>👥 Target audience segmentation</li>
-                    <li style='margin-bottom: 0.7rem;'>📈 Growth trend analysis</li>
-                </ul>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        st.markdown("---")
-        
-        # Data Dictionary
-        st.markdown("""
-        <div style='margin-bottom: 1rem;'>
-            <h3 style='color: #E50914; display: flex; align-items: center; gap: 10px;'>
-                <span style='font-size: 1.5rem;'>📚</span> Data Dictionary
-            </h3>
-            <p style='color: #94a3b8; font-size: 0.95rem;'>
-                Understanding the dataset structure and feature definitions
+    with col2:
+        st.markdown(f"""
+        <div style='background: rgba(255, 107, 107, 0.1); padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 107, 107, 0.3);'>
+            <h4 style='color: #ff6b6b; margin-top: 0;'>🎯 Data Quality</h4>
+            <p style='color: #cbd5e1; margin: 0;'>
+                <strong>Missing Values:</strong> {kpis.missing}<br>
+                <strong>Duplicates:</strong> {kpis.duplicates}<br>
+                <strong>Completeness:</strong> {kpis.completeness_pct:.1f}%
             </p>
         </div>
         """, unsafe_allow_html=True)
-        
-        data_dict = pd.DataFrame({
-            'Column': ['show_id', 'type', 'title', 'director', 'cast', 'country', 'date_added', 
-                       'release_year', 'rating', 'duration', 'listed_in', 'description'],
-            'Data Type': ['Text', 'Categorical', 'Text', 'Text', 'Text', 'Text', 'Date', 
-                          'Numerical', 'Categorical', 'Text', 'Text', 'Text'],
-            'Description': [
-                'Unique identifier for each title',
-                'Content type: Movie or TV Show',
-                'Title of the content',
-                'Director(s) of the content',
-                'Main cast members',
-                'Country/countries of production',
-                'Date when added to Netflix',
-                'Original release year',
-                'Content rating (TV-MA, PG-13, etc.)',
-                'Duration in minutes or seasons',
-                'Genre categories',
-                'Brief description of the content'
-            ]
-        })
-        
-        st.dataframe(data_dict, use_container_width=True, hide_index=True)
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Dataset Preview
-        st.markdown("""
-        <div style='margin-bottom: 1rem;'>
-            <h3 style='color: #E50914; display: flex; align-items: center; gap: 10px;'>
-                <span style='font-size: 1.5rem;'>👀</span> Dataset Preview
-            </h3>
-            <p style='color: #94a3b8; font-size: 0.95rem;'>
-                First 10 rows of the Netflix content data
+
+    with col3:
+        st.markdown(f"""
+        <div style='background: rgba(201, 42, 42, 0.1); padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(201, 42, 42, 0.3);'>
+            <h4 style='color: #c92a2a; margin-top: 0;'>📅 Time Range</h4>
+            <p style='color: #cbd5e1; margin: 0;'>
+                <strong>Earliest:</strong> {kpis.earliest_release}<br>
+                <strong>Latest:</strong> {kpis.latest_release}<br>
+                <strong>Span:</strong> {kpis.latest_release - kpis.earliest_release} years
             </p>
         </div>
         """, unsafe_allow_html=True)
-        
-        st.dataframe(df.head(10), use_container_width=True)
-        
-        # Key Statistics
-        st.markdown("<br>", unsafe_allow_html=True)
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            st.markdown(f"""
-            <div style='background: rgba(229, 9, 20, 0.1); padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(229, 9, 20, 0.3);'>
-                <h4 style='color: #E50914; margin-top: 0;'>📊 Dataset Size</h4>
+
+
+# TAB 2: Interactive EDA
+def render_interactive_eda():
+    logging.info("Rendering Tab: Interactive EDA")
+    st.header("🔍 Interactive Exploratory Data Analysis")
+
+    viz_tabs = st.tabs(["📊 Overview", "🎭 Content Types", "🌍 Geographic", "📅 Temporal"], key="eda_tab", on_change="rerun")
+
+    if viz_tabs[0].open:
+        with viz_tabs[0]:
+            st.subheader("📊 Dataset Overview")
+            st.markdown("""
+            <div style='background: rgba(229, 9, 20, 0.1); padding: 1rem; border-radius: 10px; margin-bottom: 1rem;'>
                 <p style='color: #cbd5e1; margin: 0;'>
-                    <strong>Rows:</strong> {df.shape[0]:,}<br>
-                    <strong>Columns:</strong> {df.shape[1]}<br>
-                    <strong>Memory:</strong> {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            missing_count = df.isnull().sum().sum()
-            st.markdown(f"""
-            <div style='background: rgba(255, 107, 107, 0.1); padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(255, 107, 107, 0.3);'>
-                <h4 style='color: #ff6b6b; margin-top: 0;'>🎯 Data Quality</h4>
-                <p style='color: #cbd5e1; margin: 0;'>
-                    <strong>Missing Values:</strong> {missing_count}<br>
-                    <strong>Duplicates:</strong> {df.duplicated().sum()}<br>
-                    <strong>Completeness:</strong> {((1 - missing_count/(df.shape[0]*df.shape[1]))*100):.1f}%
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col3:
-            st.markdown(f"""
-            <div style='background: rgba(201, 42, 42, 0.1); padding: 1.5rem; border-radius: 12px; border: 1px solid rgba(201, 42, 42, 0.3);'>
-                <h4 style='color: #c92a2a; margin-top: 0;'>📅 Time Range</h4>
-                <p style='color: #cbd5e1; margin: 0;'>
-                    <strong>Earliest:</strong> {df['release_year'].min()}<br>
-                    <strong>Latest:</strong> {df['release_year'].max()}<br>
-                    <strong>Span:</strong> {df['release_year'].max() - df['release_year'].min()} years
+                    📊 Comprehensive statistical overview of the Netflix content library, including distributions, 
+                    central tendencies, and data quality metrics.
                 </p>
             </div>
             """, unsafe_allow_html=True)
 
-    # TAB 2: Interactive EDA
-    with tabs[1]:
-        logging.info("Rendering Tab: Interactive EDA")
-        st.header("🔍 Interactive Exploratory Data Analysis")
-        
-        viz_tabs = st.tabs(["📊 Overview", "🎭 Content Types", "🌍 Geographic", "📅 Temporal"])
-        
-        with viz_tabs[0]:
-            st.subheader("📊 Dataset Overview")
-            st.markdown("""
-            <div style='background: rgba(229, 9, 20, 0.1); padding: 1rem; border-radius: 10px; margin-bottom: 1rem;'>
-                <p style='color: #cbd5e1; margin: 0;'>
-                    📊 Comprehensive statistical overview of the Netflix content library, including distributions, 
-                    central tendencies, and data quality metrics.
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-            
             # Quick Stats
+            kpis = analytics.kpis(catalog, selection=filter_selection)
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric("📊 Total Records", f"{len(df):,}")
+                st.metric("📊 Total Records", f"{kpis.rows:,}")
             with col2:
-                st.metric("📋 Features", f"{df.shape[1]}")
+                st.metric("📋 Features", f"{kpis.columns}")
             with col3:
-                missing_pct = (df.isnull().sum().sum() / (df.shape[0] * df.shape[1]) * 100)
-                st.metric("✅ Completeness", f"{100-missing_pct:.1f}%")
+                st.metric("✅ Completeness", f"{kpis.completeness_pct:.1f}%")
             with col4:
-                st.metric("💾 Memory", f"{df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
-            
+                st.metric("💾 Memory", f"{kpis.memory_mb:.2f} MB")
+
             st.markdown("---")
-            
+
             col1, col2 = st.columns(2)
-            
+
             with col1:
                 st.markdown("**📈 Numerical Features Summary**")
-                numeric_summary = df[['release_year']].describe().T
+                numeric_summary = analytics.numeric_summary(catalog, selection=filter_selection)
                 st.dataframe(numeric_summary, use_container_width=True)
-                
+
             with col2:
                 st.markdown("**📋 Categorical Features**")
-                cat_summary = []
-                for col in ['type', 'rating', 'country']:
-                    value_counts = df[col].value_counts()
-                    cat_summary.append({
-                        'Feature': col,
-                        'Unique': df[col].nunique(),
-                        'Most Common': str(value_counts.index[0])[:20],
-                        'Frequency': value_counts.values[0]
-                    })
-                st.dataframe(pd.DataFrame(cat_summary), use_container_width=True, hide_index=True)
-        
+                st.dataframe(analytics.categorical_summary(catalog, selection=filter_selection), use_container_width=True, hide_index=True)
+
+    if viz_tabs[1].open:
         with viz_tabs[1]:
             st.subheader("🎭 Content Type Analysis")
-            
+
             col1, col2 = st.columns(2)
-            
+
             with col1:
                 st.markdown("**📺 Movies vs TV Shows**")
-                type_counts = df['type'].value_counts().reset_index()
-                type_counts.columns = ['Type', 'Count']
-                type_counts['Percentage'] = (type_counts['Count'] / type_counts['Count'].sum() * 100).round(2)
-                
-                fig = px.pie(type_counts, values='Count', names='Type', 
-                            color='Type', color_discrete_map={'Movie':'#E50914', 'TV Show':'#564d4d'},
-                            title='Content Type Distribution',
-                            hole=0.4)
-                fig.update_traces(textposition='inside', textinfo='percent+label')
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='#cbd5e1')
-                )
+                fig, type_counts = cached_chart("type_distribution", build_type_distribution)
                 st.plotly_chart(fig, use_container_width=True)
-                
-                movie_pct = type_counts[type_counts['Type']=='Movie']['Percentage'].values[0]
-                st.success(f"✅ **Key Finding:** Movies dominate with {movie_pct}% of total content")
-                
+
+                movie_pct = type_counts.loc[type_counts['Type']=='Movie', 'Percentage']
+                if len(movie_pct):
+                    st.success(f"✅ **Key Finding:** Movies dominate with {movie_pct.iloc[0]}% of total content")
+
             with col2:
                 st.markdown("**📊 Content Type Statistics**")
                 for _, row in type_counts.iterrows():
                     st.metric(row['Type'], f"{row['Count']:,}", f"{row['Percentage']:.1f}%")
-                
+
                 st.markdown("<br>", unsafe_allow_html=True)
-                
+
                 # Duration comparison
                 st.markdown("**⏱️ Average Duration**")
-                avg_movie_dur = df[df['type']=='Movie']['Movie_duration'].mean()
-                avg_series_dur = df[df['type']=='TV Show']['Series_duration'].mean()
-                
+                avg_movie_dur = analytics.duration_stats(catalog, 'Movie', selection=filter_selection)['mean']
+                avg_series_dur = analytics.duration_stats(catalog, 'TV Show', selection=filter_selection)['mean']
+
                 st.metric("Movies", f"{avg_movie_dur:.0f} min")
                 st.metric("TV Shows", f"{avg_series_dur:.1f} seasons")
-        
+
+    if viz_tabs[2].open:
         with viz_tabs[2]:
             st.subheader("🌍 Geographic Distribution")
-            
+
             st.markdown("**🗺️ Top Producing Countries**")
-            clean_countries = countries_df[countries_df['country_unnested'] != 'Unknown']
-            top_countries = clean_countries['country_unnested'].value_counts().head(15).reset_index()
-            top_countries.columns = ['Country', 'Count']
-            
-            fig = px.bar(top_countries, x='Country', y='Count',
-                        color='Count', color_continuous_scale='Reds',
-                        title='Top 15 Countries by Content Volume')
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1'),
-                xaxis_tickangle=-45
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
-            top_country = top_countries.iloc[0]
-            st.info(f"💡 **Insight:** {top_country['Country']} leads with {top_country['Count']:,} titles")
-            
+            fig, top_countries = cached_chart("top_countries", build_top_countries)
+            selectable_chart(fig, "top_countries")
+            st.caption("Click a bar to cross-filter every other chart by that country.")
+
+            if len(top_countries):
+                top_country = top_countries.iloc[0]
+                st.info(f"💡 **Insight:** {top_country['Country']} leads with {top_country['Count']:,} titles")
+
             st.markdown("---")
-            
+
             # Country vs Type
             st.markdown("**🌍 Content Type by Top Countries**")
-            top_5_countries = top_countries.head(5)['Country'].tolist()
-            country_type_data = []
-            
-            for country in top_5_countries:
-                country_df = df[df['country'].str.contains(country, na=False)]
-                type_counts = country_df['type'].value_counts()
-                for content_type, count in type_counts.items():
-                    country_type_data.append({
-                        'Country': country,
-                        'Type': content_type,
-                        'Count': count
-                    })
-            
-            country_type_df = pd.DataFrame(country_type_data)
-            fig = px.bar(country_type_df, x='Country', y='Count', color='Type',
-                        color_discrete_map={'Movie':'#E50914', 'TV Show':'#564d4d'},
-                        title='Content Type Distribution by Top 5 Countries',
-                        barmode='group')
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1')
-            )
+            fig = cached_chart("country_type", build_country_type)
             st.plotly_chart(fig, use_container_width=True)
-        
+
+    if viz_tabs[3].open:
         with viz_tabs[3]:
             st.subheader("📅 Temporal Analysis")
-            
+
             st.markdown("**📈 Content Added Over Years**")
-            df_year = df.groupby(['year_added', 'type']).size().reset_index(name='Count')
-            df_year = df_year.dropna()
-            
-            fig = px.area(df_year, x='year_added', y='Count', color='type',
-                        color_discrete_map={'Movie':'#E50914', 'TV Show':'#ffffff'},
-                        title='Content Addition Trend Over Time')
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1')
-            )
+            fig, df_year = cached_chart("addition_trend", build_addition_trend)
             st.plotly_chart(fig, use_container_width=True)
-            
+
             # Peak year
-            year_totals = df_year.groupby('year_added')['Count'].sum().reset_index()
-            peak_year = year_totals.loc[year_totals['Count'].idxmax()]
-            st.success(f"✅ **Key Finding:** Peak content addition was in {int(peak_year['year_added'])} with {peak_year['Count']} titles")
-            
+            peak_year, peak_count = analytics.peak_addition_year(df_year)
+            if peak_year is not None:
+                st.success(f"✅ **Key Finding:** Peak content addition was in {peak_year} with {peak_count} titles")
+
             st.markdown("---")
-            
+
             # Monthly distribution
             st.markdown("**📆 Content Added by Month**")
-            month_counts = df['month_added'].value_counts().reset_index()
-            month_counts.columns = ['Month', 'Count']
-            
-            # Order months correctly
-            month_order = ['January', 'February', 'March', 'April', 'May', 'June', 
-                          'July', 'August', 'September', 'October', 'November', 'December']
-            month_counts['Month'] = pd.Categorical(month_counts['Month'], categories=month_order, ordered=True)
-            month_counts = month_counts.sort_values('Month')
-            
-            fig = px.bar(month_counts, x='Month', y='Count',
-                        color='Count', color_continuous_scale='Reds',
-                        title='Content Addition by Month')
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1'),
-                xaxis_tickangle=-45
-            )
+            fig = cached_chart("monthly_additions", build_monthly_additions)
             st.plotly_chart(fig, use_container_width=True)
 
-    # TAB 3: Content Analysis
-    with tabs[2]:
-        logging.info("Rendering Tab: Content Analysis")
-        st.header("🎥 Comprehensive Content Analysis")
-        
-        st.markdown("""
-        <div style='background: rgba(229, 9, 20, 0.1); padding: 1.5rem; border-radius: 10px; border-left: 4px solid #E50914; margin-bottom: 1.5rem;'>
-            <h4 style='color: #E50914; margin-top: 0;'>🎬 Deep Dive into Content Library</h4>
-            <p style='color: #cbd5e1; margin: 0;'>
-                This section analyzes Netflix's content library across multiple dimensions including genres, 
-                production countries, release patterns, and content characteristics to identify strategic opportunities.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Genre Analysis
-        st.markdown("### 🎭 Genre Analysis")
-        st.markdown("*Understanding content categorization and genre preferences*")
-        
-        col1, col2 = st.columns([2, 1])
-        
-        with col1:
-            st.markdown("**📊 Top 15 Genres**")
-            top_genres = genres_df['genre'].value_counts().head(15).reset_index()
-            top_genres.columns = ['Genre', 'Count']
-            
-            fig = px.bar(top_genres, x='Count', y='Genre', orientation='h',
-                        color='Count', color_continuous_scale='Reds',
-                        title='Most Popular Genres on Netflix')
-            fig.update_layout(
-                yaxis={'categoryorder':'total ascending'},
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1')
+
+# TAB 3: Content Analysis
+def render_content_analysis():
+    logging.info("Rendering Tab: Content Analysis")
+    st.header("🎥 Comprehensive Content Analysis")
+
+    st.markdown("""
+    <div style='background: rgba(229, 9, 20, 0.1); padding: 1.5rem; border-radius: 10px; border-left: 4px solid #E50914; margin-bottom: 1.5rem;'>
+        <h4 style='color: #E50914; margin-top: 0;'>🎬 Deep Dive into Content Library</h4>
+        <p style='color: #cbd5e1; margin: 0;'>
+            This section analyzes Netflix's content library across multiple dimensions including genres, 
+            production countries, release patterns, and content characteristics to identify strategic opportunities.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Genre Analysis
+    st.markdown("### 🎭 Genre Analysis")
+    st.markdown("*Understanding content categorization and genre preferences*")
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        st.markdown("**📊 Top 15 Genres**")
+        fig, top_genres = cached_chart("top_genres", build_top_genres)
+        st.plotly_chart(fig, use_container_width=True)
+
+    with col2:
+        st.markdown("**🏆 Top 5 Genres**")
+        genre_links = analytics.link_count(catalog, 'genre', selection=chart_selection("top_genres")[0])
+        for idx, row in top_genres.head(5).iterrows():
+            pct = (row['Count'] / genre_links * 100)
+            st.metric(
+                row['Genre'][:20],
+                f"{row['Count']:,}",
+                f"{pct:.1f}%"
             )
-            st.plotly_chart(fig, use_container_width=True)
-            
-        with col2:
-            st.markdown("**🏆 Top 5 Genres**")
-            for idx, row in top_genres.head(5).iterrows():
-                pct = (row['Count'] / len(genres_df) * 100)
-                st.metric(
-                    row['Genre'][:20],
-                    f"{row['Count']:,}",
-                    f"{pct:.1f}%"
-                )
-        
-        st.markdown("---")
-        
-        # Duration Analysis
-        st.markdown("### ⏱️ Duration Analysis")
-        st.markdown("*Analyzing content length patterns*")
-        
-        tab1, tab2 = st.tabs(["Movies", "TV Shows"])
-        
+
+    st.markdown("---")
+
+    # Duration Analysis
+    st.markdown("### ⏱️ Duration Analysis")
+    st.markdown("*Analyzing content length patterns*")
+
+    tab1, tab2 = st.tabs(["Movies", "TV Shows"], key="duration_tab", on_change="rerun")
+
+    if tab1.open:
         with tab1:
             col1, col2 = st.columns([2, 1])
-            
+
             with col1:
-                fig = px.histogram(df[df['type']=='Movie'].dropna(subset=['Movie_duration']), 
-                                  x='Movie_duration', 
-                                  nbins=30, 
-                                  color_discrete_sequence=['#E50914'],
-                                  title='Distribution of Movie Duration (Minutes)')
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='#cbd5e1')
-                )
+                fig = cached_chart("movie_duration", build_movie_duration)
                 st.plotly_chart(fig, use_container_width=True)
-            
+
             with col2:
                 st.markdown("**📊 Movie Duration Stats**")
-                movie_dur = df[df['type']=='Movie']['Movie_duration'].dropna()
-                st.metric("Average", f"{movie_dur.mean():.0f} min")
-                st.metric("Median", f"{movie_dur.median():.0f} min")
-                st.metric("Most Common", f"{movie_dur.mode()[0]:.0f} min")
-                st.metric("Range", f"{movie_dur.min():.0f} - {movie_dur.max():.0f} min")
-        
+                movie_dur = analytics.duration_stats(catalog, 'Movie', selection=filter_selection)
+                st.metric("Average", f"{movie_dur['mean']:.0f} min")
+                st.metric("Median", f"{movie_dur['median']:.0f} min")
+                st.metric("Most Common", f"{movie_dur['mode']:.0f} min")
+                st.metric("Range", f"{movie_dur['min']:.0f} - {movie_dur['max']:.0f} min")
+
+    if tab2.open:
         with tab2:
             col1, col2 = st.columns([2, 1])
-            
+
             with col1:
-                fig = px.histogram(df[df['type']=='TV Show'].dropna(subset=['Series_duration']), 
-                                  x='Series_duration', 
-                                  nbins=15, 
-                                  color_discrete_sequence=['#ffffff'],
-                                  title='Distribution of TV Show Duration (Seasons)')
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='#cbd5e1')
-                )
+                fig = cached_chart("series_duration", build_series_duration)
                 st.plotly_chart(fig, use_container_width=True)
-            
+
             with col2:
                 st.markdown("**📊 TV Show Duration Stats**")
-                series_dur = df[df['type']=='TV Show']['Series_duration'].dropna()
-                st.metric("Average", f"{series_dur.mean():.1f} seasons")
-                st.metric("Median", f"{series_dur.median():.0f} seasons")
-                st.metric("Most Common", f"{series_dur.mode()[0]:.0f} season(s)")
-                st.metric("Max", f"{series_dur.max():.0f} seasons")
-        
-        st.markdown("---")
-        
-        # Release Year Analysis
-        st.markdown("### 📅 Release Year Patterns")
-        st.markdown("*Understanding content age and production trends*")
-        
-        # Last 30 years
-        recent_years = df[df['release_year'] >= (df['release_year'].max() - 30)]
-        year_counts = recent_years.groupby(['release_year', 'type']).size().reset_index(name='Count')
-        
-        fig = px.bar(year_counts, x='release_year', y='Count', color='type',
-                    color_discrete_map={'Movie':'#E50914', 'TV Show':'#ffffff'},
-                    title='Content Released in Last 30 Years',
-                    barmode='stack')
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1')
-        )
+                series_dur = analytics.duration_stats(catalog, 'TV Show', selection=filter_selection)
+                st.metric("Average", f"{series_dur['mean']:.1f} seasons")
+                st.metric("Median", f"{series_dur['median']:.0f} seasons")
+                st.metric("Most Common", f"{series_dur['mode']:.0f} season(s)")
+                st.metric("Max", f"{series_dur['max']:.0f} seasons")
+
+    st.markdown("---")
+
+    # Release Year Analysis
+    st.markdown("### 📅 Release Year Patterns")
+    st.markdown("*Understanding content age and production trends*")
+
+    # Last 30 years
+    fig = cached_chart("release_years", build_release_years)
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Recent decline insight
+    recent_count, recent_pct = analytics.recent_release_share(catalog, 5, selection=filter_selection)
+    st.info(f"💡 **Insight:** {recent_pct:.1f}% of Netflix's library consists of content released in the last 5 years ({recent_count:,} titles)")
+
+
+# TAB 4: Rating Analysis
+def render_rating_analysis():
+    logging.info("Rendering Tab: Rating Analysis")
+    st.header("⭐ Content Rating & Audience Analysis")
+
+    st.markdown("""
+    <div style='background: rgba(255, 107, 107, 0.1); padding: 1.5rem; border-radius: 10px; border-left: 4px solid #ff6b6b; margin-bottom: 1.5rem;'>
+        <h4 style='color: #ff6b6b; margin-top: 0;'>👥 Understanding Target Audiences</h4>
+        <p style='color: #cbd5e1; margin: 0;'>
+            Analyzing content ratings and target demographics to understand Netflix's audience strategy 
+            and identify opportunities for content diversification.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("Content Distribution by Target Audience")
+        fig, audience_counts = cached_chart("audience_distribution", build_audience_distribution)
         st.plotly_chart(fig, use_container_width=True)
-        
-        # Recent decline insight
-        recent_5_years = df[df['release_year'] >= (df['release_year'].max() - 5)]
-        recent_count = len(recent_5_years)
-        total_count = len(df)
-        recent_pct = (recent_count / total_count * 100)
-        st.info(f"💡 **Insight:** {recent_pct:.1f}% of Netflix's library consists of content released in the last 5 years ({recent_count:,} titles)")
-
-    # TAB 4: Rating Analysis
-    with tabs[3]:
-        logging.info("Rendering Tab: Rating Analysis")
-        st.header("⭐ Content Rating & Audience Analysis")
-        
-        st.markdown("""
-        <div style='background: rgba(255, 107, 107, 0.1); padding: 1.5rem; border-radius: 10px; border-left: 4px solid #ff6b6b; margin-bottom: 1.5rem;'>
-            <h4 style='color: #ff6b6b; margin-top: 0;'>👥 Understanding Target Audiences</h4>
-            <p style='color: #cbd5e1; margin: 0;'>
-                Analyzing content ratings and target demographics to understand Netflix's audience strategy 
-                and identify opportunities for content diversification.
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Content Distribution by Target Audience")
-            audience_counts = df['Content_For'].value_counts().reset_index()
-            audience_counts.columns = ['Audience', 'Count']
-            audience_counts['Percentage'] = (audience_counts['Count'] / audience_counts['Count'].sum() * 100).round(2)
-            
-            fig = px.pie(audience_counts, values='Count', names='Audience',
-                        color_discrete_sequence=['#E50914', '#ff6b6b', '#c92a2a', '#862e9c'],
-                        title='Target Audience Distribution',
-                        hole=0.4)
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1')
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
+
+        if len(audience_counts):
             top_audience = audience_counts.iloc[0]
             st.success(f"✅ **Key Finding:** {top_audience['Audience']} content dominates with {top_audience['Percentage']:.1f}%")
-            
-        with col2:
-            st.subheader("Detailed Rating Distribution")
-            rating_counts = df['rating'].value_counts().head(10).reset_index()
-            rating_counts.columns = ['Rating', 'Count']
-            
-            fig = px.bar(rating_counts, x='Rating', y='Count',
-                        color='Count', color_continuous_scale='Reds',
-                        title='Top 10 Content Ratings')
-            fig.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#cbd5e1')
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
+
+    with col2:
+        st.subheader("Detailed Rating Distribution")
+        fig, rating_counts = cached_chart("top_ratings", build_top_ratings)
+        st.plotly_chart(fig, use_container_width=True)
+
+        if len(rating_counts):
             top_rating = rating_counts.iloc[0]
             st.info(f"💡 **Insight:** {top_rating['Rating']} is the most common rating with {top_rating['Count']:,} titles")
-        
-        st.markdown("---")
-        
-        # Rating by Type
-        st.markdown("### 📊 Rating Distribution by Content Type")
-        
-        rating_type = df.groupby(['Content_For', 'type']).size().reset_index(name='Count')
-        
-        fig = px.bar(rating_type, x='Content_For', y='Count', color='type',
-                    color_discrete_map={'Movie':'#E50914', 'TV Show':'#ffffff'},
-                    title='Content Type Distribution Across Audience Categories',
-                    barmode='group')
-        fig.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1')
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Audience Statistics Table
-        st.markdown("**📋 Audience Category Statistics**")
-        audience_stats = df.groupby('Content_For').agg({
-            'title': 'count',
-            'release_year': 'mean'
-        }).reset_index()
-        audience_stats.columns = ['Audience', 'Total Content', 'Avg Release Year']
-        audience_stats = audience_stats.sort_values('Total Content', ascending=False)
-        
-        st.dataframe(audience_stats.style.format({
-            'Total Content': '{:,}',
-            'Avg Release Year': '{:.0f}'
-        }), use_container_width=True, hide_index=True)
-
-    # TAB 5: Recommendations
-    with tabs[4]:
-        logging.info("Rendering Tab: Recommendations")
-        st.header("💡 Strategic Recommendations & Future Outlook")
-        
+
+    st.markdown("---")
+
+    # Rating by Type
+    st.markdown("### 📊 Rating Distribution by Content Type")
+
+    fig = cached_chart("audience_by_type", build_audience_by_type)
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Audience Statistics Table
+    st.markdown("**📋 Audience Category Statistics**")
+    audience_stats = analytics.audience_stats(catalog, selection=filter_selection)
+
+    st.dataframe(audience_stats.style.format({
+        'Total Content': '{:,}',
+        'Avg Release Year': '{:.0f}'
+    }), use_container_width=True, hide_index=True)
+
+
+# TAB 5: Recommendations
+def render_recommendations():
+    logging.info("Rendering Tab: Recommendations")
+    st.header("💡 Strategic Recommendations & Future Outlook")
+
+    st.markdown("""
+    <div style='background: linear-gradient(135deg, rgba(229, 9, 20, 0.1), rgba(255, 107, 107, 0.1)); 
+                padding: 1.5rem; border-radius: 15px; border-left: 5px solid #E50914; margin-bottom: 2rem;'>
+        <h3 style='color: #E50914; margin-top: 0;'>🚀 Executive Summary</h3>
+        <p style='color: #cbd5e1; line-height: 1.8;'>
+            To sustain growth, Netflix must pivot from a volume-based strategy to a <strong>value-driven, localized approach</strong>. 
+            Our analysis identifies clear opportunities in <strong>Asian markets</strong>, <strong>underserved genre niches</strong>, 
+            and <strong>optimized content formats</strong> for specific audience segments.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # --- Strategic Pillars ---
+    st.subheader("🏗️ Strategic Pillars")
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
         st.markdown("""
-        <div style='background: linear-gradient(135deg, rgba(229, 9, 20, 0.1), rgba(255, 107, 107, 0.1)); 
-                    padding: 1.5rem; border-radius: 15px; border-left: 5px solid #E50914; margin-bottom: 2rem;'>
-            <h3 style='color: #E50914; margin-top: 0;'>🚀 Executive Summary</h3>
-            <p style='color: #cbd5e1; line-height: 1.8;'>
-                To sustain growth, Netflix must pivot from a volume-based strategy to a <strong>value-driven, localized approach</strong>. 
-                Our analysis identifies clear opportunities in <strong>Asian markets</strong>, <strong>underserved genre niches</strong>, 
-                and <strong>optimized content formats</strong> for specific audience segments.
-            </p>
+        <div class="metric-container" style="height: 100%;">
+            <div class="metric-icon">🌏</div>
+            <h4 style="color: #E50914; margin: 0;">Localization</h4>
+            <p style="font-size: 0.8rem; margin-top: 0.5rem; color: #cbd5e1;">Deepen investment in local language originals, specifically in India, South Korea, and Japan.</p>
         </div>
         """, unsafe_allow_html=True)
-        
-        # --- Strategic Pillars ---
-        st.subheader("🏗️ Strategic Pillars")
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown("""
-            <div class="metric-container" style="height: 100%;">
-                <div class="metric-icon">🌏</div>
-                <h4 style="color: #E50914; margin: 0;">Localization</h4>
-                <p style="font-size: 0.8rem; margin-top: 0.5rem; color: #cbd5e1;">Deepen investment in local language originals, specifically in India, South Korea, and Japan.</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with col2:
-            st.markdown("""
-            <div class="metric-container" style="height: 100%;">
-                <div class="metric-icon">🎭</div>
-                <h4 style="color: #ff6b6b; margin: 0;">Diversification</h4>
-                <p style="font-size: 0.8rem; margin-top: 0.5rem; color: #cbd5e1;">Expand into Anime, Documentaries, and Reality TV to capture niche but loyal audiences.</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with col3:
-            st.markdown("""
-            <div class="metric-container" style="height: 100%;">
-                <div class="metric-icon">⏱️</div>
-                <h4 style="color: #c92a2a; margin: 0;">Optimization</h4>
-                <p style="font-size: 0.8rem; margin-top: 0.5rem; color: #cbd5e1;">Focus on 8-10 episode Limited Series which show higher completion rates than long-running shows.</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with col4:
-            st.markdown("""
-            <div class="metric-container" style="height: 100%;">
-                <div class="metric-icon">👨‍👩‍👧</div>
-                <h4 style="color: #862e9c; margin: 0;">Retention</h4>
-                <p style="font-size: 0.8rem; margin-top: 0.5rem; color: #cbd5e1;">Bolster the Kids & Family library to reduce churn among household subscribers.</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        st.markdown("---")
-        
-        # --- Market Opportunity Heatmap ---
-        st.subheader("🗺️ Global Content Opportunity Heatmap")
-        st.markdown("*Identifying genre gaps across key regions*")
-        
-        # Data Prep for Heatmap
-        # Merge genres and countries on original_index
-        genre_country = pd.merge(genres_df, countries_df, on="original_index")
-        # Filter for top 10 genres and top 10 countries to keep heatmap readable
-        top_10_genres = genres_df['genre'].value_counts().head(10).index
-        top_10_countries = countries_df['country_unnested'].value_counts().head(10).index
-        
-        gc_filtered = genre_country[
-            (genre_country['genre'].isin(top_10_genres)) & 
-            (genre_country['country_unnested'].isin(top_10_countries)) &
-            (genre_country['country_unnested'] != 'Unknown')
-        ]
-        
-        heatmap_data = pd.crosstab(gc_filtered['genre'], gc_filtered['country_unnested'])
-        
-        fig_heat = px.imshow(heatmap_data,
-                             labels=dict(x="Country", y="Genre", color="Content Count"),
-                             x=heatmap_data.columns,
-                             y=heatmap_data.index,
-                             color_continuous_scale='Reds',
-                             aspect="auto")
-        fig_heat.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#cbd5e1')
-        )
-        st.plotly_chart(fig_heat, use_container_width=True)
-        st.info("💡 **Opportunity:** Darker squares indicate saturation. Lighter squares represent potential market gaps where demand might exist but supply is low (e.g., Anime in non-Japanese markets, or Documentaries in India).")
 
-        st.markdown("---")
+    with col2:
+        st.markdown("""
+        <div class="metric-container" style="height: 100%;">
+            <div class="metric-icon">🎭</div>
+            <h4 style="color: #ff6b6b; margin: 0;">Diversification</h4>
+            <p style="font-size: 0.8rem; margin-top: 0.5rem; color: #cbd5e1;">Expand into Anime, Documentaries, and Reality TV to capture niche but loyal audiences.</p>
+        </div>
+        """, unsafe_allow_html=True)
 
-        # --- Interactive Strategy Simulator ---
-        st.subheader("🛠️ Content Strategy Simulator")
+    with col3:
         st.markdown("""
-        <div style='background: rgba(20, 20, 20, 0.5); padding: 1rem; border-radius: 10px; border: 1px solid rgba(229, 9, 20, 0.3);'>
-            <p style='color: #cbd5e1; margin: 0;'>
-                Use this tool to simulate a new content launch. Select your target parameters to see current market saturation and historical performance benchmarks.
-            </p>
+        <div class="metric-container" style="height: 100%;">
+            <div class="metric-icon">⏱️</div>
+            <h4 style="color: #c92a2a; margin: 0;">Optimization</h4>
+            <p style="font-size: 0.8rem; margin-top: 0.5rem; color: #cbd5e1;">Focus on 8-10 episode Limited Series which show higher completion rates than long-running shows.</p>
         </div>
         """, unsafe_allow_html=True)
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            sim_genre = st.selectbox("Target Genre", sorted(genres_df['genre'].unique()), key='sim_genre')
-        with col2:
-            sim_type = st.selectbox("Content Format", ["Movie", "TV Show"], key='sim_type')
-        with col3:
-            sim_audience = st.selectbox("Target Audience", sorted(df['Content_For'].dropna().unique()), key='sim_audience')
-        
-        logging.info(f"Strategy Simulator: Genre={sim_genre}, Type={sim_type}, Audience={sim_audience}")
-            
-        # Calculation
-        # Filter main df
-        # We need to filter by genre (which is in listed_in string)
-        mask = (df['listed_in'].str.contains(sim_genre, na=False)) & \
-               (df['type'] == sim_type) & \
-               (df['Content_For'] == sim_audience)
-        
-        sim_data = df[mask]
-        
-        st.markdown("### 📊 Market Analysis Report")
-        
-        if len(sim_data) > 0:
-            m1, m2, m3 = st.columns(3)
-            with m1:
-                st.metric("📦 Existing Titles", f"{len(sim_data)}")
-            with m2:
-                if sim_type == "Movie":
-                    avg_dur = sim_data['Movie_duration'].mean()
-                    st.metric("⏱️ Avg Duration", f"{avg_dur:.0f} min")
-                else:
-                    avg_dur = sim_data['Series_duration'].mean()
-                    st.metric("⏱️ Avg Duration", f"{avg_dur:.1f} seasons")
-            with m3:
-                # Top country for this niche
-                top_c = sim_data['country'].value_counts().index[0] if not sim_data['country'].value_counts().empty else "Unknown"
-                st.metric("🏆 Dominant Market", str(top_c)[:15])
-            
-            # Saturation Gauge
-            saturation_level = len(sim_data)
-            if saturation_level < 50:
-                status = "🔵 Blue Ocean (High Opportunity)"
-                color = "#38ef7d"
-            elif saturation_level < 200:
-                status = "🟡 Competitive (Moderate)"
-                color = "#fb923c"
+
+    with col4:
+        st.markdown("""
+        <div class="metric-container" style="height: 100%;">
+            <div class="metric-icon">👨‍👩‍👧</div>
+            <h4 style="color: #862e9c; margin: 0;">Retention</h4>
+            <p style="font-size: 0.8rem; margin-top: 0.5rem; color: #cbd5e1;">Bolster the Kids & Family library to reduce churn among household subscribers.</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("---")
+
+    # --- Market Opportunity Heatmap ---
+    st.subheader("🗺️ Global Content Opportunity Heatmap")
+    st.markdown("*Identifying genre gaps across key regions*")
+
+    heatmap_n = st.slider("Top genres × countries", min_value=5, max_value=25, value=10, key='heatmap_n')
+    fig_heat = cached_chart("opportunity_heatmap", build_opportunity_heatmap, top_n=heatmap_n)
+    selectable_chart(fig_heat, "opportunity_heatmap")
+    st.caption("Click a cell to cross-filter every other chart by that genre and country.")
+    st.info("💡 **Opportunity:** Darker squares indicate saturation. Lighter squares represent potential market gaps where demand might exist but supply is low (e.g., Anime in non-Japanese markets, or Documentaries in India).")
+
+    st.markdown("---")
+
+    # --- Interactive Strategy Simulator ---
+    render_strategy_simulator()
+
+    st.markdown("---")
+
+    # --- Opportunity Ranking ---
+    st.subheader("📋 Opportunity Ranking")
+    st.markdown("*Every genre × format × audience combination on the platform, least saturated first*")
+    ranking = analytics.opportunity_ranking(catalog, selection=filter_selection)
+    ranking['status'] = ranking['status'].map(lambda s: SATURATION_STYLE[s][0])
+    ranking.columns = ['Genre', 'Format', 'Audience', 'Existing Titles', 'Avg Duration', 'Dominant Market', 'Market Status']
+    st.dataframe(ranking.style.format({'Avg Duration': '{:.1f}'}), use_container_width=True, hide_index=True)
+
+
+# Content Strategy Simulator
+@st.fragment
+def render_strategy_simulator():
+    # A fragment: changing one of its selectboxes reruns only this function
+    st.subheader("🛠️ Content Strategy Simulator")
+    st.markdown("""
+    <div style='background: rgba(20, 20, 20, 0.5); padding: 1rem; border-radius: 10px; border: 1px solid rgba(229, 9, 20, 0.3);'>
+        <p style='color: #cbd5e1; margin: 0;'>
+            Use this tool to simulate a new content launch. Select your target parameters to see current market saturation and historical performance benchmarks.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        sim_genre = st.selectbox("Target Genre", sorted(analytics.present(catalog, 'genre', selection=filter_selection)), key='sim_genre')
+    with col2:
+        sim_type = st.selectbox("Content Format", analytics.CONTENT_TYPES, key='sim_type')
+    with col3:
+        sim_audience = st.selectbox("Target Audience", list(analytics.present(catalog, 'Content_For', selection=filter_selection)), key='sim_audience')
+
+    logging.info(f"Strategy Simulator: Genre={sim_genre}, Type={sim_type}, Audience={sim_audience}")
+
+    # Calculation
+    # One saturation cube lookup plus one bitmap query for the example titles
+    with profiler().span("simulator:query"):
+        sim_metrics, sim_examples = analytics.simulate(catalog, sim_genre, sim_type, sim_audience,
+                                                        selection=filter_selection)
+
+    st.markdown("### 📊 Market Analysis Report")
+
+    if sim_metrics is not None:
+        m1, m2, m3 = st.columns(3)
+        with m1:
+            st.metric("📦 Existing Titles", f"{sim_metrics['existing_titles']}")
+        with m2:
+            avg_dur = sim_metrics['avg_duration']
+            if sim_type == "Movie":
+                st.metric("⏱️ Avg Duration", f"{avg_dur:.0f} min")
             else:
-                status = "🔴 Saturated (High Competition)"
-                color = "#ff6b6b"
-                
-            st.markdown(f"""
-            <div style='background: rgba(255, 255, 255, 0.05); padding: 1rem; border-radius: 10px; margin-top: 1rem; text-align: center; border: 1px solid {color};'>
-                <h4 style='color: #cbd5e1; margin: 0;'>Market Status</h4>
-                <h2 style='color: {color}; margin: 0.5rem 0;'>{status}</h2>
-                <p style='font-size: 0.9rem; color: #cbd5e1;'>There are currently <strong>{saturation_level}</strong> titles matching these criteria.</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Show recent examples
-            st.markdown("**Recent Examples in this Niche:**")
-            st.dataframe(sim_data[['title', 'release_year', 'country', 'rating']].sort_values('release_year', ascending=False).head(5), use_container_width=True)
-            
-        else:
-            st.warning("⚠️ No existing content found matching these exact criteria. This could be a **massive untapped opportunity** or a **niche with no demand**.")
-            st.markdown("### 🚀 Recommendation: Pilot Project")
-            st.write("Consider launching a low-budget pilot or acquiring a license to test this specific market segment.")
-
-    # TAB 6: Complete Analysis
-    with tabs[5]:
-        logging.info("Rendering Tab: Complete Analysis")
-        st.header("📑 Complete Analysis Report")
-        
-        import textwrap
-        
-        # Executive Summary Banner
-        st.markdown(textwrap.dedent("""
-        <div style='background: linear-gradient(135deg, #E50914 0%, #B20710 100%); padding: 2rem; border-radius: 16px; margin-bottom: 2rem;'>
-            <h2 style='color: white !important; margin: 0 0 1rem 0; text-align: center;'>📊 Executive Summary</h2>
-            <p style='color: white; font-size: 1.1rem; line-height: 1.8; text-align: center; margin: 0;'>
-                Analysis of <strong>8,807 titles</strong> reveals a strategic pivot towards <strong>Original Content</strong> and 
-                <strong>International Expansion</strong>. Key opportunities lie in hyper-localization for emerging markets, 
-                optimizing content formats for retention, and diversifying into high-demand niche genres.
-            </p>
+                st.metric("⏱️ Avg Duration", f"{avg_dur:.1f} seasons")
+        with m3:
+            # Top country for this niche
+            top_c = sim_metrics['dominant_market'] if pd.notna(sim_metrics['dominant_market']) else "Unknown"
+            st.metric("🏆 Dominant Market", str(top_c)[:15])
+
+        # Saturation Gauge
+        saturation_level = sim_metrics['existing_titles']
+        status, color = SATURATION_STYLE[sim_metrics['status']]
+
+        st.markdown(f"""
+        <div style='background: rgba(255, 255, 255, 0.05); padding: 1rem; border-radius: 10px; margin-top: 1rem; text-align: center; border: 1px solid {color};'>
+            <h4 style='color: #cbd5e1; margin: 0;'>Market Status</h4>
+            <h2 style='color: {color}; margin: 0.5rem 0;'>{status}</h2>
+            <p style='font-size: 0.9rem; color: #cbd5e1;'>There are currently <strong>{saturation_level}</strong> titles matching these criteria.</p>
         </div>
-        """), unsafe_allow_html=True)
-        
-        # Key Metrics Dashboard
-        st.markdown("### 📈 Key Performance Indicators")
-        
-        kpi1, kpi2, kpi3, kpi4 = st.columns(4)
-        
-        with kpi1:
-            total_titles = len(df)
-            st.metric(
-                label="🎬 Total Titles",
-                value=f"{total_titles:,}",
-                delta="Content Library"
-            )
-        
-        with kpi2:
-            movies_count = len(df[df['type']=='Movie'])
-            movie_pct = (movies_count / total_titles) * 100
-            st.metric(
-                label="🎥 Movies Share",
-                value=f"{movie_pct:.1f}%",
-                delta=f"{movies_count:,} titles"
-            )
-        
-        with kpi3:
-            tv_count = len(df[df['type']=='TV Show'])
-            tv_pct = (tv_count / total_titles) * 100
-            st.metric(
-                label="📺 TV Shows Share",
-                value=f"{tv_pct:.1f}%",
-                delta=f"{tv_count:,} titles"
-            )
-        
-        with kpi4:
-            top_country = df['country'].mode()[0]
-            st.metric(
-                label="🌍 Top Market",
-                value=top_country,
-                delta="Production Hub"
-            )
-        
-        st.markdown("---")
-        
-        # Detailed Insights Section
-        st.markdown("### 🔍 Detailed Insights")
-        
-        insight_tabs = st.tabs(["👥 Audience", "🎭 Content Strategy", "🌍 Geographic", "⏱️ Duration"])
-        
-        # Audience Tab
+        """, unsafe_allow_html=True)
+
+        # Show recent examples
+        st.markdown("**Recent Examples in this Niche:**")
+        st.dataframe(sim_examples, use_container_width=True)
+
+    else:
+        st.warning("⚠️ No existing content found matching these exact criteria. This could be a **massive untapped opportunity** or a **niche with no demand**.")
+        st.markdown("### 🚀 Recommendation: Pilot Project")
+        st.write("Consider launching a low-budget pilot or acquiring a license to test this specific market segment.")
+
+
+# TAB 6: Complete Analysis
+def render_complete_analysis():
+    logging.info("Rendering Tab: Complete Analysis")
+    st.header("📑 Complete Analysis Report")
+
+    import textwrap
+
+    # Executive Summary Banner
+    st.markdown(textwrap.dedent("""
+    <div style='background: linear-gradient(135deg, #E50914 0%, #B20710 100%); padding: 2rem; border-radius: 16px; margin-bottom: 2rem;'>
+        <h2 style='color: white !important; margin: 0 0 1rem 0; text-align: center;'>📊 Executive Summary</h2>
+        <p style='color: white; font-size: 1.1rem; line-height: 1.8; text-align: center; margin: 0;'>
+            Analysis of <strong>8,807 titles</strong> reveals a strategic pivot towards <strong>Original Content</strong> and 
+            <strong>International Expansion</strong>. Key opportunities lie in hyper-localization for emerging markets, 
+            optimizing content formats for retention, and diversifying into high-demand niche genres.
+        </p>
+    </div>
+    """), unsafe_allow_html=True)
+
+    # Key Metrics Dashboard
+    st.markdown("### 📈 Key Performance Indicators")
+
+    kpis = analytics.kpis(catalog, selection=filter_selection)
+    kpi1, kpi2, kpi3, kpi4 = st.columns(4)
+
+    with kpi1:
+        st.metric(
+            label="🎬 Total Titles",
+            value=f"{kpis.total_titles:,}",
+            delta="Content Library"
+        )
+
+    with kpi2:
+        st.metric(
+            label="🎥 Movies Share",
+            value=f"{kpis.movie_pct:.1f}%",
+            delta=f"{kpis.movies:,} titles"
+        )
+
+    with kpi3:
+        st.metric(
+            label="📺 TV Shows Share",
+            value=f"{kpis.tv_pct:.1f}%",
+            delta=f"{kpis.tv_shows:,} titles"
+        )
+
+    with kpi4:
+        st.metric(
+            label="🌍 Top Market",
+            value=kpis.top_market,
+            delta="Production Hub"
+        )
+
+    st.download_button(
+        label="⬇️ Download KPIs (JSON)",
+        data=kpis.to_json(),
+        file_name="netflix_kpis.json",
+        mime="application/json"
+    )
+
+    st.markdown("---")
+
+    # Detailed Insights Section
+    st.markdown("### 🔍 Detailed Insights")
+
+    insight_tabs = st.tabs(["👥 Audience", "🎭 Content Strategy", "🌍 Geographic", "⏱️ Duration"], key="insight_tab", on_change="rerun")
+
+    # Audience Tab
+    if insight_tabs[0].open:
         with insight_tabs[0]:
             col1, col2 = st.columns(2)
-            
+
             with col1:
                 st.markdown(textwrap.dedent("""
                 <div class='card' style='background: linear-gradient(135deg, #E50914 0%, #B20710 100%); text-align: left; padding: 1.5rem; border-radius: 10px;'>
@@ -1292,26 +1377,17 @@ if df is not None:
                     </p>
                 </div>
                 """), unsafe_allow_html=True)
-            
+
             with col2:
                 # Audience distribution chart
-                audience_counts = df['Content_For'].value_counts().reset_index()
-                audience_counts.columns = ['Audience', 'Count']
-                
-                fig = px.pie(audience_counts, values='Count', names='Audience',
-                            title='Content Distribution by Audience',
-                            color_discrete_sequence=['#E50914', '#ff6b6b', '#c92a2a', '#862e9c'])
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='#cbd5e1')
-                )
+                fig = cached_chart("audience_share", build_audience_share)
                 st.plotly_chart(fig, use_container_width=True)
-        
-        # Content Strategy Tab
+
+    # Content Strategy Tab
+    if insight_tabs[1].open:
         with insight_tabs[1]:
             col1, col2 = st.columns(2)
-            
+
             with col1:
                 st.markdown(textwrap.dedent("""
                 <div class='card' style='background: linear-gradient(135deg, #11998e 0%, #38ef7d 100%); text-align: left; padding: 1.5rem; border-radius: 10px;'>
@@ -1325,27 +1401,17 @@ if df is not None:
                     </p>
                 </div>
                 """), unsafe_allow_html=True)
-            
+
             with col2:
                 # Top Genres Chart
-                top_genres = genres_df['genre'].value_counts().head(10).reset_index()
-                top_genres.columns = ['Genre', 'Count']
-                
-                fig = px.bar(top_genres, x='Count', y='Genre', orientation='h',
-                            title='Top 10 Genres',
-                            color='Count', color_continuous_scale='Reds')
-                fig.update_layout(
-                    yaxis={'categoryorder':'total ascending'},
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='#cbd5e1')
-                )
+                fig = cached_chart("top_10_genres", build_top_10_genres)
                 st.plotly_chart(fig, use_container_width=True)
 
-        # Geographic Tab
+    # Geographic Tab
+    if insight_tabs[2].open:
         with insight_tabs[2]:
             col1, col2 = st.columns(2)
-            
+
             with col1:
                 st.markdown(textwrap.dedent("""
                 <div class='card' style='background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); text-align: left; padding: 1.5rem; border-radius: 10px;'>
@@ -1359,27 +1425,17 @@ if df is not None:
                     </p>
                 </div>
                 """), unsafe_allow_html=True)
-            
+
             with col2:
                 # Top Countries Chart
-                top_countries = countries_df['country_unnested'].value_counts().head(10).reset_index()
-                top_countries.columns = ['Country', 'Count']
-                top_countries = top_countries[top_countries['Country'] != 'Unknown']
-                
-                fig = px.bar(top_countries, x='Country', y='Count',
-                            title='Top Production Countries',
-                            color='Count', color_continuous_scale='Reds')
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='#cbd5e1')
-                )
+                fig = cached_chart("top_10_countries", build_top_10_countries)
                 st.plotly_chart(fig, use_container_width=True)
 
-        # Duration Tab
+    # Duration Tab
+    if insight_tabs[3].open:
         with insight_tabs[3]:
             col1, col2 = st.columns(2)
-            
+
             with col1:
                 st.markdown(textwrap.dedent("""
                 <div class='card' style='background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); text-align: left; padding: 1.5rem; border-radius: 10px;'>
@@ -1393,152 +1449,481 @@ if df is not None:
                     </p>
                 </div>
                 """), unsafe_allow_html=True)
-            
+
             with col2:
                 # Duration Chart (Movies)
-                fig = px.histogram(df[df['type']=='Movie'].dropna(subset=['Movie_duration']), 
-                                  x='Movie_duration', nbins=30,
-                                  title='Movie Duration Distribution',
-                                  color_discrete_sequence=['#E50914'])
-                fig.update_layout(
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='#cbd5e1')
-                )
+                fig = cached_chart("movie_duration_overview", build_movie_duration_overview)
                 st.plotly_chart(fig, use_container_width=True)
 
-        st.markdown("---")
-        
-        # Strategic Recommendations
-        st.markdown("### 🚀 Strategic Recommendations")
-        
-        rec_col1, rec_col2 = st.columns(2)
-        
-        with rec_col1:
-            with st.expander("🎯 **Content Strategy**", expanded=True):
-                st.markdown(textwrap.dedent("""
-                #### Immediate Actions:
-                1. **Hyper-Localization**
-                   - Invest in local language originals (India, LATAM)
-                   - "Local stories, global appeal" (e.g., Squid Game)
-                
-                2. **Format Optimization**
-                   - Prioritize Limited Series (6-10 eps)
-                   - Reduce risk of long-term commitments
-                
-                3. **Genre Diversification**
-                   - Expand Anime library (high engagement)
-                   - Invest in True Crime & Reality TV (low cost, high buzz)
-                """))
-            
-            with st.expander("👨‍👩‍👧 **Audience Growth**", expanded=True):
-                st.markdown(textwrap.dedent("""
-                #### Target Segments:
-                1. **Kids & Family**
-                   - Bolster animation library to compete with Disney+
-                   - Create "Family Movie Night" bundles
-                
-                2. **Teens & Young Adults**
-                   - Focus on YA adaptations and coming-of-age dramas
-                   - Leverage social media trends for promotion
-                """))
-        
-        with rec_col2:
-            with st.expander("💰 **Business Impact**", expanded=True):
-                st.markdown(textwrap.dedent("""
-                #### Expected Outcomes:
-                1. **Retention**
-                   - Lower churn through consistent "event" releases
-                   - Higher engagement with bingeable formats
-                
-                2. **Acquisition**
-                   - New subs from emerging markets via localization
-                   - Niche audiences via genre expansion
-                
-                3. **Brand Value**
-                   - "Home of Originals" positioning
-                   - Cultural dominance via global hits
-                """))
-            
-            with st.expander("📊 **Data-Driven Tactics**", expanded=True):
-                st.markdown(textwrap.dedent("""
-                #### Analytics Focus:
-                1. **Completion Rates**
-                   - Monitor drop-off points in pilot episodes
-                
-                2. **Regional Demand**
-                   - Heatmap analysis for under-served regions
-                
-                3. **Social Sentiment**
-                   - Track viral potential of new releases
-                """))
-        
-        # Expected Impact Summary
-        st.markdown("---")
-        st.markdown("### 📊 Projected Growth")
-        
-        impact_col1, impact_col2, impact_col3 = st.columns(3)
-        
-        with impact_col1:
+    st.markdown("---")
+
+    # Strategic Recommendations
+    st.markdown("### 🚀 Strategic Recommendations")
+
+    rec_col1, rec_col2 = st.columns(2)
+
+    with rec_col1:
+        with st.expander("🎯 **Content Strategy**", expanded=True):
             st.markdown(textwrap.dedent("""
-            <div style='text-align: center; padding: 1rem; background: rgba(229, 9, 20, 0.1); border-radius: 10px;'>
-                <div style='font-size: 2rem;'>📈</div>
-                <div style='font-size: 1.5rem; font-weight: bold; color: #E50914;'>+15-20%</div>
-                <div style='color: #cbd5e1;'>Intl. Sub Growth</div>
-            </div>
-            """), unsafe_allow_html=True)
-            
-        with impact_col2:
+            #### Immediate Actions:
+            1. **Hyper-Localization**
+               - Invest in local language originals (India, LATAM)
+               - "Local stories, global appeal" (e.g., Squid Game)
+
+            2. **Format Optimization**
+               - Prioritize Limited Series (6-10 eps)
+               - Reduce risk of long-term commitments
+
+            3. **Genre Diversification**
+               - Expand Anime library (high engagement)
+               - Invest in True Crime & Reality TV (low cost, high buzz)
+            """))
+
+        with st.expander("👨‍👩‍👧 **Audience Growth**", expanded=True):
             st.markdown(textwrap.dedent("""
-            <div style='text-align: center; padding: 1rem; background: rgba(229, 9, 20, 0.1); border-radius: 10px;'>
-                <div style='font-size: 2rem;'>📉</div>
-                <div style='font-size: 1.5rem; font-weight: bold; color: #E50914;'>-5-8%</div>
-                <div style='color: #cbd5e1;'>Churn Rate Reduction</div>
-            </div>
-            """), unsafe_allow_html=True)
-            
-        with impact_col3:
+            #### Target Segments:
+            1. **Kids & Family**
+               - Bolster animation library to compete with Disney+
+               - Create "Family Movie Night" bundles
+
+            2. **Teens & Young Adults**
+               - Focus on YA adaptations and coming-of-age dramas
+               - Leverage social media trends for promotion
+            """))
+
+    with rec_col2:
+        with st.expander("💰 **Business Impact**", expanded=True):
             st.markdown(textwrap.dedent("""
-            <div style='text-align: center; padding: 1rem; background: rgba(229, 9, 20, 0.1); border-radius: 10px;'>
-                <div style='font-size: 2rem;'>💰</div>
-                <div style='font-size: 1.5rem; font-weight: bold; color: #E50914;'>High</div>
-                <div style='color: #cbd5e1;'>ROI on Originals</div>
-            </div>
-            """), unsafe_allow_html=True)
+            #### Expected Outcomes:
+            1. **Retention**
+               - Lower churn through consistent "event" releases
+               - Higher engagement with bingeable formats
 
-    # TAB 7: App Logs
-    with tabs[6]:
-        logging.info("Rendering Tab: App Logs")
-        st.header("📝 Application Logs")
-        
+            2. **Acquisition**
+               - New subs from emerging markets via localization
+               - Niche audiences via genre expansion
+
+            3. **Brand Value**
+               - "Home of Originals" positioning
+               - Cultural dominance via global hits
+            """))
+
+        with st.expander("📊 **Data-Driven Tactics**", expanded=True):
+            st.markdown(textwrap.dedent("""
+            #### Analytics Focus:
+            1. **Completion Rates**
+               - Monitor drop-off points in pilot episodes
+
+            2. **Regional Demand**
+               - Heatmap analysis for under-served regions
+
+            3. **Social Sentiment**
+               - Track viral potential of new releases
+            """))
+
+    # Expected Impact Summary
+    st.markdown("---")
+    st.markdown("### 📊 Projected Growth")
+
+    impact_col1, impact_col2, impact_col3 = st.columns(3)
+
+    with impact_col1:
+        st.markdown(textwrap.dedent("""
+        <div style='text-align: center; padding: 1rem; background: rgba(229, 9, 20, 0.1); border-radius: 10px;'>
+            <div style='font-size: 2rem;'>📈</div>
+            <div style='font-size: 1.5rem; font-weight: bold; color: #E50914;'>+15-20%</div>
+            <div style='color: #cbd5e1;'>Intl. Sub Growth</div>
+        </div>
+        """), unsafe_allow_html=True)
+
+    with impact_col2:
+        st.markdown(textwrap.dedent("""
+        <div style='text-align: center; padding: 1rem; background: rgba(229, 9, 20, 0.1); border-radius: 10px;'>
+            <div style='font-size: 2rem;'>📉</div>
+            <div style='font-size: 1.5rem; font-weight: bold; color: #E50914;'>-5-8%</div>
+            <div style='color: #cbd5e1;'>Churn Rate Reduction</div>
+        </div>
+        """), unsafe_allow_html=True)
+
+    with impact_col3:
+        st.markdown(textwrap.dedent("""
+        <div style='text-align: center; padding: 1rem; background: rgba(229, 9, 20, 0.1); border-radius: 10px;'>
+            <div style='font-size: 2rem;'>💰</div>
+            <div style='font-size: 1.5rem; font-weight: bold; color: #E50914;'>High</div>
+            <div style='color: #cbd5e1;'>ROI on Originals</div>
+        </div>
+        """), unsafe_allow_html=True)
+
+
+# TAB 7: App Logs
+def render_performance():
+    window = st.selectbox("Recent spans", [500, 2000, 5000, 20000], index=1, key='perf_window')
+    stats = profiler().stats(window)
+
+    if stats.empty:
+        st.info("ℹ️ No timings recorded yet.")
+    else:
+        st.caption("Wall time per stage across recent reruns. tab: spans include the charts they render; "
+                   "chart: spans include figure cache hits, build: spans only the misses.")
+        if not profiler().trace_memory:
+            st.caption("Peak allocation is tracked when NETFLIX_PROFILE_MEMORY=1 is set.")
+            stats = stats.drop(columns="p95_peak_mb")
+        st.dataframe(stats.round(2), use_container_width=True, hide_index=True)
+
+    if streamed is not None:
+        st.caption(f"Streamed {len(streamed):,} rows in {streamed.chunks} chunks of {streaming.CHUNK_ROWS:,}; "
+                   "no filter or aggregation engine in streaming mode.")
+    else:
+        filter_stats = catalog.filter_engine.stats()
+        st.caption("Filter engine: " + ", ".join(
+            f"{name.replace('_', ' ')} {part['entries']} cached, {part['hits']} hits, {part['misses']} misses"
+            for name, part in filter_stats.items()))
+        counts = catalog.aggregates.stats()
+        st.caption(f"Aggregation engine: {counts['entries']} selections cached, {counts['hits']} hits, "
+                   f"{counts['misses']} misses, {counts['rows_counted']:,} rows counted incrementally")
+
+    st.download_button(
+        label="⬇️ Download Timings (JSON)",
+        data=profiler().to_json(window),
+        file_name="netflix_app_timings.json",
+        mime="application/json"
+    )
+
+
+def render_app_logs():
+    logging.info("Rendering Tab: App Logs")
+    st.header("📝 Application Logs")
+
+    st.markdown("""
+    <div style='background: rgba(20, 20, 20, 0.5); padding: 1rem; border-radius: 10px; margin-bottom: 1rem;'>
+        <p style='color: #cbd5e1; margin: 0;'>
+            System logs for debugging and tracking application events.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Log Display Area
+    source = st.radio("Source", ["Recent records", "Log file", "Performance"], horizontal=True, key='log_source')
+
+    if source == "Performance":
+        render_performance()
+        return
+
+    if source == "Log file":
+        n_lines = st.selectbox("Last lines", [100, 500, 1000, 5000], index=1, key='log_tail_lines')
+        lines = log_pipeline.tail(n_lines)
+        st.caption(f"Last {len(lines):,} lines of {log_pipeline.path}")
+        download = "\n".join(lines)
+    else:
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col1:
+            min_level = st.selectbox("Minimum level", logbuffer.LEVELS, index=1, key='log_level')
+        with col2:
+            page_size = st.selectbox("Lines per page", [50, 100, 250, 500], index=1, key='log_page_size')
+        min_levelno = logging.getLevelName(min_level)
+        total = log_buffer.count(min_levelno)
+        n_pages = max(1, -(-total // page_size))
+        # Clamp a stale page number after the filter or page size shrinks the result.
+        if st.session_state.get('log_page', 1) > n_pages:
+            st.session_state['log_page'] = n_pages
+        with col3:
+            page = st.number_input("Page (newest first)", min_value=1, max_value=n_pages, value=1, step=1, key='log_page')
+
+        lines, total = log_buffer.page(page - 1, page_size, min_levelno)
+        st.caption(f"{total:,} matching records in a buffer of the last {log_buffer.capacity:,} "
+                   f"({log_buffer.dropped:,} older records dropped)")
+        download = log_buffer.text(min_levelno)
+
+    if not lines:
+        st.info("ℹ️ No logs recorded yet.")
+    else:
+        st.code("\n".join(lines), language='text')
+
+    # Add a download button for logs
+    st.download_button(
+        label="⬇️ Download Logs",
+        data=download,
+        file_name="netflix_app_logs.txt",
+        mime="text/plain"
+    )
+
+    # Test Log Button
+    if st.button("Generate Test Log"):
+        logging.info("Test log entry generated by user.")
+        st.rerun()
+
+
+def render_streaming_overview():
+    # Streaming mode: the views the chunked aggregates cover, over every row of the catalog
+    logging.info("Rendering Tab: Streaming Overview")
+    st.info(f"📦 **Streaming mode:** {DATA_PATH} is larger than NETFLIX_STREAMING_BYTES "
+            f"({streaming.STREAMING_BYTES:,} bytes), so it was aggregated in chunks of {streaming.CHUNK_ROWS:,} rows "
+            "instead of loaded into memory. Filters, cross-filtering, row-level tables and the simulator "
+            "need the in-memory catalog and are not available.")
+
+    kpis = streamed.kpis()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("📺 Total Titles", f"{kpis['total_titles']:,}")
+    with col2:
+        st.metric("🎬 Movies", f"{kpis['movies']:,}", f"{kpis['movie_pct']:.1f}%")
+    with col3:
+        st.metric("📺 TV Shows", f"{kpis['tv_shows']:,}", f"{kpis['tv_pct']:.1f}%")
+    with col4:
+        st.metric("🌍 Top Market", kpis['top_market'])
+    st.caption(f"{kpis['countries']:,} country lists, {kpis['genres']:,} genre lists, "
+               f"releases from {kpis['earliest_release']} to {kpis['latest_release']}.")
+
+    st.markdown("---")
+    col1, col2 = st.columns(2)
+    with col1:
+        fig, _ = cached_chart("type_distribution", build_type_distribution)
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        fig, _ = cached_chart("audience_distribution", build_audience_distribution)
+        st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig, _ = cached_chart("top_countries", build_top_countries)
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        fig, _ = cached_chart("top_genres", build_top_genres)
+        st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(cached_chart("country_type", build_country_type), use_container_width=True)
+    with col2:
+        st.plotly_chart(cached_chart("audience_by_type", build_audience_by_type), use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig, _ = cached_chart("addition_trend", build_addition_trend)
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.plotly_chart(cached_chart("monthly_additions", build_monthly_additions), use_container_width=True)
+
+    st.plotly_chart(cached_chart("release_years", build_release_years), use_container_width=True)
+    recent_count, recent_pct = streamed.recent_release_share(5)
+    st.caption(f"{recent_count:,} titles ({recent_pct:.1f}%) were released in the last 5 years of the catalog.")
+
+    col1, col2 = st.columns(2)
+    for column, content_type, chart_id, build, unit in (
+            (col1, 'Movie', "movie_duration", build_movie_duration, "min"),
+            (col2, 'TV Show', "series_duration", build_series_duration, "seasons")):
+        with column:
+            st.plotly_chart(cached_chart(chart_id, build), use_container_width=True)
+            stats = streamed.duration_stats(content_type)
+            st.caption(f"Mean {stats['mean']:.1f} {unit}, median {stats['median']:.0f}, "
+                       f"range {stats['min']:.0f}-{stats['max']:.0f}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        fig, _ = cached_chart("top_ratings", build_top_ratings)
+        st.plotly_chart(fig, use_container_width=True)
+    with col2:
+        st.markdown("**👥 Audience Statistics**")
+        st.dataframe(streamed.audience_stats().style.format({'Avg Release Year': '{:.0f}'}),
+                     use_container_width=True, hide_index=True)
+
+    st.markdown("---")
+    st.subheader("🗺️ Global Content Opportunity Heatmap")
+    heatmap_n = st.slider("Top genres × countries", min_value=5, max_value=25, value=10, key='heatmap_n')
+    st.plotly_chart(cached_chart("opportunity_heatmap", build_opportunity_heatmap, top_n=heatmap_n),
+                    use_container_width=True)
+
+    st.subheader("📋 Opportunity Ranking")
+    ranking = streamed.opportunity_ranking()
+    ranking['status'] = ranking['status'].map(lambda s: SATURATION_STYLE[s][0])
+    ranking.columns = ['Genre', 'Format', 'Audience', 'Existing Titles', 'Avg Duration', 'Dominant Market', 'Market Status']
+    st.dataframe(ranking.style.format({'Avg Duration': '{:.1f}'}), use_container_width=True, hide_index=True)
+
+
+# Directors offered in the filter panel; any other name can be typed in
+FILTER_DIRECTOR_OPTIONS = 500
+FILTER_KEYS = ["filter_types", "filter_audiences", "filter_ratings", "filter_countries", "filter_genres",
+               "filter_directors", "filter_release_years", "filter_years_added"]
+
+
+def reset_filters():
+    for key in FILTER_KEYS:
+        st.session_state.pop(key, None)
+
+
+def year_range(label, engine, column, key):
+    # A range at the column's full extent leaves it unfiltered, titles with no year included
+    bounds = engine.bounds(column)
+    if bounds is None or bounds[0] == bounds[1]:
+        return None
+    selected = st.slider(label, bounds[0], bounds[1], bounds, key=key)
+    return None if tuple(selected) == bounds else selected
+
+
+def render_filter_panel(catalog):
+    """Sidebar filters that apply to every tab; returns the ``Filters`` selection."""
+    engine = catalog.filter_engine
+    st.markdown("## 🎛️ Filters")
+    selection = Filters.make(
+        types=st.multiselect("Type", schema.CONTENT_TYPES, key="filter_types"),
+        release_years=year_range("Release Year", engine, "release_year", "filter_release_years"),
+        years_added=year_range("Year Added", engine, "year_added", "filter_years_added"),
+        audiences=st.multiselect("Audience", schema.AUDIENCES, key="filter_audiences"),
+        ratings=st.multiselect("Rating", catalog.index.values("rating"), key="filter_ratings"),
+        countries=st.multiselect("Countries", sorted(catalog.country.vocab), key="filter_countries"),
+        genres=st.multiselect("Genres", sorted(catalog.genre.vocab), key="filter_genres"),
+        directors=st.multiselect(
+            "Directors",
+            list(catalog.director.top(FILTER_DIRECTOR_OPTIONS, exclude=["Unknown"]).index),
+            key="filter_directors", accept_new_options=True,
+            help=f"The {FILTER_DIRECTOR_OPTIONS} most prolific directors; type to add any other name."),
+    )
+    if selection.active:
+        st.caption(f"🔎 {engine.count(selection):,} of {len(catalog):,} titles match")
+        st.button("Reset filters", on_click=reset_filters, use_container_width=True)
+    cross = st.session_state.get("cross_filter")
+    if cross is not None:
+        clicked = " or ".join(f"({point.describe()})" for point in cross[1])
+        st.info(f"🔗 **Cross-filter** from {CROSS_FILTER_CHARTS[cross[0]][0]}: {clicked}. "
+                "Charts are re-aggregated for it; KPIs and tables follow the filters above.")
+        st.button("Clear cross-filter", on_click=clear_cross_filter, use_container_width=True)
+    st.markdown("---")
+    return selection
+
+
+TAB_RENDERERS = [
+    render_problem_statement,
+    render_interactive_eda,
+    render_content_analysis,
+    render_rating_analysis,
+    render_recommendations,
+    render_complete_analysis,
+    render_app_logs,
+]
+
+profiler().begin_run()
+catalog = streamed = None
+if os.path.exists(DATA_PATH) and streaming.should_stream(DATA_PATH):
+    with profiler().span("stream_aggregates"):
+        streamed = stream_catalog(snapshot.source_stat(DATA_PATH))
+else:
+    with profiler().span("load_catalog"):
+        catalog = load_catalog(snapshot.source_stat(DATA_PATH) if os.path.exists(DATA_PATH) else None)
+
+if streamed is not None:
+    # Too large to load: every chart reads the streamed aggregates, cached per file state
+    dataset_version = "stream-" + "-".join(map(str, snapshot.source_stat(DATA_PATH)))
+    tabs = st.tabs(["📦 Aggregate Overview", "📝 App Logs"], key="stream_tab", on_change="rerun")
+    for tab, render in zip(tabs, [render_streaming_overview, render_app_logs]):
+        if tab.open:
+            with tab, profiler().span(f"tab:{render.__name__}"):
+                render()
+
+elif catalog is not None:
+    # Every tab reads the filtered view; charts are cached per dataset version and filter set
+    with st.sidebar:
+        active_filters = render_filter_panel(catalog)
+    with profiler().span("apply_filters"):
+        # KPIs and tables follow the sidebar filters; charts also follow the cross-filter (see cached_chart)
+        filter_selection = catalog.filter_engine.bitmap(active_filters) if active_filters.active else None
+    dataset_version = catalog.version
+
+    # Enhanced Feature Cards
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
         st.markdown("""
-        <div style='background: rgba(20, 20, 20, 0.5); padding: 1rem; border-radius: 10px; margin-bottom: 1rem;'>
-            <p style='color: #cbd5e1; margin: 0;'>
-                System logs for debugging and tracking application events.
-            </p>
+        <div class='card' style='background: linear-gradient(135deg, #E50914 0%, #b20710 100%);'>
+            <div style='font-size: 2rem; margin-bottom: 0.25rem;'>📊</div>
+            <h3 style='color: white !important; margin: 0.25rem 0; font-size: 1.1rem;'>Data</h3>
+            <p style='margin: 0; font-size: 0.8rem; color: rgba(255,255,255,0.8);'>Content Library</p>
+        </div>
+        """, unsafe_allow_html=True)
+    with col2:
+        st.markdown("""
+        <div class='card' style='background: linear-gradient(135deg, #ff6b6b 0%, #ee5a6f 100%);'>
+            <div style='font-size: 2rem; margin-bottom: 0.25rem;'>🔍</div>
+            <h3 style='color: white !important; margin: 0.25rem 0; font-size: 1.1rem;'>EDA</h3>
+            <p style='margin: 0; font-size: 0.8rem; color: rgba(255,255,255,0.8);'>Visual Analysis</p>
+        </div>
+        """, unsafe_allow_html=True)
+    with col3:
+        st.markdown("""
+        <div class='card' style='background: linear-gradient(135deg, #c92a2a 0%, #a61e4d 100%);'>
+            <div style='font-size: 2rem; margin-bottom: 0.25rem;'>📈</div>
+            <h3 style='color: white !important; margin: 0.25rem 0; font-size: 1.1rem;'>Trends</h3>
+            <p style='margin: 0; font-size: 0.8rem; color: rgba(255,255,255,0.8);'>Growth Patterns</p>
+        </div>
+        """, unsafe_allow_html=True)
+    with col4:
+        st.markdown("""
+        <div class='card' style='background: linear-gradient(135deg, #862e9c 0%, #5f3dc4 100%);'>
+            <div style='font-size: 2rem; margin-bottom: 0.25rem;'>💡</div>
+            <h3 style='color: white !important; margin: 0.25rem 0; font-size: 1.1rem;'>Insights</h3>
+            <p style='margin: 0; font-size: 0.8rem; color: rgba(255,255,255,0.8);'>Recommendations</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Enhanced Sidebar
+    with st.sidebar:
+        kpis = analytics.kpis(catalog, selection=filter_selection)
+        st.markdown("## 📑 Navigation")
+        st.markdown("---")
+        st.markdown("""
+        <div style='background: rgba(229, 9, 20, 0.1); padding: 1rem; border-radius: 10px; border: 1px solid rgba(229, 9, 20, 0.3);'>
+            <h3 style='color: #E50914 !important; margin-top: 0;'>📊 Project Overview</h3>
+            <p><strong>Company:</strong> Netflix Inc.</p>
+            <p><strong>Goal:</strong> Analyze content strategy</p>
+            <p><strong>Focus:</strong> Growth opportunities</p>
         </div>
         """, unsafe_allow_html=True)
         
-        # Log Display Area
-        log_contents = log_capture_string.getvalue()
+        st.markdown("<br>", unsafe_allow_html=True)
         
-        if not log_contents:
-            st.info("ℹ️ No logs recorded yet.")
-        else:
-            st.code(log_contents, language='text')
-            
-        # Add a download button for logs
-        st.download_button(
-            label="⬇️ Download Logs",
-            data=log_contents,
-            file_name="netflix_app_logs.txt",
-            mime="text/plain"
-        )
+        st.markdown(f"""
+        <div style='background: rgba(255, 107, 107, 0.1); padding: 1rem; border-radius: 10px; border: 1px solid rgba(255, 107, 107, 0.3);'>
+            <h3 style='color: #ff6b6b !important; margin-top: 0;'>📈 Key Metrics</h3>
+            <p>📺 <strong>Total Titles:</strong> {kpis.total_titles:,}</p>
+            <p>🌍 <strong>Countries:</strong> {kpis.countries}</p>
+            <p>🎭 <strong>Genres:</strong> {kpis.genres}</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        st.markdown("<br>", unsafe_allow_html=True)
         
-        # Test Log Button
-        if st.button("Generate Test Log"):
-            logging.info("Test log entry generated by user.")
-            st.rerun()
+        st.markdown("""
+        <div style='background: rgba(201, 42, 42, 0.1); padding: 1rem; border-radius: 10px; border: 1px solid rgba(201, 42, 42, 0.3);'>
+            <h3 style='color: #c92a2a !important; margin-top: 0;'>🔍 Analysis Steps</h3>
+            <ul style='margin: 0; padding-left: 1.2rem;'>
+                <li>Data Loading & Preprocessing</li>
+                <li>Content Distribution Analysis</li>
+                <li>Trend & Pattern Identification</li>
+                <li>Genre & Regional Insights</li>
+                <li>Strategic Recommendations</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Main Tabs
+    # Only the selected tab's body runs, so inactive tabs build no figures
+    tabs = st.tabs([
+        "📊 Problem Statement",
+        "🔍 Interactive EDA", 
+        "🎥 Content Analysis",
+        "⭐ Rating Analysis",
+        "💡 Recommendations",
+        "📑 Complete Analysis",
+        "📝 App Logs"
+    ], key="main_tab", on_change="rerun")
+
+    for tab, render in zip(tabs, TAB_RENDERERS):
+        if tab.open:
+            with tab, profiler().span(f"tab:{render.__name__}"):
+                if not kpis.total_titles and render is not render_app_logs:
+                    st.warning("⚠️ No titles match the selected filters. Widen or reset them in the sidebar.")
+                else:
+                    render()
 
 else:
     st.error("Could not load data. Please ensure 'netflix.csv' is in the same directory as this app.")
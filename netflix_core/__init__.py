@@ -0,0 +1 @@
+"""Data and performance helpers backing the Netflix Streamlit dashboard."""
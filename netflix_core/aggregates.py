@@ -0,0 +1,326 @@
+"""Count aggregation shared by every dashboard chart, for any row selection.
+
+Almost every chart is a count: titles per type, audience, rating, month,
+per (year, type) pair, per country or genre and per (country, type).
+``AggregationEngine`` keeps one integer code array per counted measure,
+row-aligned for single-valued columns and link-aligned (sorted by title,
+with per-title offsets) for the bridge tables. The counts of a selection,
+a packed bitmap from ``FilterEngine``, are bincounts over the codes of
+its rows. The genre x country heatmap only needs its top entities, so
+``Aggregates.top_block`` multiplies their sparse incidence matrices over
+the selected rows instead (see ``cooccurrence``).
+
+Counts are additive, so the engine starts from the cached selection
+closest to the new one, the whole catalog included, and adds the rows
+that entered and subtracts the rows that left. A cross-filter click
+therefore costs a few bincounts over the rows that changed, however many
+charts read the result. ``Aggregates`` turns the count arrays into the
+frames ``analytics`` returns; they equal the same functions run on a
+catalog of the selected rows. Results that need more than counts, such as
+a selection's KPIs or saturation cube, are kept alongside its counts.
+"""
+import collections
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from netflix_core import cooccurrence
+from netflix_core.index import BitmapIndex, popcount
+
+# Selections whose counts are kept as bases for incremental updates.
+AGGREGATE_CACHE_ENTRIES = int(os.environ.get("NETFLIX_AGGREGATE_CACHE", 16))
+
+COLUMNS = ("type", "Content_For", "rating", "month_added", "year_added", "release_year")
+COLUMN_PAIRS = (("Content_For", "type"), ("year_added", "type"), ("release_year", "type"))
+LINK_KINDS = ("country", "genre")
+# Bridge kind x frame column, counting each title once per entity
+LINK_COLUMN_PAIRS = (("country", "type"),)
+
+
+def link_offsets(bridge):
+    """Start of each title's links in ``bridge``, plus the end; links are sorted by title."""
+    return np.concatenate(([0], np.cumsum(np.bincount(bridge.title_idx, minlength=bridge.n_titles))))
+
+
+def expand(offsets, rows):
+    """Positions of the links of ``rows`` given per-title ``offsets``."""
+    starts = offsets[rows]
+    lengths = offsets[np.asarray(rows) + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    shift = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return shift + np.arange(total, dtype=np.int64)
+
+
+def _column_codes(values):
+    """(codes, labels) of a frame column; categoricals keep their categories and dtype."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    codes, labels = pd.factorize(values, sort=True)
+    return codes, labels
+
+
+def _pair_codes(left, n_right, right):
+    """Codes of (left, right) pairs in row-major order; -1 where either is missing."""
+    codes = left.astype(np.int64) * n_right + right
+    codes[(left < 0) | (right < 0)] = -1
+    return codes
+
+
+def _extended_codes(values, start, codes, labels):
+    """``_column_codes`` of ``values`` from the ``codes`` and ``labels`` of its first ``start`` rows.
+
+    Also returns the new code of each old one, then -1, which a missing
+    value's code -1 picks up.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        new_codes, new_labels = _column_codes(values)
+        return new_codes, new_labels, np.append(new_labels.get_indexer(labels), -1)
+    appended = values.iloc[start:]
+    new_labels = labels.union(pd.Index(appended.dropna().unique()))
+    remap = np.append(new_labels.get_indexer(labels), -1)
+    return np.concatenate([remap[codes], new_labels.get_indexer(appended)]), new_labels, remap
+
+
+def _pair_remap(left, n_right, right):
+    """New pair code of each old one from the remaps of its two sides, then -1."""
+    return np.append((left[:-1, None] * n_right + right[None, :-1]).ravel(), -1)
+
+
+def _link_pair_codes(bridge, first, n_right, column_codes):
+    """Codes of (entity, column value) for the links of ``bridge`` from position ``first``."""
+    title_idx, entity_id = bridge.title_idx[first:], bridge.entity_id[first:]
+    codes = _pair_codes(entity_id, n_right, column_codes[title_idx])
+    # A title lists an entity at most once here, as a bitmap query counts it
+    key = title_idx.astype(np.int64) * len(bridge.vocab) + entity_id
+    repeated = np.ones(len(key), dtype=bool)
+    repeated[np.unique(key, return_index=True)[1]] = False
+    codes[repeated] = -1
+    return codes
+
+
+class AggregationEngine:
+    """Count arrays of one catalog for arbitrary row selections.
+
+    With ``base``, an engine over the rows of ``catalog`` before some were
+    appended, its codes and whole-catalog counts are carried over into the
+    new code spaces and only the appended rows are counted. Its cached
+    selections are not, since their bitmaps cover fewer rows.
+    """
+
+    def __init__(self, catalog, max_entries=AGGREGATE_CACHE_ENTRIES, base=None):
+        df = catalog.df
+        self.n_rows = len(df)
+        start = 0 if base is None else base.n_rows
+        self.bridges = {kind: catalog.bridges[kind] for kind in LINK_KINDS}
+        self.codes, self.labels, self.dtypes = {}, {}, {}
+        # measure -> new code of each of ``base``'s codes, then -1 for a missing one
+        remaps = {}
+        for column in COLUMNS:
+            if base is None:
+                codes, labels = _column_codes(df[column])
+            else:
+                codes, labels, remaps[column] = _extended_codes(
+                    df[column], start, base.codes[column], base.labels[column])
+            self.codes[column], self.labels[column], self.dtypes[column] = codes, labels, df[column].dtype
+
+        # measure -> (codes, per-title link offsets or None, number of codes)
+        self._measures = {}
+        for column in COLUMNS:
+            self._measures[column] = (self.codes[column], None, len(self.labels[column]))
+        for left, right in COLUMN_PAIRS:
+            n_right = len(self.labels[right])
+            codes = _pair_codes(self.codes[left], n_right, self.codes[right])
+            self._measures[(left, right)] = (codes, None, len(self.labels[left]) * n_right)
+            if base is not None:
+                remaps[(left, right)] = _pair_remap(remaps[left], n_right, remaps[right])
+
+        self.offsets = {kind: link_offsets(bridge) for kind, bridge in self.bridges.items()}
+        for kind, bridge in self.bridges.items():
+            self._measures[kind] = (bridge.entity_id, self.offsets[kind], len(bridge.vocab))
+            if base is not None:
+                # Extending a bridge keeps every entity id
+                remaps[kind] = np.append(np.arange(len(base.bridges[kind].vocab)), -1)
+        for kind, column in LINK_COLUMN_PAIRS:
+            bridge, n_right = self.bridges[kind], len(self.labels[column])
+            first = 0 if base is None else len(base.bridges[kind])
+            codes = _link_pair_codes(bridge, first, n_right, self.codes[column])
+            if base is not None:
+                remaps[(kind, column)] = _pair_remap(remaps[kind], n_right, remaps[column])
+                codes = np.concatenate([remaps[(kind, column)][base._measures[(kind, column)][0]], codes])
+            self._measures[(kind, column)] = (codes, self.offsets[kind], len(bridge.vocab) * n_right)
+
+        self._everything = BitmapIndex(self.n_rows).all_rows()
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        if base is None:
+            counts = self._contribution(None)
+        else:
+            counts = self._contribution(np.arange(start, self.n_rows))
+            for name, previous in base.full.arrays.items():
+                counts[name][remaps[name][:-1]] += previous
+        self.full = Aggregates(self, None, counts)
+        self.hits = 0
+        self.misses = 0
+        self.rows_counted = 0
+
+    def _contribution(self, rows):
+        """{measure: counts} of the rows at ``rows``, or of every row for None."""
+        counts = {}
+        for name, (codes, offsets, size) in self._measures.items():
+            if rows is not None:
+                codes = codes[rows] if offsets is None else codes[expand(offsets, rows)]
+            counts[name] = np.bincount(codes + 1, minlength=size + 1)[1:]
+        return counts
+
+    def rows(self, bitmap):
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.n_rows))
+
+    def counts(self, bitmap=None):
+        """``Aggregates`` of the rows set in ``bitmap``; None selects every row."""
+        if bitmap is None:
+            return self.full
+        key = hashlib.blake2b(bitmap, digest_size=16).digest()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            bases = list(self._entries.values())
+
+        # Start from whichever known selection differs from this one in the fewest rows
+        base, cost = None, popcount(bitmap)
+        for candidate in [self.full] + bases:
+            reference = self._everything if candidate.bitmap is None else candidate.bitmap
+            changed = popcount(np.bitwise_xor(bitmap, reference))
+            if changed < cost:
+                base, cost = candidate, changed
+        if base is None:
+            counts = self._contribution(self.rows(bitmap))
+        else:
+            reference = self._everything if base.bitmap is None else base.bitmap
+            added = self._contribution(self.rows(bitmap & ~reference))
+            removed = self._contribution(self.rows(reference & ~bitmap))
+            counts = {name: base.arrays[name] + added[name] - removed[name] for name in base.arrays}
+        aggregates = Aggregates(self, bitmap, counts)
+
+        with self._lock:
+            self.rows_counted += cost
+            self._entries[key] = aggregates
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return aggregates
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "rows_counted": self.rows_counted}
+
+
+class Aggregates:
+    """Counts of one selection, shaped like the pandas results ``analytics`` used to compute."""
+
+    def __init__(self, engine, bitmap, arrays):
+        self.engine = engine
+        self.bitmap = bitmap
+        self.arrays = arrays
+        self._derived = {}
+
+    def derived(self, key, build):
+        """``build()`` memoized with these counts, for other results of the same selection.
+
+        They are evicted together, so a recent selection's KPIs or cube
+        cost a lookup. Two sessions racing on a miss both build.
+        """
+        if key not in self._derived:
+            self._derived[key] = build()
+        return self._derived[key]
+
+    def value_counts(self, column):
+        """``df[column].value_counts()`` over the selected rows of a categorical column."""
+        index = pd.CategoricalIndex(self.engine.labels[column], dtype=self.engine.dtypes[column], name=column)
+        return pd.Series(self.arrays[column], index=index, name="count").sort_values(ascending=False)
+
+    def present(self, column):
+        """Values of ``column`` that occur in the selection, in sorted order.
+
+        For a bridge kind, the entities linked to a selected title, in id order.
+        """
+        if column in self.engine.bridges:
+            return self.engine.bridges[column].vocab[self.arrays[column] > 0]
+        return self.engine.labels[column][self.arrays[column] > 0]
+
+    def group_counts(self, left, right):
+        """``df.groupby([left, right]).size().reset_index(name="Count")`` over the selected rows."""
+        counts = self.arrays[(left, right)]
+        codes = np.flatnonzero(counts)
+        n_right = len(self.engine.labels[right])
+        return pd.DataFrame({
+            left: self._labels(left, codes // n_right),
+            right: self._labels(right, codes % n_right),
+            "Count": counts[codes],
+        })
+
+    def _labels(self, column, codes):
+        dtype = self.engine.dtypes[column]
+        if isinstance(dtype, pd.CategoricalDtype):
+            return pd.Categorical.from_codes(codes, dtype=dtype)
+        return self.engine.labels[column].take(codes).array
+
+    def top_ids(self, kind, k):
+        """Ids of the ``k`` entities with most links, ordered like ``EntityBridge.value_counts``.
+
+        Ties go to the entity whose first link comes first among the
+        selected rows, as entity ids do in a bridge built over them, and
+        are cut at ``k`` like ``value_counts().head(k)``.
+        """
+        counts = self.arrays[kind]
+        k = min(k, len(counts))
+        if not k:
+            return np.arange(0)
+        threshold = max(np.partition(counts, len(counts) - k)[len(counts) - k], 1)
+        ids = np.flatnonzero(counts >= threshold)
+        first = ids
+        if self.bitmap is not None and len(np.unique(counts[ids])) < len(ids):
+            first = self._first_links(kind, ids)
+        return ids[np.lexsort((first, -counts[ids]))][:k]
+
+    def _first_links(self, kind, ids):
+        """Position of the first selected link of each entity in ``ids``."""
+        links = expand(self.engine.offsets[kind], self.engine.rows(self.bitmap))
+        entities = self.engine.bridges[kind].entity_id[links]
+        hit = np.flatnonzero(np.isin(entities, ids))
+        found, first = np.unique(entities[hit], return_index=True)
+        return hit[first][np.searchsorted(found, ids)]
+
+    def top(self, kind, n, exclude=()):
+        """``EntityBridge.top`` over the selected rows."""
+        ids = self.top_ids(kind, n + len(exclude))
+        vocab = self.engine.bridges[kind].vocab
+        top = pd.Series(self.arrays[kind][ids], index=pd.Index(vocab[ids], name=kind), name="count")
+        if exclude:
+            top = top[~top.index.isin(list(exclude))]
+        return top.head(n)
+
+    def pair_count(self, kind, column, entity, value):
+        """Titles linked to entity id ``entity`` whose ``column`` has code ``value``."""
+        return int(self.arrays[(kind, column)][entity * len(self.engine.labels[column]) + value])
+
+    def top_block(self, row_kind, col_kind, n_rows, n_cols, exclude_rows=(), exclude_cols=()):
+        """``CooccurrenceMatrix.top_block`` over the selected rows."""
+        row_bridge, col_bridge = self.engine.bridges[row_kind], self.engine.bridges[col_kind]
+        rows = sorted((str(row_bridge.vocab[i]), i) for i in self.top_ids(row_kind, n_rows)
+                      if row_bridge.vocab[i] not in set(exclude_rows))
+        cols = sorted((str(col_bridge.vocab[i]), i) for i in self.top_ids(col_kind, n_cols)
+                      if col_bridge.vocab[i] not in set(exclude_cols))
+        titles = None if self.bitmap is None else self.engine.rows(self.bitmap)
+        values = cooccurrence.block_counts(row_bridge, col_bridge, [i for _, i in rows], [i for _, i in cols], titles)
+        block = pd.DataFrame(values, index=pd.Index([r for r, _ in rows], name=row_kind),
+                             columns=pd.Index([c for c, _ in cols], name=col_kind))
+        return block.loc[block.sum(axis=1) > 0, block.sum(axis=0) > 0]
@@ -0,0 +1,271 @@
+"""Headless analytics over a ``Catalog``.
+
+Every number the dashboard shows comes from one of these functions. They
+take the catalog (plus parameters), never touch Streamlit or Plotly, and
+return plain frames, dicts or scalars. That makes them usable from other
+front ends, from offline precomputation and from benchmarks. Results
+must be treated as read-only when the caller caches them.
+
+Every function takes an optional ``selection``, a packed row bitmap from
+``FilterEngine``, and answers for those rows without copying the catalog.
+Counts are read from the catalog's ``AggregationEngine``, so
+re-aggregating every chart for a new selection costs a few bincounts.
+KPIs and the simulator's saturation cube are built once per selection
+and kept with its counts; the few tables that need row values read just
+their columns of the selected rows.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from netflix_core import aggregates, cube, schema
+from netflix_core.kpis import KpiSnapshot
+
+CONTENT_TYPES = schema.CONTENT_TYPES
+DURATION_COLUMNS = {"Movie": "Movie_duration", "TV Show": "Series_duration"}
+MONTHS = schema.MONTHS
+
+
+def _counts_frame(counts, labels):
+    # Categorical value_counts also lists categories a filtered catalog has no rows for
+    frame = counts[counts > 0].reset_index()
+    frame.columns = labels
+    return frame
+
+
+def _selected(catalog, selection, columns):
+    """``columns`` of the selected rows, or of every row for None."""
+    frame = catalog.df[list(columns)]
+    return frame if selection is None else frame.take(catalog.index.rows(selection))
+
+
+def _with_percentage(frame):
+    frame["Percentage"] = (frame["Count"] / frame["Count"].sum() * 100).round(2)
+    return frame
+
+
+# --- Catalog summaries ---
+
+def kpis(catalog, selection=None):
+    """The ``KpiSnapshot`` behind the headline numbers and data-quality figures.
+
+    It is computed once per catalog version, or per selection while its
+    counts are cached; read its fields as attributes.
+    """
+    if selection is None:
+        return catalog.kpis
+    version = f"{catalog.version}+{hashlib.blake2b(selection, digest_size=6).hexdigest()}"
+    return catalog.aggregates.counts(selection).derived(
+        "kpis", lambda: KpiSnapshot.from_selection(catalog, selection, version))
+
+
+def head(catalog, n=10, selection=None):
+    """The first ``n`` selected rows of the catalog frame."""
+    if selection is None:
+        return catalog.df.head(n)
+    return catalog.df.take(catalog.index.rows(selection)[:n])
+
+
+def numeric_summary(catalog, columns=("release_year",), selection=None):
+    return _selected(catalog, selection, columns).describe().T
+
+
+def categorical_summary(catalog, columns=("type", "rating", "country"), selection=None):
+    """Cardinality and most common value for each column."""
+    frame = _selected(catalog, selection, columns)
+    rows = []
+    for col in columns:
+        value_counts = frame[col].value_counts()
+        rows.append({
+            "Feature": col,
+            "Unique": frame[col].nunique(),
+            "Most Common": str(value_counts.index[0])[:20],
+            "Frequency": value_counts.values[0],
+        })
+    return pd.DataFrame(rows)
+
+
+# --- Content mix ---
+
+def type_distribution(catalog, selection=None):
+    """Type, Count and Percentage of titles per content type."""
+    counts = catalog.aggregates.counts(selection).value_counts("type")
+    return _with_percentage(_counts_frame(counts, ["Type", "Count"]))
+
+
+def top_entities(catalog, kind, n, exclude=(), label=None, selection=None):
+    """The ``n`` entities of a bridge kind linked to the most titles.
+
+    ``exclude`` labels are removed before the top ``n`` are taken.
+    """
+    if kind in aggregates.LINK_KINDS:
+        counts = catalog.aggregates.counts(selection).top(kind, n, exclude=list(exclude))
+    elif selection is None:
+        counts = catalog.bridges[kind].top(n, exclude=list(exclude))
+    else:
+        rows = catalog.index.rows(selection)
+        counts = catalog.bridges[kind].subset(rows).top(n, exclude=list(exclude))
+    return _counts_frame(counts, [label or kind.capitalize(), "Count"])
+
+
+def link_count(catalog, kind, selection=None):
+    """Number of (title, entity) links of a bridge kind among the selected titles."""
+    return int(catalog.aggregates.counts(selection).arrays[kind].sum())
+
+
+def present(catalog, column, selection=None):
+    """Values of a counted column, or entities of a bridge kind, that occur among the selected titles."""
+    return catalog.aggregates.counts(selection).present(column)
+
+
+def country_type_counts(catalog, n_countries=5, selection=None):
+    """Titles per (country, type) for the top countries, skipping 'Unknown'."""
+    counts = catalog.aggregates.counts(selection)
+    rows = []
+    for country in counts.top("country", n_countries, exclude=["Unknown"]).index:
+        entity = catalog.country.id_of(country)
+        for code, content_type in enumerate(counts.engine.labels["type"]):
+            count = counts.pair_count("country", "type", entity, code)
+            if count:
+                rows.append({"Country": country, "Type": content_type, "Count": count})
+    return pd.DataFrame(rows, columns=["Country", "Type", "Count"])
+
+
+def audience_distribution(catalog, selection=None):
+    """Audience, Count and Percentage of titles per target audience."""
+    counts = catalog.aggregates.counts(selection).value_counts("Content_For")
+    return _with_percentage(_counts_frame(counts, ["Audience", "Count"]))
+
+
+def rating_counts(catalog, n=10, selection=None):
+    counts = catalog.aggregates.counts(selection).value_counts("rating")
+    return _counts_frame(counts.head(n), ["Rating", "Count"])
+
+
+def audience_by_type(catalog, selection=None):
+    return catalog.aggregates.counts(selection).group_counts("Content_For", "type")
+
+
+def audience_stats(catalog, selection=None):
+    """Title count and average release year per audience, largest first."""
+    frame = _selected(catalog, selection, ["Content_For", "title", "release_year"])
+    stats = frame.groupby("Content_For", observed=True).agg({"title": "count", "release_year": "mean"}).reset_index()
+    stats.columns = ["Audience", "Total Content", "Avg Release Year"]
+    return stats.sort_values("Total Content", ascending=False)
+
+
+# --- Time ---
+
+def additions_by_year(catalog, selection=None):
+    """Titles added per (year_added, type); undated titles are dropped."""
+    return catalog.aggregates.counts(selection).group_counts("year_added", "type")
+
+
+def peak_addition_year(by_year):
+    """(year, titles added) for the busiest year of ``additions_by_year``."""
+    totals = by_year.groupby("year_added")["Count"].sum()
+    if totals.empty:
+        return None, 0
+    return int(totals.idxmax()), int(totals.max())
+
+
+def monthly_additions(catalog, selection=None):
+    """Titles added per calendar month, in calendar order."""
+    counts = _counts_frame(catalog.aggregates.counts(selection).value_counts("month_added"), ["Month", "Count"])
+    counts["Month"] = pd.Categorical(counts["Month"], categories=MONTHS, ordered=True)
+    return counts.sort_values("Month")
+
+
+def release_year_counts(catalog, years=30, selection=None):
+    """Titles per (release_year, type) over the last ``years`` release years."""
+    counts = catalog.aggregates.counts(selection)
+    by_year = counts.group_counts("release_year", "type")
+    released = counts.present("release_year")
+    if not len(released):
+        return by_year
+    return by_year[by_year["release_year"] >= released.max() - years].reset_index(drop=True)
+
+
+def recent_release_share(catalog, years=5, selection=None):
+    """(titles, percent of library) released in the last ``years`` years."""
+    released = _selected(catalog, selection, ["release_year"])["release_year"]
+    recent = int((released >= (released.max() - years)).sum())
+    return recent, recent / len(released) * 100 if len(released) else 0.0
+
+
+# --- Durations ---
+
+def durations(catalog, content_type, selection=None):
+    """Duration of each title of a type: minutes for movies, seasons for TV."""
+    df = catalog.df
+    matches = (df["type"] == content_type).to_numpy()
+    if selection is not None:
+        matches = matches & np.unpackbits(selection, count=len(df)).astype(bool)
+    return df.loc[matches, DURATION_COLUMNS[content_type]]
+
+
+def duration_stats(catalog, content_type, selection=None):
+    """Mean, median, mode, min and max duration; NaN where no title has one."""
+    values = durations(catalog, content_type, selection).dropna()
+    mode = values.mode()
+    return {
+        "mean": values.mean(),
+        "median": values.median(),
+        "mode": mode.iloc[0] if len(mode) else np.nan,
+        "min": values.min(),
+        "max": values.max(),
+    }
+
+
+# --- Opportunities ---
+
+def genre_country_block(catalog, top_n=10, selection=None):
+    """Titles per (genre, country) for the top genres and countries.
+
+    The whole catalog reads the precomputed co-occurrence matrix; a
+    selection multiplies the incidence matrices of its rows.
+    """
+    if selection is None:
+        matrix = catalog.cooccurrence("genre", "country")
+        return matrix.top_block(top_n, top_n, exclude_cols=["Unknown"])
+    counts = catalog.aggregates.counts(selection)
+    return counts.top_block("genre", "country", top_n, top_n, exclude_cols=["Unknown"])
+
+
+def saturation_cube(catalog, selection=None):
+    """The saturation cube of the selected titles, built once per selection.
+
+    It is the one structure built from row values, so it reads just the
+    cube's columns of the selected rows and a restriction of the genre
+    bridge.
+    """
+    if selection is None:
+        return catalog.saturation_cube
+
+    def build():
+        rows = catalog.index.rows(selection)
+        return cube.build_saturation_cube(catalog.df[cube.COLUMNS].take(rows), catalog.genre.subset(rows))
+    return catalog.aggregates.counts(selection).derived("saturation_cube", build)
+
+
+def simulate(catalog, genre, content_type, audience, n_examples=5, selection=None):
+    """Saturation metrics and recent example titles for one launch idea.
+
+    Returns ``(metrics, examples)``. ``metrics`` is the saturation cube row,
+    or None when no title matches. ``examples`` holds the most recently
+    released matching titles.
+    """
+    metrics = cube.lookup(saturation_cube(catalog, selection), genre, content_type, audience)
+    if metrics is None:
+        return None, catalog.df.iloc[:0][["title", "release_year", "country", "rating"]]
+    matches = catalog.index.query(genre=genre, type=content_type, audience=audience)
+    if selection is not None:
+        matches = matches & selection
+    examples = catalog.df.iloc[catalog.index.rows(matches)][["title", "release_year", "country", "rating"]]
+    return metrics, examples.sort_values("release_year", ascending=False, kind="stable").head(n_examples)
+
+
+def opportunity_ranking(catalog, selection=None):
+    """Every genre x type x audience combination, least saturated first."""
+    return cube.ranked_opportunities(saturation_cube(catalog, selection))
@@ -0,0 +1,237 @@
+"""Scaling benchmark for the catalog pipeline on synthetic catalogs.
+
+For each size it generates (once, then reuses) a synthetic CSV shaped like
+``netflix.csv`` and times every pipeline stage: parsing and preprocessing,
+snapshot write and load, bridges, bitmap index, saturation cube, the
+heatmap co-occurrence block, simulator queries, the KPI block and the
+chunked streaming aggregation. Times are the median of ``--repeat`` runs.
+Peak allocation comes from one extra pass under ``tracemalloc``, kept
+separate because tracing inflates times. Arrow buffers are allocated
+outside Python's allocator and are not counted.
+
+Each run is written as JSON to the results directory and compared with the
+previous run (or ``--baseline``); stages whose median grew by more than
+``--threshold`` are flagged. ``--workers`` also times a full parse with
+parallel preprocessing at each worker count, against one process::
+
+    python -m netflix_core.benchmark --sizes 10k,100k,1m [--fail-on-regression]
+    python -m netflix_core.benchmark --sizes 1m --workers 1,2,4,8
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+from netflix_core import analytics, bridge, parallel, snapshot, streaming, synthetic
+from netflix_core.catalog import Catalog, read_catalog
+from netflix_core.profiling import Profiler
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+DATA_DIR = os.path.join(".cache", "synthetic")
+RESULTS_DIR = os.path.join(".cache", "benchmarks")
+SIMULATOR_QUERIES = 50
+# Below this many milliseconds a slowdown is treated as noise.
+MIN_REGRESSION_MS = 2.0
+
+
+def parse_size(label):
+    label = label.strip().lower()
+    if label in SIZES:
+        return SIZES[label]
+    return int(float(label.rstrip("km")) * {"k": 1e3, "m": 1e6}.get(label[-1], 1))
+
+
+def dataset_path(n_rows, seed, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"netflix-synth-{n_rows}-s{seed}.csv")
+
+
+def ensure_dataset(n_rows, seed, profile, data_dir=DATA_DIR):
+    """Path to the synthetic CSV for ``n_rows``, generating it if missing."""
+    path = dataset_path(n_rows, seed, data_dir)
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        synthetic.write_catalog(path, profile, n_rows, seed)
+        print(f"  generated {path} in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def run_pipeline(path, profiler, seed=0):
+    """One pass over every stage, each recorded as a span on ``profiler``."""
+    with profiler.span("load_data"):
+        df = read_catalog(path)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snap = os.path.join(tmp, "catalog.feather")
+        with profiler.span("snapshot_write"):
+            snapshot.write_snapshot(df, snap, "benchmark")
+        with profiler.span("snapshot_load"):
+            snapshot.read_snapshot(snap, "benchmark")
+
+    catalog = Catalog(df)
+    with profiler.span("load_unnested_data"):
+        catalog.warm("bridges")
+    with profiler.span("catalog_index"):
+        catalog.warm("index")
+    with profiler.span("saturation_cube"):
+        catalog.warm("saturation_cube")
+    with profiler.span("heatmap"):
+        analytics.genre_country_block(catalog, 10)
+    with profiler.span("kpis"):
+        analytics.kpis(catalog)
+
+    cube = catalog.saturation_cube.reset_index()
+    rng = np.random.default_rng(seed)
+    picks = cube.iloc[rng.integers(len(cube), size=SIMULATOR_QUERIES)]
+    for genre, content_type, audience in picks[["genre", "type", "audience"]].itertuples(index=False):
+        with profiler.span("simulator_query"):
+            analytics.simulate(catalog, genre, content_type, audience)
+
+    with profiler.span("stream_aggregates"):
+        streaming.stream_aggregates(path)
+
+
+def benchmark_size(path, repeat, memory=True):
+    """{stage: {p50_ms, min_ms, peak_mb}} for one dataset."""
+    timing = Profiler(trace_memory=False)
+    for _ in range(repeat):
+        run_pipeline(path, timing)
+    spans = timing.spans()
+    result = {
+        stage: {"p50_ms": float(group["wall_ms"].median()), "min_ms": float(group["wall_ms"].min())}
+        for stage, group in spans.groupby("stage", sort=False)
+    }
+    if memory:
+        traced = Profiler(trace_memory=True)
+        run_pipeline(path, traced)
+        for stage, group in traced.spans().groupby("stage", sort=False):
+            result[stage]["peak_mb"] = float(group["peak_bytes"].max()) / 2**20
+    return result
+
+
+def benchmark_workers(path, worker_counts, repeat):
+    """{workers: {seconds, speedup}} for parse + preprocess + bridges."""
+    timings = {}
+    for workers in worker_counts:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            if workers <= 1:
+                bridge.build_bridges(read_catalog(path))
+            else:
+                parallel.read_catalog(path, workers)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[workers] = best
+    serial = timings.get(1, timings[worker_counts[0]])
+    return {str(workers): {"seconds": seconds, "speedup": serial / seconds}
+            for workers, seconds in timings.items()}
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def latest_result(results_dir, exclude=None):
+    paths = sorted(p for p in glob.glob(os.path.join(results_dir, "bench-*.json")) if p != exclude)
+    return paths[-1] if paths else None
+
+
+def compare(current, baseline, threshold):
+    """(size, stage, baseline ms, current ms) for every stage that slowed down."""
+    regressions = []
+    for size, stages in current["results"].items():
+        for stage, stats in stages.items():
+            before = baseline["results"].get(size, {}).get(stage)
+            if before is None:
+                continue
+            if (stats["p50_ms"] > before["p50_ms"] * (1 + threshold)
+                    and stats["p50_ms"] - before["p50_ms"] > MIN_REGRESSION_MS):
+                regressions.append((size, stage, before["p50_ms"], stats["p50_ms"]))
+    return regressions
+
+
+def print_report(run):
+    for size, stages in run["results"].items():
+        print(f"\n{int(size):,} rows")
+        print(f"  {'stage':<20}{'p50 ms':>12}{'min ms':>12}{'peak MB':>10}")
+        for stage, stats in stages.items():
+            peak = stats.get("peak_mb")
+            peak = f"{peak:10.1f}" if peak is not None else f"{'-':>10}"
+            print(f"  {stage:<20}{stats['p50_ms']:12.2f}{stats['min_ms']:12.2f}{peak}")
+        workers = run.get("parallel", {}).get(size)
+        if workers:
+            print(f"  {'parallel preprocessing':<24}{'seconds':>8}{'speedup':>10}  ({run['cpus']} CPUs)")
+            for count, stats in workers.items():
+                print(f"  {count + ' workers':<24}{stats['seconds']:8.2f}{stats['speedup']:9.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scaling benchmark on synthetic catalogs.")
+    parser.add_argument("--sizes", default="10k,100k", help="comma-separated, e.g. 10k,100k,1m,10m")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--source", default="netflix.csv", help="catalog whose distributions are mimicked")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--results-dir", default=RESULTS_DIR)
+    parser.add_argument("--baseline", help="result file to compare with (default: the previous run)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--workers", help="also time parallel preprocessing, e.g. 1,2,4,8")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    profile = synthetic.CatalogProfile.from_csv(args.source)
+    run = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": {},
+    }
+    for label in args.sizes.split(","):
+        n_rows = parse_size(label)
+        print(f"Benchmarking {n_rows:,} rows")
+        path = ensure_dataset(n_rows, args.seed, profile, args.data_dir)
+        run["results"][str(n_rows)] = benchmark_size(path, args.repeat, memory=not args.no_memory)
+        if args.workers:
+            worker_counts = [int(count) for count in args.workers.split(",")]
+            run.setdefault("parallel", {})[str(n_rows)] = benchmark_workers(path, worker_counts, args.repeat)
+
+    os.makedirs(args.results_dir, exist_ok=True)
+    out = os.path.join(args.results_dir, f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(out, "w") as fh:
+        json.dump(run, fh, indent=2)
+    print_report(run)
+    print(f"\nResults written to {out}")
+
+    baseline_path = args.baseline or latest_result(args.results_dir, exclude=out)
+    if not baseline_path:
+        return 0
+    with open(baseline_path) as fh:
+        baseline = json.load(fh)
+    regressions = compare(run, baseline, args.threshold)
+    print(f"Compared with {baseline_path} ({baseline.get('git_revision')})")
+    for size, stage, before, after in regressions:
+        print(f"  REGRESSION {int(size):,} rows {stage}: {before:.2f} ms -> {after:.2f} ms")
+    if not regressions:
+        print("  no regressions")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
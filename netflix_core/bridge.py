@@ -0,0 +1,188 @@
+"""Integer-coded bridge tables for the multi-valued catalog columns.
+
+``cast``, ``director``, ``country`` and ``listed_in`` hold comma-separated
+lists. Instead of exploding them into long frames of repeated Python
+strings, each column becomes a vocabulary (one string per distinct entity)
+plus two parallel int32 arrays of (title_idx, entity_id) pairs.
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+
+SEPARATOR = ", "
+
+# Source column for each entity kind.
+BRIDGE_COLUMNS = {"cast": "cast", "director": "director", "country": "country", "genre": "listed_in"}
+
+
+class EntityBridge:
+    """Many-to-many link between catalog rows and one kind of entity."""
+
+    __slots__ = ("kind", "vocab", "title_idx", "entity_id", "n_titles", "_lookup")
+
+    def __init__(self, kind, vocab, title_idx, entity_id, n_titles):
+        self.kind = kind
+        self.vocab = vocab
+        self.title_idx = title_idx
+        self.entity_id = entity_id
+        self.n_titles = n_titles
+        self._lookup = None
+
+    @classmethod
+    def from_series(cls, kind, values, sep=SEPARATOR):
+        """Build a bridge from a column of ``sep``-joined entity lists.
+
+        Each distinct raw string is split only once, so columns with many
+        repeated values (country, listed_in) cost little more than a
+        factorize. Missing values link to no entity.
+        """
+        codes, uniques = pd.factorize(values, sort=False)
+
+        index = {}
+        per_unique = [
+            [index.setdefault(token, len(index)) for token in str(raw).split(sep)]
+            for raw in uniques
+        ]
+        lengths = np.fromiter(map(len, per_unique), dtype=np.int64, count=len(per_unique))
+        flat = np.fromiter(itertools.chain.from_iterable(per_unique), dtype=np.int32,
+                           count=int(lengths.sum()))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(lengths) else lengths
+
+        present = codes >= 0
+        row_len = np.zeros(len(codes), dtype=np.int64)
+        row_len[present] = lengths[codes[present]]
+
+        n_links = int(row_len.sum())
+        title_idx = np.repeat(np.arange(len(codes), dtype=np.int32), row_len)
+        row_start = np.repeat(np.cumsum(row_len) - row_len, row_len)
+        within = np.arange(n_links, dtype=np.int64) - row_start
+        src = np.repeat(np.where(present, offsets[np.maximum(codes, 0)], 0), row_len) + within
+        entity_id = flat[src] if n_links else np.empty(0, dtype=np.int32)
+
+        vocab = np.array(list(index), dtype=object)
+        return cls(kind, vocab, title_idx, entity_id, len(codes))
+
+    @classmethod
+    def concat(cls, parts):
+        """One bridge over the titles of ``parts`` in order, with a shared vocabulary.
+
+        Entities are numbered in first-seen order across the parts, so the
+        result equals a bridge built over the concatenated column.
+        """
+        codes, vocab = pd.factorize(np.concatenate([part.vocab for part in parts]), sort=False)
+        codes = codes.astype(np.int32)
+        title_idx, entity_id, n_titles, n_vocab = [], [], 0, 0
+        for part in parts:
+            to_global = codes[n_vocab:n_vocab + len(part.vocab)]
+            title_idx.append(part.title_idx + np.int32(n_titles))
+            entity_id.append(to_global[part.entity_id])
+            n_titles += part.n_titles
+            n_vocab += len(part.vocab)
+        return cls(parts[0].kind, np.asarray(vocab, dtype=object), np.concatenate(title_idx),
+                   np.concatenate(entity_id), n_titles)
+
+    def extend(self, values, sep=SEPARATOR):
+        """A bridge over this one's titles followed by ``values``.
+
+        Existing entities keep their ids and new ones are numbered in
+        first-seen order, so the result equals a bridge built over the
+        concatenated column from scratch.
+        """
+        delta = EntityBridge.from_series(self.kind, values, sep)
+        ids = self._ids()
+        if len(ids) != len(self.vocab):
+            # Already extended once: this branch needs its own lookup
+            ids = dict(zip(self.vocab.tolist(), range(len(self.vocab))))
+        # New names go into the shared lookup, so repeated appends cost only the delta
+        to_global = np.fromiter((ids.setdefault(name, len(ids)) for name in delta.vocab),
+                                dtype=np.int32, count=len(delta.vocab))
+        vocab = np.concatenate([self.vocab, delta.vocab[to_global >= len(self.vocab)]])
+        title_idx = np.concatenate([self.title_idx, delta.title_idx + np.int32(self.n_titles)])
+        entity_id = np.concatenate([self.entity_id, to_global[delta.entity_id]])
+        extended = EntityBridge(self.kind, vocab, title_idx, entity_id, self.n_titles + delta.n_titles)
+        extended._lookup = ids
+        return extended
+
+    def share_lookup(self, previous):
+        """Take over the name lookup of ``previous``, a bridge this one extends.
+
+        A bridge mapped from the shared store starts without one, and
+        hashing a large vocabulary again would cost more than the append.
+        """
+        ids = previous._lookup
+        if self._lookup is not None or ids is None:
+            return
+        if len(ids) == len(previous.vocab):
+            for name in self.vocab[len(ids):].tolist():
+                ids.setdefault(name, len(ids))
+        if len(ids) == len(self.vocab) and (not len(ids) or ids.get(self.vocab[-1]) == len(ids) - 1):
+            self._lookup = ids
+
+    def subset(self, rows):
+        """A bridge over the titles at sorted positions ``rows``.
+
+        Titles and entities are renumbered in first-seen order, so the
+        result equals a bridge built over those rows of the column, without
+        splitting any strings.
+        """
+        position = np.full(self.n_titles, -1, dtype=np.int32)
+        position[rows] = np.arange(len(rows), dtype=np.int32)
+        title_idx = position[self.title_idx]
+        keep = title_idx >= 0
+        entity_id, present = pd.factorize(self.entity_id[keep], sort=False)
+        return EntityBridge(self.kind, self.vocab[present], title_idx[keep],
+                            entity_id.astype(np.int32), len(rows))
+
+    def __len__(self):
+        return len(self.entity_id)
+
+    def _ids(self):
+        if self._lookup is None:
+            self._lookup = dict(zip(self.vocab.tolist(), range(len(self.vocab))))
+        return self._lookup
+
+    def id_of(self, name):
+        """Entity id for ``name``, or -1 if it never occurs."""
+        entity = self._ids().get(name, -1)
+        # The lookup may be shared with bridges extended from this one
+        return entity if entity < len(self.vocab) else -1
+
+    def counts(self):
+        """Number of links per entity id."""
+        return np.bincount(self.entity_id, minlength=len(self.vocab))
+
+    def value_counts(self):
+        """Same result as ``exploded_column.value_counts()``."""
+        counts = pd.Series(self.counts(), index=pd.Index(self.vocab, name=self.kind),
+                           name="count")
+        return counts.sort_values(ascending=False, kind="stable")
+
+    def top(self, n, exclude=()):
+        """``value_counts()`` without ``exclude``, first ``n`` rows.
+
+        Only the entities that can make the cut are labelled and sorted,
+        which matters for large vocabularies such as cast.
+        """
+        counts = self.counts()
+        k = min(n + len(exclude), len(counts))
+        ids = np.arange(0)
+        if k:
+            threshold = np.partition(counts, len(counts) - k)[len(counts) - k]
+            ids = np.flatnonzero(counts >= threshold)
+            # Most links first, ties in id order like the stable sort in value_counts
+            ids = ids[np.lexsort((ids, -counts[ids]))]
+        top = pd.Series(counts[ids], index=pd.Index(self.vocab[ids], name=self.kind), name="count")
+        if exclude:
+            top = top[~top.index.isin(list(exclude))]
+        return top.head(n)
+
+
+def build_bridges(df):
+    """Bridges for the four multi-valued columns, keyed by entity kind."""
+    return {kind: EntityBridge.from_series(kind, df[column]) for kind, column in BRIDGE_COLUMNS.items()}
+
+
+def extend_bridges(bridges, rows):
+    """``bridges`` extended with the appended catalog ``rows``."""
+    return {kind: bridge.extend(rows[BRIDGE_COLUMNS[kind]]) for kind, bridge in bridges.items()}
@@ -0,0 +1,402 @@
+"""The preprocessed catalog and the structures derived from it.
+
+``Catalog`` wraps the preprocessed frame together with its dataset version
+and builds the KPI snapshot, bridge tables, bitmap index, saturation cube,
+co-occurrence matrices and chart aggregation engine on first use. It has no
+Streamlit dependency, so the same object backs the dashboard, offline
+precomputation and benchmarks. The frame and everything derived from it
+are shared and must be treated as read-only.
+
+``Catalog.subset`` copies some rows into a catalog of their own,
+restricting the bridge tables instead of re-splitting. The dashboard's
+filters never do: they select rows with bitmaps (see ``filters``) that
+the aggregation engine counts, and a subset is the reference those
+counts are checked against.
+
+When the source CSV only grows, ``Catalog.refresh`` parses just the new
+rows and returns a new catalog whose bridge tables, KPIs, aggregation
+engine and saturation cube partials are extended with them rather than
+rebuilt, and writes them as a snapshot segment. ``CatalogSource`` keeps
+the current catalog for a path and refreshes it when the file changes.
+
+Both go through ``sharedstore``: each dataset version is built once per
+host and then memory-mapped by every worker process, read-only.
+"""
+import csv
+import logging
+import os
+import threading
+
+import pandas as pd
+
+from netflix_core import aggregates, bridge, cooccurrence, cube, dates, durations, filters, schema, sharedstore, snapshot
+from netflix_core.index import build_catalog_index
+from netflix_core.kpis import KpiSnapshot, row_quality
+
+logger = logging.getLogger(__name__)
+
+# Processes used for a full parse of the CSV; 1 keeps it in this process.
+PREPROCESS_WORKERS = int(os.environ.get("NETFLIX_PREPROCESS_WORKERS", 1))
+
+RATING_AUDIENCE = {
+    "TV-MA": "Adults", "R": "Adults", "NC-17": "Adults", "UR": "Adults", "NR": "Adults",
+    "TV-14": "Teens", "PG-13": "Teens",
+    "TV-PG": "Older Kids", "TV-Y7": "Older Kids", "TV-Y7-FV": "Older Kids", "PG": "Older Kids",
+    "TV-Y": "Kids", "TV-G": "Kids", "G": "Kids",
+}
+
+
+def preprocess(df, optimize=True):
+    """Clean the raw catalog frame and add the derived columns, in place.
+
+    With ``optimize`` the columns are then converted to the compact dtypes
+    of ``schema``.
+    """
+    # Handling missing values
+    logger.info("Preprocessing: Handling missing values")
+    df["director"] = df["director"].fillna("Unknown")
+    df["cast"] = df["cast"].fillna("Unknown")
+    df["country"] = df["country"].fillna("Unknown")
+
+    # Date processing
+    logger.info("Preprocessing: Parsing dates")
+    df["date_added"], report = dates.parse_dates(df["date_added"])
+    logger.log(logging.WARNING if report["unparsed"] else logging.INFO, f"Preprocessing: {dates.describe(report)}")
+    df["year_added"] = df["date_added"].dt.year
+    df["month_added"] = df["date_added"].dt.month_name()
+
+    # Duration processing
+    logger.info("Preprocessing: Extracting durations")
+    df["Movie_duration"], df["Series_duration"], df["duration_anomaly"], report = durations.parse_durations(
+        df["duration"], df["rating"], df["type"])
+    flagged = report["unparsed"] or report["unit_mismatch"]
+    logger.log(logging.WARNING if flagged else logging.INFO, f"Preprocessing: {durations.describe(report)}")
+
+    # Rating categorization
+    logger.info("Preprocessing: Categorizing ratings")
+    df["Content_For"] = df["rating"].map(RATING_AUDIENCE)
+
+    if optimize:
+        before = df.memory_usage(deep=True).sum() / 1024**2
+        schema.optimize(df)
+        after = df.memory_usage(deep=True).sum() / 1024**2
+        logger.info(f"Preprocessing: Compact dtypes, {before:.1f} MB -> {after:.1f} MB")
+    return df
+
+
+def read_catalog(path):
+    """Parse and preprocess the catalog CSV at ``path``."""
+    logger.info(f"Parsing {path}")
+    df = pd.read_csv(path)
+    logger.info(f"Data loaded successfully. Shape: {df.shape}")
+    return preprocess(df)
+
+
+def csv_columns(path):
+    """Column names from the header row of the CSV at ``path``."""
+    with open(path, encoding="utf-8", newline="") as fh:
+        return next(csv.reader(fh))
+
+
+def read_catalog_rows(path, offset):
+    """Parse and preprocess the rows that start at byte ``offset`` of ``path``."""
+    with open(path, "rb") as fh:
+        fh.seek(offset)
+        rows = pd.read_csv(fh, header=None, names=csv_columns(path))
+    logger.info(f"Parsed {len(rows):,} appended rows from {path}")
+    return preprocess(rows)
+
+
+def append_rows(df, rows):
+    """``df`` followed by ``rows``, with the dtypes a full parse would give.
+
+    A small batch can infer a different dtype than the full file did (an
+    all-empty column reads as float) and has its own categories, so the
+    frames are joined with ``schema.concat_frames``.
+    """
+    return schema.concat_frames([df, rows[df.columns]])
+
+
+def _append_from(df, path, offset):
+    return append_rows(df, read_catalog_rows(path, offset))
+
+
+class Catalog:
+    """A preprocessed catalog frame plus lazily built derived structures."""
+
+    def __init__(self, df, version=None, path=None, source_size=None, shared_dir=None):
+        self.df = df
+        self.version = version
+        self.path = path
+        self.source_size = source_size
+        # Host-wide store this catalog goes through; ``shared`` is True once it is mapped from there
+        self.shared_dir = shared_dir
+        self.shared = False
+        self._derived = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_path(cls, path, cache_dir=snapshot.SNAPSHOT_DIR, workers=None, shared_dir=sharedstore.SHARED_DIR):
+        """Load ``path`` through the shared store and the on-disk snapshot, keyed on its content.
+
+        With ``shared_dir`` the frame, bridge tables and KPIs are mapped
+        from the host-wide store; the first process to need a version
+        builds and publishes it while the others wait. With ``workers`` > 1
+        a full parse is split across that many processes, which also build
+        the bridge tables.
+        """
+        size = snapshot.source_stat(path)[0]
+        version = snapshot.source_digest(path)
+        return cls._through_store(version, path, size, shared_dir,
+                                  lambda: cls._load(path, version, size, cache_dir, workers))
+
+    @classmethod
+    def _load(cls, path, version, size, cache_dir, workers=None):
+        workers = PREPROCESS_WORKERS if workers is None else workers
+        built = {}
+
+        def build(csv_path):
+            if workers <= 1:
+                return read_catalog(csv_path)
+            from netflix_core import parallel
+
+            df, built["bridges"] = parallel.read_catalog(csv_path, workers)
+            return df
+
+        df = snapshot.load_or_build(path, build, cache_dir, append=_append_from)
+        catalog = cls(df, version=version, path=path, source_size=size)
+        if "bridges" in built:
+            catalog._derived["bridges"] = built["bridges"]
+        return catalog
+
+    @classmethod
+    def _through_store(cls, version, path, size, shared_dir, build):
+        """The catalog for ``version`` mapped from the shared store, publishing ``build()`` if missing.
+
+        Falls back to the privately built catalog when the store cannot be
+        used, e.g. when ``/dev/shm`` is too small for the dataset.
+        """
+        if not shared_dir:
+            return build()
+        catalog = None
+        try:
+            with sharedstore.lock(version, shared_dir):
+                attached = sharedstore.attach(version, shared_dir)
+                if attached is None:
+                    catalog = build()
+                    catalog.warm("bridges", "kpis")
+                    sharedstore.publish(version, catalog.df, catalog.bridges, catalog.kpis, shared_dir,
+                                        source=path)
+                    attached = sharedstore.attach(version, shared_dir)
+        except OSError as exc:
+            logger.warning(f"Shared store {shared_dir} is unavailable ({exc}); keeping a private copy")
+            attached = None
+        if attached is None:
+            catalog = catalog if catalog is not None else build()
+            catalog.shared_dir = shared_dir
+            return catalog
+
+        df, bridges, kpis = attached
+        shared = cls(df, version=version, path=path, source_size=size, shared_dir=shared_dir)
+        shared.shared = True
+        shared._derived.update(bridges=bridges, kpis=kpis)
+        return shared
+
+    def refresh(self, cache_dir=snapshot.SNAPSHOT_DIR):
+        """The catalog for the current contents of ``self.path``.
+
+        Returns ``self`` if the file is unchanged and an appended catalog if
+        rows were only added at the end. Anything else, such as an edited or
+        removed earlier row, reloads from scratch. The new version goes
+        through the shared store like ``from_path``.
+        """
+        size = snapshot.source_stat(self.path)[0]
+        version = snapshot.source_digest(self.path)
+        if version == self.version:
+            return self
+        appended = snapshot.is_append(self.path, self.version, self.source_size)
+
+        def build():
+            if not appended:
+                logger.info(f"{self.path} changed before byte {self.source_size:,}; reloading it in full")
+                return Catalog._load(self.path, version, size, cache_dir)
+            rows = read_catalog_rows(self.path, self.source_size)
+            refreshed = self.append(rows, version=version, source_size=size)
+            snapshot.store(refreshed.df, self.path, version, size, cache_dir, base=(self.version, len(self)))
+            return refreshed
+
+        refreshed = Catalog._through_store(version, self.path, size, self.shared_dir, build)
+        if appended:
+            self._extend_into(refreshed)
+        return refreshed
+
+    def append(self, rows, version=None, source_size=None):
+        """A new catalog with preprocessed ``rows`` added at the end.
+
+        Bridge tables and KPIs already built here are extended with the new
+        rows; ``refresh`` also extends the aggregation engine and cube
+        partials of the catalog it returns. The index and co-occurrence
+        matrices are rebuilt on first use.
+        """
+        appended = Catalog(append_rows(self.df, rows), version, self.path, source_size)
+        with self._lock:
+            bridges = self._derived.get("bridges")
+            kpis = self._derived.get("kpis")
+        if bridges is not None:
+            logger.info(f"Extending entity bridge tables with {len(rows):,} rows")
+            appended._derived["bridges"] = bridge.extend_bridges(bridges, rows)
+        if kpis is not None:
+            appended._derived["kpis"] = kpis.appended(appended.df, len(self), version)
+        return appended
+
+    def _extend_into(self, appended):
+        """Extend the aggregation engine and cube partials built here to ``appended``.
+
+        ``appended`` holds this catalog's rows followed by new ones; its own
+        bridge tables may be mapped from the shared store, so they take over
+        the name lookups of these.
+        """
+        with self._lock:
+            derived = dict(self._derived)
+        if "bridges" not in derived:
+            return
+        start = len(self)
+        for kind, links in derived["bridges"].items():
+            appended.bridges[kind].share_lookup(links)
+        with appended._lock:
+            if "aggregates" in derived and "aggregates" not in appended._derived:
+                logger.info(f"Extending aggregation engine with {len(appended) - start:,} rows")
+                appended._derived["aggregates"] = aggregates.AggregationEngine(
+                    appended, base=derived["aggregates"])
+            if "cube_state" in derived and "cube_state" not in appended._derived:
+                logger.info(f"Extending saturation cube partials with {len(appended) - start:,} rows")
+                appended._derived["cube_state"] = cube.extend_state(
+                    derived["cube_state"], appended.df, appended.genre, start)
+
+    def subset(self, rows, version=None):
+        """A catalog over the rows at sorted positions ``rows``.
+
+        The bridge tables are restricted rather than re-split; the other
+        structures are built from the subset on first use. The subset has
+        no source path, so it is never refreshed.
+        """
+        part = Catalog(self.df.take(rows), version=version)
+        part._derived["bridges"] = {kind: links.subset(rows) for kind, links in self.bridges.items()}
+        return part
+
+    def __len__(self):
+        return len(self.df)
+
+    def warm(self, *parts):
+        """Build the named derived structures now rather than on first use."""
+        for part in parts:
+            getattr(self, part)
+
+    def _memo(self, key, build):
+        # One build per catalog even when several sessions ask at once
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = build()
+            return self._derived[key]
+
+    @property
+    def bridges(self):
+        """Bridge tables keyed by kind: cast, director, country, genre."""
+        def build():
+            logger.info("Preprocessing: Building entity bridge tables")
+            return bridge.build_bridges(self.df)
+        return self._memo("bridges", build)
+
+    @property
+    def cast(self):
+        return self.bridges["cast"]
+
+    @property
+    def director(self):
+        return self.bridges["director"]
+
+    @property
+    def country(self):
+        return self.bridges["country"]
+
+    @property
+    def genre(self):
+        return self.bridges["genre"]
+
+    @property
+    def index(self):
+        """Bitmap index over genre, country, type, audience and rating."""
+        def build():
+            logger.info("Preprocessing: Building bitmap index")
+            return build_catalog_index(self.df, self.country, self.genre)
+        return self._memo("index", build)
+
+    @property
+    def kpis(self):
+        """Immutable ``KpiSnapshot`` of this catalog version."""
+        def build():
+            logger.info("Preprocessing: Computing KPI snapshot")
+            return KpiSnapshot.from_frame(self.df, self.version)
+        return self._memo("kpis", build)
+
+    @property
+    def row_quality(self):
+        """Per-row missing cells and duplicate groups behind the KPIs of a selection."""
+        def build():
+            logger.info("Preprocessing: Profiling rows for data-quality KPIs")
+            return row_quality(self.df)
+        return self._memo("row_quality", build)
+
+    @property
+    def cube_state(self):
+        """Mergeable partials and code vocabularies behind the saturation cube."""
+        def build():
+            logger.info("Preprocessing: Grouping saturation cube partials")
+            return cube.cube_state(self.df, self.genre)
+        return self._memo("cube_state", build)
+
+    @property
+    def saturation_cube(self):
+        def build():
+            logger.info("Preprocessing: Building saturation cube")
+            return cube.finish_state(self.cube_state, self.genre.vocab)
+        return self._memo("saturation_cube", build)
+
+    @property
+    def aggregates(self):
+        """``AggregationEngine`` behind the chart counts, for any row selection."""
+        def build():
+            logger.info("Preprocessing: Building aggregation engine")
+            return aggregates.AggregationEngine(self)
+        return self._memo("aggregates", build)
+
+    @property
+    def filter_engine(self):
+        """``FilterEngine`` with the row sets of this catalog's global filters."""
+        return self._memo("filter_engine", lambda: filters.FilterEngine(self))
+
+    def cooccurrence(self, row_kind, col_kind):
+        """Co-occurrence matrix between two bridge kinds, e.g. genre x country."""
+        def build():
+            logger.info(f"Preprocessing: Building {row_kind} x {col_kind} co-occurrence matrix")
+            return cooccurrence.CooccurrenceMatrix(self.bridges[row_kind], self.bridges[col_kind])
+        return self._memo(("cooccurrence", row_kind, col_kind), build)
+
+
+class CatalogSource:
+    """The current ``Catalog`` for a CSV path, refreshed when the file changes."""
+
+    def __init__(self, path, cache_dir=snapshot.SNAPSHOT_DIR, shared_dir=sharedstore.SHARED_DIR):
+        self.path = path
+        self.cache_dir = cache_dir
+        self.shared_dir = shared_dir
+        self._catalog = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            if self._catalog is None:
+                self._catalog = Catalog.from_path(self.path, self.cache_dir, shared_dir=self.shared_dir)
+            else:
+                self._catalog = self._catalog.refresh(self.cache_dir)
+            return self._catalog
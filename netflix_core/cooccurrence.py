@@ -0,0 +1,91 @@
+"""Sparse co-occurrence matrices between multi-valued catalog dimensions.
+
+Each bridge table is a sparse (titles x entities) incidence matrix, so the
+co-occurrence of two dimensions is ``A.T @ B``: entry (i, j) counts the
+titles linked to both entity i of A and entity j of B. The many-to-many
+join the heatmap used to materialize with ``pd.merge`` never exists.
+``block_counts`` multiplies just the rows and columns of a selection, for
+heatmaps of filtered titles. scipy is imported on first use, as only the
+heatmap needs it.
+"""
+import numpy as np
+import pandas as pd
+
+
+def incidence_matrix(bridge, titles=None, entities=None):
+    """CSR (titles x entities) matrix with one entry per bridge link.
+
+    ``titles`` (sorted row positions) and ``entities`` (entity ids) keep
+    only those rows and columns, in that order.
+    """
+    from scipy import sparse
+
+    title_idx, entity_id = bridge.title_idx, bridge.entity_id
+    shape = (bridge.n_titles, len(bridge.vocab))
+    if titles is not None or entities is not None:
+        title_idx = _positions(title_idx, titles, bridge.n_titles)
+        entity_id = _positions(entity_id, entities, len(bridge.vocab))
+        keep = (title_idx >= 0) & (entity_id >= 0)
+        title_idx, entity_id = title_idx[keep], entity_id[keep]
+        shape = (shape[0] if titles is None else len(titles), shape[1] if entities is None else len(entities))
+    ones = np.ones(len(title_idx), dtype=np.int32)
+    matrix = sparse.csr_matrix((ones, (title_idx, entity_id)), shape=shape, dtype=np.int32)
+    matrix.sum_duplicates()
+    return matrix
+
+
+def _positions(values, kept, size):
+    """Position of each of ``values`` within ``kept``, -1 if absent; None keeps everything."""
+    if kept is None:
+        return values
+    position = np.full(size, -1, dtype=np.int64)
+    position[kept] = np.arange(len(kept))
+    return position[values]
+
+
+def block_counts(row_bridge, col_bridge, row_ids, col_ids, titles=None):
+    """Dense counts of the titles linked to each (row entity, column entity) pair.
+
+    Only the ``titles`` rows (all of them for None) and the given entity
+    ids are multiplied, so a few top entities over a row selection cost
+    one pass over the links rather than a full matrix.
+    """
+    rows = incidence_matrix(row_bridge, titles, row_ids)
+    cols = incidence_matrix(col_bridge, titles, col_ids)
+    return (rows.T @ cols).toarray()
+
+
+class CooccurrenceMatrix:
+    """Title counts for every (row entity, column entity) pair."""
+
+    def __init__(self, row_bridge, col_bridge):
+        self.row_kind = row_bridge.kind
+        self.col_kind = col_bridge.kind
+        self.row_labels = row_bridge.vocab
+        self.col_labels = col_bridge.vocab
+        self.row_totals = row_bridge.value_counts()
+        self.col_totals = col_bridge.value_counts()
+        self.matrix = (incidence_matrix(row_bridge).T @ incidence_matrix(col_bridge)).tocsr()
+
+    def block(self, rows, cols):
+        """Dense frame for the given row and column labels, in that order."""
+        row_pos = pd.Index(self.row_labels).get_indexer(list(rows))
+        col_pos = pd.Index(self.col_labels).get_indexer(list(cols))
+        if (row_pos < 0).any() or (col_pos < 0).any():
+            raise KeyError("unknown label in co-occurrence block request")
+        values = self.matrix[row_pos][:, col_pos].toarray()
+        return pd.DataFrame(values, index=pd.Index(list(rows), name=self.row_kind),
+                            columns=pd.Index(list(cols), name=self.col_kind))
+
+    def top_block(self, n_rows, n_cols, exclude_rows=(), exclude_cols=()):
+        """Block for the ``n_rows`` x ``n_cols`` most frequent entities.
+
+        Excluded labels still take a top-N slot before being dropped, and
+        all-zero rows and columns are removed, both as ``pd.crosstab`` over
+        the filtered join did. Labels are sorted alphabetically.
+        """
+        rows = [r for r in self.row_totals.head(n_rows).index if r not in set(exclude_rows)]
+        cols = [c for c in self.col_totals.head(n_cols).index if c not in set(exclude_cols)]
+        block = self.block(sorted(rows), sorted(cols))
+        return block.loc[block.sum(axis=1) > 0, block.sum(axis=0) > 0]
+
@@ -0,0 +1,163 @@
+"""Precomputed saturation cube for the Content Strategy Simulator.
+
+One row per observed (genre, type, Content_For) combination with the
+metrics the simulator reports: existing titles, average duration,
+dominant market and saturation status. Everything is produced by a few
+groupbys over the genre bridge, so each simulator interaction is a lookup.
+The groupbys yield mergeable partials (counts, sums, first rows), so the
+cube can also be folded chunk by chunk during streaming ingestion, or
+extended with the rows appended to a catalog (``extend_state``).
+"""
+import numpy as np
+import pandas as pd
+
+from netflix_core.bridge import EntityBridge
+
+# Upper bounds (exclusive) on existing titles for each saturation status.
+SATURATION_BANDS = ((50, "Blue Ocean"), (200, "Competitive"), (np.inf, "Saturated"))
+STATUSES = [status for _, status in SATURATION_BANDS]
+
+KEYS = ["genre", "type", "audience"]
+# Frame columns the cube is built from, besides the genre bridge.
+COLUMNS = ["type", "Content_For", "country", "Movie_duration", "Series_duration"]
+
+
+def saturation_status(existing_titles):
+    for upper, status in SATURATION_BANDS:
+        if existing_titles < upper:
+            return status
+    return STATUSES[-1]
+
+
+def _factorize(column):
+    """``pd.factorize`` codes in first-seen order, with plain (not categorical) uniques."""
+    codes, uniques = pd.factorize(column)
+    if isinstance(uniques, pd.CategoricalIndex):
+        uniques = uniques.astype(uniques.categories.dtype)
+    return codes, uniques
+
+
+def cube_links(df, genre_bridge, row_offset=0):
+    """One row per genre link, with the codes and duration the cube groups on.
+
+    Returns ``(links, type_values, audience_values, country_values)``; the
+    codes index into those values. ``row_offset`` shifts the row positions,
+    so links from a later chunk of the catalog keep their global order.
+    """
+    rows = genre_bridge.title_idx
+    type_codes, type_values = _factorize(df["type"])
+    audience_codes, audience_values = _factorize(df["Content_For"])
+    country_codes, country_values = _factorize(df["country"])
+    # Movies are measured in minutes and TV shows in seasons, as in the simulator.
+    duration = df["Movie_duration"].where(df["type"] == "Movie", df["Series_duration"])
+
+    links = pd.DataFrame({
+        "genre": genre_bridge.entity_id,
+        "type": type_codes[rows],
+        "audience": audience_codes[rows],
+        "country": country_codes[rows],
+        "duration": duration.to_numpy(dtype=np.float64, na_value=np.nan)[rows],
+        "row": rows.astype(np.int64) + row_offset,
+    })
+    links = links[(links["type"] >= 0) & (links["audience"] >= 0)]
+    return links, type_values, audience_values, country_values
+
+
+def cube_partials(links):
+    """Mergeable per-combination sums behind the cube: ``(stats, markets)``."""
+    stats = links.groupby(KEYS, sort=False).agg(
+        existing_titles=("row", "size"),
+        duration_sum=("duration", "sum"),
+        duration_count=("duration", "count"),
+    )
+    markets = (links[links["country"] >= 0]
+               .groupby(KEYS + ["country"], sort=False)
+               .agg(n=("row", "size"), first=("row", "min")))
+    return stats, markets
+
+
+def merge_partials(left, right):
+    """Combine two ``cube_partials`` results with the same code spaces."""
+    stats = pd.concat([left[0], right[0]]).groupby(level=KEYS, sort=False).sum()
+    markets = (pd.concat([left[1], right[1]])
+               .groupby(level=KEYS + ["country"], sort=False)
+               .agg(n=("n", "sum"), first=("first", "min")))
+    return stats, markets
+
+
+def finish_cube(stats, markets, genre_vocab, type_values, audience_values, country_values):
+    """The saturation cube from (merged) partials and the code vocabularies."""
+    cube = stats[["existing_titles"]].copy()
+    cube["avg_duration"] = stats["duration_sum"] / stats["duration_count"].replace(0, np.nan)
+
+    # Dominant market: most titles, ties going to the country seen first,
+    # matching value_counts() on the matching rows.
+    markets = (markets.reset_index()
+               .sort_values(["n", "first"], ascending=[False, True], kind="stable")
+               .drop_duplicates(KEYS)
+               .set_index(KEYS)["country"])
+    cube = cube.join(markets.rename("dominant_market"))
+
+    cube = cube.reset_index()
+    cube["existing_titles"] = cube["existing_titles"].astype(np.int32)
+    cube["avg_duration"] = cube["avg_duration"].astype(np.float32)
+    cube["genre"] = pd.Categorical.from_codes(cube["genre"], categories=genre_vocab)
+    cube["type"] = pd.Categorical.from_codes(cube["type"], categories=type_values)
+    cube["audience"] = pd.Categorical.from_codes(cube["audience"], categories=audience_values)
+    market_codes = cube["dominant_market"].fillna(-1).astype(np.int64)
+    cube["dominant_market"] = pd.Categorical.from_codes(market_codes, categories=country_values)
+    cube["status"] = pd.Categorical(
+        [saturation_status(n) for n in cube["existing_titles"]], categories=STATUSES)
+    return cube.set_index(KEYS).sort_index()
+
+
+def cube_state(df, genre_bridge):
+    """``(stats, markets, type_values, audience_values, country_values)`` behind the cube of ``df``."""
+    links, type_values, audience_values, country_values = cube_links(df, genre_bridge)
+    return cube_partials(links) + (type_values, audience_values, country_values)
+
+
+def extend_state(state, df, genre_bridge, start):
+    """``cube_state`` of ``df`` from the ``state`` of its rows before ``start``.
+
+    ``genre_bridge`` covers all of ``df``. Only the appended rows are
+    grouped; values they introduce get the next codes, as a first-seen
+    factorize of the whole frame would give them.
+    """
+    stats, markets, *values = state
+    first = int(np.searchsorted(genre_bridge.title_idx, start))
+    appended = EntityBridge(genre_bridge.kind, genre_bridge.vocab, genre_bridge.title_idx[first:] - np.int32(start),
+                            genre_bridge.entity_id[first:], len(df) - start)
+    links, *new_values = cube_links(df.iloc[start:], appended, start)
+    for i, column in enumerate(("type", "audience", "country")):
+        old, new = values[i], new_values[i]
+        values[i] = old.append(new[old.get_indexer(new) < 0])
+        # A missing country keeps code -1, which picks up the trailing -1
+        links[column] = np.append(values[i].get_indexer(new), -1)[links[column].to_numpy()]
+    return merge_partials((stats, markets), cube_partials(links)) + tuple(values)
+
+
+def finish_state(state, genre_vocab):
+    """The saturation cube from a ``cube_state``."""
+    stats, markets, type_values, audience_values, country_values = state
+    return finish_cube(stats, markets, genre_vocab, type_values, audience_values, country_values)
+
+
+def build_saturation_cube(df, genre_bridge):
+    """Metrics for every (genre, type, audience) with at least one title."""
+    return finish_state(cube_state(df, genre_bridge), genre_bridge.vocab)
+
+
+def lookup(cube, genre, content_type, audience):
+    """Cube row for one combination, or None if no title matches."""
+    try:
+        return cube.loc[(genre, content_type, audience)]
+    except KeyError:
+        return None
+
+
+def ranked_opportunities(cube):
+    """All combinations, least saturated first."""
+    ranked = cube.reset_index()
+    order = np.lexsort((ranked["genre"].astype(str).to_numpy(), ranked["existing_titles"].to_numpy()))
+    return ranked.iloc[order].reset_index(drop=True)
@@ -0,0 +1,126 @@
+"""Vectorized parsing of the catalog's ``duration`` column.
+
+Durations look like ``"90 min"`` or ``"3 Seasons"`` and take a few hundred
+distinct values, so each distinct string is matched once and the amount
+and unit are broadcast back to the rows as small integer arrays. No
+per-row Python objects are created, whatever the catalog size.
+
+The result is two nullable ``Int16`` columns, minutes for movies and
+seasons for TV shows, plus a categorical anomaly flag per row:
+
+- ``in_rating``: ``duration`` is empty and ``rating`` holds a duration
+  (a known export error); the duration is recovered from ``rating``;
+- ``missing``: no duration anywhere;
+- ``unparsed``: a value that is not ``<number> min|Season(s)``;
+- ``unit_mismatch``: minutes on a TV show or seasons on a movie.
+
+``python -m netflix_core.durations [netflix.csv]`` prints the report.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PATTERN = r"^\s*(\d+)\s*(min|Seasons?)\s*$"
+# Unit code per matched unit; the content type each unit belongs to.
+UNIT_CODES = {"min": 0, "Season": 1, "Seasons": 1}
+UNIT_TYPES = ("Movie", "TV Show")
+ANOMALIES = ["in_rating", "missing", "unparsed", "unit_mismatch"]
+
+
+def _amounts(values):
+    """Per-row (amount, unit code, present) for a column, matching each distinct value once.
+
+    Unit code is -1 where the value is missing or does not match.
+    """
+    codes, uniques = pd.factorize(values)
+    parts = pd.Series(uniques, dtype=object).str.extract(PATTERN)
+    amount = pd.to_numeric(parts[0], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    unit = parts[1].map(UNIT_CODES).to_numpy(dtype=np.float64, na_value=np.nan)
+    # Code -1 (a missing value) picks up the trailing sentinel
+    amount = np.append(amount, np.nan)
+    unit = np.nan_to_num(np.append(unit, np.nan), nan=-1).astype(np.int8)
+    return amount[codes], unit[codes], codes >= 0
+
+
+def _int16(values, valid):
+    return pd.arrays.IntegerArray(np.where(valid, values, 0).astype(np.int16), ~valid)
+
+
+def parse_durations(duration, rating, content_type):
+    """``(minutes, seasons, anomaly, report)`` for aligned catalog columns.
+
+    ``minutes`` is set for movies and ``seasons`` for TV shows; both are
+    ``Int16`` with NA where no valid duration exists. ``anomaly`` is a
+    categorical of ``ANOMALIES`` (NaN for clean rows). ``report`` counts
+    rows per outcome and holds ``unparsed_values``, the rows per raw
+    string that could not be parsed.
+    """
+    amount, unit, present = _amounts(duration)
+    rating_amount, rating_unit, _ = _amounts(rating)
+    in_rating = ~present & (rating_unit >= 0)
+    amount = np.where(in_rating, rating_amount, amount)
+    unit = np.where(in_rating, rating_unit, unit)
+
+    types = content_type.to_numpy(dtype=object)
+    expected = np.full(len(types), -1, dtype=np.int8)
+    for code, name in enumerate(UNIT_TYPES):
+        expected[types == name] = code
+    parsed = unit >= 0
+    valid = parsed & (unit == expected)
+
+    anomaly_codes = np.select(
+        [in_rating, ~present & ~in_rating, present & ~parsed, parsed & (unit != expected)],
+        [0, 1, 2, 3], default=-1)
+    anomaly = pd.Categorical.from_codes(anomaly_codes, categories=ANOMALIES)
+    minutes = _int16(amount, valid & (unit == 0))
+    seasons = _int16(amount, valid & (unit == 1))
+
+    counts = np.bincount(anomaly_codes + 1, minlength=len(ANOMALIES) + 1)
+    report = {"minutes": int((valid & (unit == 0)).sum()), "seasons": int((valid & (unit == 1)).sum())}
+    report.update({name: int(counts[i + 1]) for i, name in enumerate(ANOMALIES)})
+    unparsed = duration[present & ~parsed]
+    report["unparsed_values"] = unparsed.value_counts().rename("rows").rename_axis("value")
+    return (pd.Series(minutes, index=duration.index), pd.Series(seasons, index=duration.index),
+            pd.Series(anomaly, index=duration.index), report)
+
+
+def describe(report, top=5):
+    """One-line summary of a ``parse_durations`` report for the logs."""
+    text = (f"duration: {report['minutes']:,} movies in minutes, {report['seasons']:,} shows in seasons; "
+            + ", ".join(f"{report[name]:,} {name}" for name in ANOMALIES))
+    failures = report["unparsed_values"]
+    if len(failures):
+        shown = ", ".join(f"{value!r} x{rows}" for value, rows in failures.head(top).items())
+        text += f"; unparsed values: {shown}" + (" ..." if len(failures) > top else "")
+    return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse durations and report anomalies.")
+    parser.add_argument("path", nargs="?", default="netflix.csv")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.path, usecols=["type", "rating", "duration"])
+    start = time.perf_counter()
+    for content_type in UNIT_TYPES:
+        df.loc[df["type"] == content_type, "duration"].astype(str).str.split(" ").str[0].astype(float)
+    split_s = time.perf_counter() - start
+    start = time.perf_counter()
+    _, _, anomaly, report = parse_durations(df["duration"], df["rating"], df["type"])
+    fast_s = time.perf_counter() - start
+
+    print(f"{len(df):,} rows, {df['duration'].nunique():,} distinct durations")
+    print(describe(report, top=20))
+    print(f"str.split per row: {split_s * 1000:.1f} ms")
+    print(f"parse_durations:   {fast_s * 1000:.1f} ms")
+    flagged = df[anomaly.notna()].assign(anomaly=anomaly[anomaly.notna()])
+    if len(flagged):
+        print(flagged.head(10).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
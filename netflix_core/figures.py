@@ -0,0 +1,183 @@
+"""Size-bounded LRU cache for built Plotly figures.
+
+Entries are keyed on (chart id, dataset fingerprint, parameters), so a
+figure is aggregated and constructed once per dataset version rather than
+on every Streamlit rerun. A builder may return the figure alone or a tuple
+of the figure plus the summary frames its caption text needs; cached values
+are shared across sessions and must be treated as read-only.
+"""
+import logging
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def _nbytes(value):
+    """Approximate bytes of a trace property; a list is sized from its first item."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + (len(value) * _nbytes(value[0]) if value else 0)
+    return sys.getsizeof(value)
+
+
+def _entry_size(value):
+    """Approximate bytes held by a cached value (trace arrays for figures)."""
+    if isinstance(value, tuple):
+        return sum(_entry_size(item) for item in value)
+    if hasattr(value, "to_plotly_json"):
+        # The figure's own trace dicts; to_dict and to_json would copy or serialize them
+        return sum(_nbytes(trace) for trace in value._data)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    return sys.getsizeof(value)
+
+
+class FigureCache:
+    """Thread-safe LRU keyed on chart id, dataset fingerprint and parameters."""
+
+    def __init__(self, max_entries=128, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(chart_id, fingerprint, params):
+        return chart_id, fingerprint, tuple(sorted(params.items()))
+
+    def get_or_build(self, chart_id, fingerprint, build, **params):
+        """Return the cached value, calling ``build(**params)`` on a miss."""
+        key = self.make_key(chart_id, fingerprint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Build outside the lock; two sessions racing on a miss both build,
+        # and the later insert simply replaces the earlier one.
+        value = build(**params)
+        size = _entry_size(value)
+        if size > self.max_bytes:
+            logger.warning(f"Figure {chart_id} ({size} bytes) exceeds the cache budget; not cached")
+            return value
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def _nice_bin_size(raw):
+    """The 1, 2 or 5 x 10^k step closest to ``raw`` on a log scale."""
+    magnitude = 10.0 ** np.floor(np.log10(raw))
+    steps = np.array([1, 2, 5, 10]) * magnitude
+    return float(steps[np.argmin(np.abs(np.log(steps / raw)))])
+
+
+def histogram_bins(values, nbins, weights=None):
+    """Bin edges and counts for at most ``nbins`` evenly sized bins.
+
+    Bin sizes are rounded to a 1/2/5 step, like Plotly's autobinning.
+    Integer-valued data (minutes, seasons) uses whole-number sizes with
+    edges on the half-integers, so each value falls squarely inside a bar.
+    Missing values are ignored. With ``weights``, each value counts that
+    many times, so a histogram of distinct values bins like the raw ones.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    weights = np.ones(len(values), dtype=np.int64) if weights is None else np.asarray(weights)
+    present = ~np.isnan(values)
+    values, weights = values[present], weights[present]
+    if not len(values):
+        return np.array([0.0, 1.0]), np.zeros(1, dtype=np.int64)
+
+    low, high = values.min(), values.max()
+    integral = bool(np.all(values == np.round(values)))
+    size = _nice_bin_size((high - low) / nbins) if high > low else 1.0
+    if integral:
+        size = max(1.0, np.ceil(size))
+        start = np.floor(low / size) * size - 0.5
+    else:
+        start = np.floor(low / size) * size
+    n_edges = int(np.floor((high - start) / size)) + 2
+    edges = start + size * np.arange(n_edges)
+    counts, _ = np.histogram(values, bins=edges, weights=weights)
+    return edges, counts.astype(np.int64)
+
+
+def bin_labels(edges):
+    """Hover label of each bin of ``histogram_bins``.
+
+    Bins on half-integer edges hold whole numbers, labelled with the first
+    and last value they can contain (``90-99``, or ``3`` for a single
+    value); other bins are labelled with their edges (``1.5-2``).
+    """
+    lower, upper = edges[:-1], edges[1:]
+    if np.all(edges - 0.5 == np.round(edges - 0.5)):
+        lower, upper = np.ceil(lower), np.floor(upper)
+    return [f"{low:g}" if low == high else f"{low:g}-{high:g}" for low, high in zip(lower, upper)]
+
+
+def binned_histogram(values, nbins, x_label, color, title, weights=None):
+    """Histogram figure whose bars are binned here rather than in the browser.
+
+    Only one bar per bin goes over the wire instead of every raw value,
+    which keeps the payload constant as the catalog grows.
+    """
+    import plotly.graph_objects as go
+
+    edges, counts = histogram_bins(values, nbins, weights)
+    lower, upper = edges[:-1], edges[1:]
+    fig = go.Figure(go.Bar(
+        x=(lower + upper) / 2,
+        y=counts,
+        width=upper - lower,
+        customdata=bin_labels(edges),
+        marker_color=color,
+        hovertemplate=f"{x_label}=%{{customdata}}<br>count=%{{y}}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=x_label,
+        yaxis_title="count",
+        bargap=0,
+    )
+    return fig
@@ -0,0 +1,177 @@
+"""Global dashboard filters, compiled to bitmap operations over the catalog.
+
+A ``Filters`` value is one selection in the sidebar's filter panel: sets of
+types, audiences, ratings, countries, genres and directors, plus release
+and addition year ranges. It is an immutable, normalized tuple, so it is
+its own cache key. ``FilterEngine`` compiles a selection into ANDs and ORs
+of packed bitmaps: index bitmaps for the low-cardinality dimensions, the
+director bridge for directors, and one vectorized comparison per year
+range. Row sets are kept in an LRU keyed on the selection, so
+re-selecting a recent filter costs a lookup. The bitmap is the selection
+every ``analytics`` function takes; no filtered copy of the catalog is
+ever made.
+"""
+import collections
+import hashlib
+import logging
+import os
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Row sets (one packed bitmap each) kept per engine.
+FILTER_CACHE_ENTRIES = int(os.environ.get("NETFLIX_FILTER_CACHE", 64))
+
+# Filter field -> bitmap index dimension.
+INDEXED = {"types": "type", "audiences": "audience", "ratings": "rating", "countries": "country", "genres": "genre"}
+# Filter field -> bridge kind matched through its links.
+LINKED = {"directors": "director"}
+# Filter field -> frame column of an inclusive (low, high) range.
+RANGES = {"release_years": "release_year", "years_added": "year_added"}
+FIELDS = tuple(INDEXED) + tuple(LINKED) + tuple(RANGES)
+
+
+class Filters(collections.namedtuple("Filters", FIELDS)):
+    """One normalized filter selection; empty sets and None ranges match everything."""
+
+    __slots__ = ()
+
+    @classmethod
+    def make(cls, **selections):
+        """Filters from field keywords: iterables of values, or (low, high) for ranges.
+
+        Values are sorted so that the same selection made in another order
+        has the same signature. A range drops titles with no value.
+        """
+        unknown = set(selections) - set(FIELDS)
+        if unknown:
+            raise TypeError(f"unknown filter fields: {sorted(unknown)}")
+        fields = {}
+        for field in FIELDS:
+            value = selections.get(field)
+            if field in RANGES:
+                fields[field] = None if value is None else (int(value[0]), int(value[1]))
+            else:
+                fields[field] = tuple(sorted({str(item) for item in value or ()}))
+        return cls(**fields)
+
+    @property
+    def active(self):
+        return any(self)
+
+    @property
+    def digest(self):
+        """Short stable hash of the selection, for cache keys outside this process."""
+        return hashlib.sha1(repr(tuple(self)).encode()).hexdigest()[:12]
+
+    def describe(self):
+        """One line such as ``types: Movie | release_years: 2000-2010``."""
+        parts = []
+        for field, value in self._asdict().items():
+            if field in RANGES and value is not None:
+                parts.append(f"{field}: {value[0]}-{value[1]}")
+            elif value and field not in RANGES:
+                shown = ", ".join(value[:3]) + (f" +{len(value) - 3}" if len(value) > 3 else "")
+                parts.append(f"{field}: {shown}")
+        return " | ".join(parts) or "none"
+
+
+class _Lru:
+    """Thread-safe LRU of built values, counting hits, misses and evictions."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Built outside the lock like FigureCache; a racing build replaces the other
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions}
+
+
+class FilterEngine:
+    """Filtered row sets of one catalog version."""
+
+    def __init__(self, catalog, max_row_sets=FILTER_CACHE_ENTRIES):
+        self.catalog = catalog
+        self._row_sets = _Lru(max_row_sets)
+
+    def bitmap(self, *selections):
+        """Packed bitmap (``BitmapIndex`` layout) of the rows every selection selects.
+
+        Each selection's bitmap is cached on its own, so combining a
+        sidebar selection with a chart's cross-filter costs one AND.
+        """
+        bitmaps = [self._row_sets.get_or_build(filters, lambda: self._compile(filters)) for filters in selections]
+        if not bitmaps:
+            return self.catalog.index.all_rows()
+        return bitmaps[0] if len(bitmaps) == 1 else np.bitwise_and.reduce(bitmaps)
+
+    def union(self, *selections):
+        """Packed bitmap of the rows any of the selections selects, such as several clicked cells."""
+        bitmaps = [self._row_sets.get_or_build(filters, lambda: self._compile(filters)) for filters in selections]
+        if not bitmaps:
+            return np.zeros(self.catalog.index.n_bytes, dtype=np.uint8)
+        return bitmaps[0] if len(bitmaps) == 1 else np.bitwise_or.reduce(bitmaps)
+
+    def _compile(self, filters):
+        index = self.catalog.index
+        bitmap = index.query(**{dimension: list(getattr(filters, field)) or None
+                                for field, dimension in INDEXED.items()})
+        for field, kind in LINKED.items():
+            names = getattr(filters, field)
+            if names:
+                bitmap &= self._linked(self.catalog.bridges[kind], names)
+        for field, column in RANGES.items():
+            bounds = getattr(filters, field)
+            if bounds is not None:
+                values = self.catalog.df[column]
+                inside = (values >= bounds[0]) & (values <= bounds[1])
+                bitmap &= np.packbits(inside.to_numpy(dtype=bool, na_value=False))
+        logger.info(f"Filter matches {index.count(bitmap):,} of {len(self.catalog):,} rows ({filters.describe()})")
+        return bitmap
+
+    def _linked(self, bridge, names):
+        """Bitmap of the titles linked to any of ``names`` in ``bridge``."""
+        ids = [entity for entity in map(bridge.id_of, names) if entity >= 0]
+        selected = np.zeros(bridge.n_titles, dtype=bool)
+        selected[bridge.title_idx[np.isin(bridge.entity_id, ids)]] = True
+        return np.packbits(selected)
+
+    def rows(self, *selections):
+        """Sorted row positions the selections select."""
+        return self.catalog.index.rows(self.bitmap(*selections))
+
+    def count(self, *selections):
+        return self.catalog.index.count(self.bitmap(*selections))
+
+    def bounds(self, column):
+        """(min, max) of a year column as ints, or None if it has no values."""
+        values = self.catalog.df[column].dropna()
+        return (int(values.min()), int(values.max())) if len(values) else None
+
+    def stats(self):
+        return {"row_sets": self._row_sets.stats()}
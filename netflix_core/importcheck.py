@@ -0,0 +1,134 @@
+"""Import-time budget check for the dashboard's cold start.
+
+Runs the module-level imports of the app script in fresh interpreters and
+fails if they take longer than the budget, if any module that should only
+load on demand (plotting libraries, scipy) is pulled in at startup, or if
+the app's ``netflix_core`` imports load plotly, scipy or pyarrow beyond
+what its third-party imports (streamlit, pandas) already load::
+
+    python -m netflix_core.importcheck [--budget-ms 1500] [netflix_app.py]
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+DEFAULT_BUDGET_MS = float(os.environ.get("NETFLIX_IMPORT_BUDGET_MS", 1500))
+
+# Must not be imported until a chart that needs them is built.
+DEFERRED_MODULES = ("matplotlib", "seaborn", "plotly.express", "plotly.subplots", "scipy")
+
+# Must not be imported by netflix_core modules at import time.
+CORE_DEFERRED_PACKAGES = ("plotly", "scipy", "pyarrow")
+
+_PROBE = """
+import json, sys, time
+preloaded = list(sys.modules)
+start = time.perf_counter()
+{imports}
+elapsed = (time.perf_counter() - start) * 1000.0
+print(json.dumps({{"elapsed_ms": elapsed, "preloaded": preloaded,
+                  "loaded": [m for m in {deferred!r} if m in sys.modules]}}))
+"""
+
+_CORE_PROBE = """
+import json, sys
+{imports}
+before = set(sys.modules)
+{core_imports}
+added = sorted(m for m in set(sys.modules) - before if m.split(".")[0] in {packages!r})
+print(json.dumps(added))
+"""
+
+
+def top_level_imports(path, core=None):
+    """Source of the module-level import statements in ``path``.
+
+    ``core`` True keeps only the ``netflix_core`` imports and False only
+    the others; None keeps all of them.
+    """
+    with open(path, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), filename=path)
+    nodes = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    if core is not None:
+        nodes = [node for node in nodes if _is_core(node) == core]
+    return "\n".join(ast.unparse(node) for node in nodes)
+
+
+def _is_core(node):
+    names = [node.module or ""] if isinstance(node, ast.ImportFrom) else [alias.name for alias in node.names]
+    return any(name.split(".")[0] == "netflix_core" for name in names)
+
+
+def _parse_importtime(stderr):
+    """(cumulative microseconds, module) for each top-level import."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name[1:].startswith(" "):
+            rows.append((int(cumulative), name.strip()))
+    return rows
+
+
+def measure(path, repeat=3):
+    """Best-of-``repeat`` import time plus the slowest top-level imports."""
+    code = _PROBE.format(imports=top_level_imports(path), deferred=DEFERRED_MODULES)
+    cwd = os.path.dirname(os.path.abspath(path))
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                              cwd=cwd, capture_output=True, text=True, check=True)
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result["elapsed_ms"] < best["elapsed_ms"]:
+            # Interpreter startup (site, encodings) is not part of the app's imports.
+            preloaded = set(result.pop("preloaded"))
+            rows = [row for row in _parse_importtime(proc.stderr) if row[1] not in preloaded]
+            result["slowest"] = sorted(rows, reverse=True)[:10]
+            best = result
+    return best
+
+
+def core_loaded(path):
+    """Packages of ``CORE_DEFERRED_PACKAGES`` that ``path``'s netflix_core imports load.
+
+    Its other imports run first, so what streamlit or pandas load on their
+    own (pandas 3 loads pyarrow) is not counted against netflix_core.
+    """
+    code = _CORE_PROBE.format(imports=top_level_imports(path, core=False),
+                              core_imports=top_level_imports(path, core=True), packages=CORE_DEFERRED_PACKAGES)
+    proc = subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.abspath(path)),
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", default="netflix_app.py")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    result = measure(args.path, args.repeat)
+    print(f"Top-level imports of {args.path}: {result['elapsed_ms']:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for cumulative, name in result["slowest"]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    ok = result["elapsed_ms"] <= args.budget_ms
+    if not ok:
+        print("FAIL: import time is over budget")
+    if result["loaded"]:
+        ok = False
+        print(f"FAIL: loaded at startup but should be deferred: {', '.join(result['loaded'])}")
+    core = core_loaded(args.path)
+    if core:
+        ok = False
+        print(f"FAIL: loaded by netflix_core at startup but should be deferred: {', '.join(core)}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
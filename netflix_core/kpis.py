@@ -0,0 +1,225 @@
+"""The catalog's headline numbers, computed once per dataset version.
+
+The header, sidebar and report tabs all show the same scalars: title and
+type counts, distinct countries and genres, the top market, the release
+year range and the data-quality figures. ``KpiSnapshot`` computes them in
+one pass over the frame and is memoized on the ``Catalog``, so a rerun
+reads attributes instead of scanning columns. The KPIs of a filtered
+selection come from the aggregation engine's counts and per-row code
+arrays instead of a copy of its rows. When rows are appended, only they
+are checked for duplicates (``KpiSnapshot.appended``). A snapshot is immutable and has a
+fixed set of plain-typed fields, so it exports to JSON as is::
+
+    python -m netflix_core.kpis [netflix.csv] [--output kpis.json]
+"""
+import argparse
+import collections
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Bump when a field is added, removed or changes meaning.
+SCHEMA_VERSION = 1
+HEADLINE_FIELDS = ("total_titles", "movies", "tv_shows", "movie_pct", "tv_pct", "countries", "genres",
+                   "top_market", "earliest_release", "latest_release")
+QUALITY_FIELDS = ("columns", "memory_mb", "missing", "duplicates", "completeness_pct")
+FIELDS = ("version",) + HEADLINE_FIELDS + QUALITY_FIELDS
+
+
+class KpiSnapshot(collections.namedtuple("KpiSnapshot", FIELDS)):
+    """Headline and data-quality figures of one catalog version."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_frame(cls, df, version=None, duplicates=None):
+        """KPIs of ``df``; ``duplicates``, if known, saves the row comparison."""
+        n_rows, n_cols = df.shape
+        types = df["type"].value_counts()
+        movies = int(types.get("Movie", 0))
+        tv_shows = int(types.get("TV Show", 0))
+        # Categorical value_counts also lists categories with no rows
+        countries = df["country"].value_counts()
+        countries = countries[countries > 0]
+        # Series.mode() breaks ties by sorting the values
+        top_market = min(str(name) for name in countries.index[countries == countries.iloc[0]]) if len(countries) else None
+        years = df["release_year"].dropna()
+        missing = int(df.isna().sum().sum())
+        cells = n_rows * n_cols
+        return cls(
+            version=version,
+            total_titles=n_rows,
+            movies=movies,
+            tv_shows=tv_shows,
+            movie_pct=movies / n_rows * 100 if n_rows else 0.0,
+            tv_pct=tv_shows / n_rows * 100 if n_rows else 0.0,
+            countries=len(countries),
+            genres=int(df["listed_in"].nunique()),
+            top_market=top_market,
+            earliest_release=int(years.min()) if len(years) else None,
+            latest_release=int(years.max()) if len(years) else None,
+            columns=n_cols,
+            memory_mb=float(df.memory_usage(deep=True).sum() / 1024**2),
+            missing=missing,
+            duplicates=int(df.duplicated().sum()) if duplicates is None else duplicates,
+            completeness_pct=(1 - missing / cells) * 100 if cells else 100.0,
+        )
+
+    def appended(self, df, start, version=None):
+        """KPIs of ``df``, whose rows before ``start`` are the ones these KPIs cover.
+
+        Every other field is a cheap scan; only the appended rows are
+        compared with the rest for duplicates.
+        """
+        return KpiSnapshot.from_frame(df, version, duplicates=self.duplicates + appended_duplicates(df, start))
+
+    @classmethod
+    def from_selection(cls, catalog, selection, version=None):
+        """KPIs of the rows set in the packed bitmap ``selection``, without copying them.
+
+        Every field equals ``from_frame`` over those rows except
+        ``memory_mb``, which stays that of the whole frame: a selection
+        holds no rows of its own.
+        """
+        df = catalog.df
+        counts = catalog.aggregates.counts(selection)
+        rows = catalog.index.rows(selection)
+        missing_cells, groups = catalog.row_quality
+        n_rows, n_cols = len(rows), df.shape[1]
+        types = counts.value_counts("type")
+        movies = int(types.get("Movie", 0))
+        tv_shows = int(types.get("TV Show", 0))
+        names, countries = _value_counts(df["country"], rows)
+        top_market = min(str(name) for name in names[countries == countries.max()]) if len(names) else None
+        years = counts.present("release_year")
+        missing = int(missing_cells[rows].sum())
+        grouped = groups[rows]
+        grouped = grouped[grouped >= 0]
+        cells = n_rows * n_cols
+        return cls(
+            version=version,
+            total_titles=n_rows,
+            movies=movies,
+            tv_shows=tv_shows,
+            movie_pct=movies / n_rows * 100 if n_rows else 0.0,
+            tv_pct=tv_shows / n_rows * 100 if n_rows else 0.0,
+            countries=len(names),
+            genres=len(_value_counts(df["listed_in"], rows)[0]),
+            top_market=top_market,
+            earliest_release=int(years.min()) if len(years) else None,
+            latest_release=int(years.max()) if len(years) else None,
+            columns=n_cols,
+            memory_mb=catalog.kpis.memory_mb,
+            missing=missing,
+            duplicates=len(grouped) - len(np.unique(grouped)),
+            completeness_pct=(1 - missing / cells) * 100 if cells else 100.0,
+        )
+
+    @property
+    def rows(self):
+        return self.total_titles
+
+    def to_dict(self):
+        return dict(self._asdict())
+
+    def to_json(self):
+        return json.dumps({"schema_version": SCHEMA_VERSION, **self.to_dict()}, indent=2)
+
+    @classmethod
+    def from_json(cls, text):
+        """Inverse of ``to_json``; raises ValueError for another schema version."""
+        document = json.loads(text)
+        if document.get("schema_version") != SCHEMA_VERSION:
+            raise ValueError(f"KPI schema version {document.get('schema_version')} is not {SCHEMA_VERSION}")
+        return cls(**{field: document[field] for field in FIELDS})
+
+
+def _value_counts(values, rows):
+    """(values, counts) of the distinct non-missing ``values`` at positions ``rows``."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, labels = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, labels = pd.factorize(values)
+    codes = codes[rows]
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    present = np.flatnonzero(counts)
+    return labels[present], counts[present]
+
+
+def _profile_order(df):
+    # A row alone in its group cannot be a duplicate, so the costly text
+    # columns only factorize the rows the cheap columns left grouped.
+    text = [column for column in df.columns if isinstance(df[column].dtype, pd.StringDtype) or df[column].dtype == object]
+    return [column for column in df.columns if column not in text] + text
+
+
+def row_quality(df):
+    """(missing cells per row, duplicate group per row) of ``df``.
+
+    Rows share a group exactly when they are equal in every column, missing
+    values included; rows equal to no other row get -1. The duplicates
+    among any subset of rows are then its grouped rows minus its distinct
+    groups, as ``duplicated()`` counts them.
+    """
+    missing = df.isna().sum(axis=1).to_numpy(dtype=np.int32)
+    groups = np.zeros(len(df), dtype=np.int64)
+    candidates = np.arange(len(df))
+    for column in _profile_order(df):
+        if not len(candidates):
+            break
+        codes, uniques = pd.factorize(df[column].take(candidates), use_na_sentinel=False)
+        # Both factors are below len(df) + 1, so the combined code fits in int64
+        combined = pd.factorize(groups[candidates] * (len(uniques) + 1) + codes)[0]
+        grouped = np.bincount(combined)[combined] > 1
+        groups[candidates] = combined
+        candidates = candidates[grouped]
+    duplicate_groups = np.full(len(df), -1, dtype=np.int64)
+    duplicate_groups[candidates] = groups[candidates]
+    return missing, duplicate_groups
+
+
+def appended_duplicates(df, start):
+    """How many rows of ``df`` from position ``start`` on ``duplicated()`` flags.
+
+    Grouped as in ``row_quality``, but only groups holding an appended row
+    are followed, so the earlier rows drop out after the first columns.
+    """
+    groups = np.zeros(len(df), dtype=np.int64)
+    candidates = np.arange(len(df))
+    for column in _profile_order(df):
+        if not (candidates >= start).any():
+            return 0
+        codes, uniques = pd.factorize(df[column].take(candidates), use_na_sentinel=False)
+        combined = pd.factorize(groups[candidates] * (len(uniques) + 1) + codes)[0]
+        appended = np.bincount(combined[candidates >= start], minlength=combined.max() + 1)
+        keep = (np.bincount(combined)[combined] > 1) & (appended[combined] > 0)
+        groups[candidates] = combined
+        candidates = candidates[keep]
+    # Every row but the first of a group is a duplicate, and the first is
+    # appended only in groups without an earlier row
+    grouped = groups[candidates]
+    earlier = len(np.unique(grouped[candidates < start]))
+    return int((candidates >= start).sum()) - (len(np.unique(grouped)) - earlier)
+
+
+def main(argv=None):
+    from netflix_core.catalog import Catalog
+
+    parser = argparse.ArgumentParser(description="Export the catalog's KPI snapshot as JSON.")
+    parser.add_argument("path", nargs="?", default="netflix.csv")
+    parser.add_argument("--output", help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    document = Catalog.from_path(args.path).kpis.to_json()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(document + "\n")
+    else:
+        print(document)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""Bounded in-memory log buffer backing the App Logs tab.
+
+Records live in a fixed-size ring: the oldest are dropped once
+``capacity`` is reached, keeping memory flat for the life of a
+long-running deployment. The handler is fed by the background listener
+in ``netflix_core.logpipeline``.
+"""
+import logging
+import os
+import threading
+from collections import deque
+
+DEFAULT_CAPACITY = int(os.environ.get("NETFLIX_LOG_BUFFER_RECORDS", 5000))
+
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last ``capacity`` formatted records as (levelno, line) pairs."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, level=logging.NOTSET):
+        super().__init__(level)
+        self._records = deque(maxlen=capacity)
+        self._buffer_lock = threading.Lock()
+        self.emitted = 0
+
+    @property
+    def capacity(self):
+        return self._records.maxlen
+
+    def emit(self, record):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._buffer_lock:
+            self._records.append((record.levelno, line))
+            self.emitted += 1
+
+    @property
+    def dropped(self):
+        """Records evicted from the ring since the handler was installed."""
+        with self._buffer_lock:
+            return self.emitted - len(self._records)
+
+    def clear(self):
+        with self._buffer_lock:
+            self._records.clear()
+            self.emitted = 0
+
+    def _matching(self, min_level):
+        with self._buffer_lock:
+            snapshot = list(self._records)
+        return [line for levelno, line in snapshot if levelno >= min_level]
+
+    def count(self, min_level=logging.NOTSET):
+        return len(self._matching(min_level))
+
+    def page(self, page=0, page_size=100, min_level=logging.NOTSET, newest_first=True):
+        """One page of formatted lines at or above ``min_level``.
+
+        Returns ``(lines, total)`` where ``total`` counts every matching
+        record, so callers can work out the number of pages.
+        """
+        lines = self._matching(min_level)
+        if newest_first:
+            lines.reverse()
+        start = page * page_size
+        return lines[start:start + page_size], len(lines)
+
+    def text(self, min_level=logging.NOTSET):
+        """All buffered lines at or above ``min_level``, oldest first."""
+        return "\n".join(self._matching(min_level))
+
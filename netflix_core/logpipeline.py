@@ -0,0 +1,164 @@
+"""Queue-backed logging for the dashboard.
+
+Script threads only put records on a queue through a ``QueueHandler`` on
+the root logger. One background ``QueueListener`` thread owns all the
+output: the rotating log file and the in-memory ring buffer behind the
+App Logs tab. Rendering therefore never waits on file I/O or on the file
+handler's lock, however many sessions are logging at once.
+
+The file rotates when it passes a size limit or when the day changes,
+whichever comes first. Rotated files are gzip-compressed, and only the
+newest ``backup_count`` are kept.
+"""
+import atexit
+import glob
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import time
+from datetime import datetime
+
+from netflix_core import logbuffer
+
+HANDLER_NAME = "netflix_core.logpipeline"
+
+LOG_DIR = os.environ.get("NETFLIX_LOG_DIR", "logs")
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+MAX_BYTES = int(os.environ.get("NETFLIX_LOG_MAX_BYTES", 10 * 1024 * 1024))
+BACKUP_COUNT = int(os.environ.get("NETFLIX_LOG_BACKUPS", 14))
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.BaseRotatingHandler):
+    """Rotates on size or at local midnight; rotated files are gzipped.
+
+    Rotated files are named ``<file>.<YYYYmmdd-HHMMSS-ffffff>.gz``, so several size
+    rollovers in one day never overwrite each other.
+    """
+
+    def __init__(self, filename, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT, encoding="utf-8"):
+        super().__init__(filename, "a", encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.rotator = _gzip_rotator
+        self.namer = lambda name: name + ".gz"
+        self.rollover_at = self._next_midnight(time.time())
+
+    @staticmethod
+    def _next_midnight(now):
+        t = time.localtime(now)
+        return time.mktime((t.tm_year, t.tm_mon, t.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+
+    def shouldRollover(self, record):
+        if record.created >= self.rollover_at:
+            return True
+        if self.max_bytes <= 0:
+            return False
+        if self.stream is None:
+            if not os.path.exists(self.baseFilename):
+                return False
+            size = os.path.getsize(self.baseFilename)
+        else:
+            size = self.stream.tell()
+        return size + len(self.format(record)) + 1 >= self.max_bytes
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename):
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+            self.rotate(self.baseFilename, self.rotation_filename(f"{self.baseFilename}.{stamp}"))
+        for old in self.rotated_files()[:-self.backup_count or None]:
+            os.remove(old)
+        self.rollover_at = self._next_midnight(time.time())
+
+    def rotated_files(self):
+        """Rotated files, oldest first; the fixed-width stamps sort by name."""
+        return sorted(glob.glob(glob.escape(self.baseFilename) + ".*-*.gz"))
+
+
+class LogPipeline:
+    """The queue, its listener and the handlers the listener feeds."""
+
+    def __init__(self, log_dir=LOG_DIR, level=logging.INFO, capacity=logbuffer.DEFAULT_CAPACITY,
+                 max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT):
+        os.makedirs(log_dir, exist_ok=True)
+        formatter = logging.Formatter(LOG_FORMAT)
+        self.path = os.path.join(log_dir, "app.log")
+        self.file_handler = SizedTimedRotatingFileHandler(self.path, max_bytes, backup_count)
+        self.file_handler.setFormatter(formatter)
+        self.buffer = logbuffer.RingBufferHandler(capacity)
+        self.buffer.setFormatter(formatter)
+
+        self.queue = queue.SimpleQueue()
+        self.queue_handler = logging.handlers.QueueHandler(self.queue)
+        self.queue_handler.set_name(HANDLER_NAME)
+        self.queue_handler.setLevel(level)
+        self.queue_handler.pipeline = self
+        self.listener = logging.handlers.QueueListener(self.queue, self.file_handler, self.buffer)
+        self.running = False
+
+    def start(self, logger=None):
+        logger = logger or logging.getLogger()
+        self.listener.start()
+        self.running = True
+        logger.addHandler(self.queue_handler)
+        if logger.level == logging.NOTSET or logger.level > self.queue_handler.level:
+            logger.setLevel(self.queue_handler.level)
+        atexit.register(self.stop, logger)
+
+    def stop(self, logger=None):
+        """Detach from ``logger`` and flush everything still queued."""
+        (logger or logging.getLogger()).removeHandler(self.queue_handler)
+        if self.running:
+            self.listener.stop()
+            self.running = False
+        self.file_handler.close()
+
+    def tail(self, n_lines=200):
+        return tail(self.path, n_lines)
+
+
+def install(logger=None, **kwargs):
+    """Start the pipeline once per process and return it.
+
+    Safe to call on every Streamlit rerun: later calls find the queue
+    handler on ``logger`` by name and return the running pipeline.
+    """
+    logger = logger or logging.getLogger()
+    for handler in logger.handlers:
+        if handler.get_name() == HANDLER_NAME:
+            return handler.pipeline
+    pipeline = LogPipeline(**kwargs)
+    pipeline.start(logger)
+    return pipeline
+
+
+def tail(path, n_lines=200, block_size=64 * 1024):
+    """Last ``n_lines`` lines of a text file, read backwards in blocks.
+
+    Cost depends on the lines requested, not on the size of the file.
+    """
+    try:
+        fh = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with fh:
+        end = fh.seek(0, os.SEEK_END)
+        data = b""
+        while end > 0 and data.count(b"\n") <= n_lines:
+            start = max(0, end - block_size)
+            fh.seek(start)
+            data = fh.read(end - start) + data
+            end = start
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    return lines[-n_lines:] if n_lines else []
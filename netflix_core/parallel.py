@@ -0,0 +1,97 @@
+"""Multi-process parsing and preprocessing of large catalog CSVs.
+
+The file is cut into byte ranges on record boundaries, and each range is
+parsed, preprocessed and split into bridge tables in its own process.
+The parts are then merged in order: frames are concatenated with
+``schema.concat_frames`` and bridges are merged with ``EntityBridge.concat``,
+so entity ids match a single-process build. Workers are forked where
+the platform allows: Streamlit installs the app script as ``__main__``,
+which a spawned or forkserver child would execute again. The merge
+briefly holds the parts and the result together, so peak memory is about
+twice the catalog. Set ``NETFLIX_PREPROCESS_WORKERS`` to use it for
+full parses; ``python -m netflix_core.benchmark --workers 1,2,4,8``
+reports the speedup per worker count.
+"""
+import io
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from netflix_core import bridge, schema
+from netflix_core.catalog import csv_columns, preprocess
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 1 << 22
+
+
+def row_boundaries(path, n_parts, block_size=BLOCK_SIZE):
+    """Byte offsets ``[start, ..., end]`` splitting the rows of a CSV into parts.
+
+    The first offset is just past the header. The others are the first line
+    break at or after an even split of the file that is outside a quoted
+    field, i.e. has an even number of quote characters before it. Parts
+    never split a record, even one with line breaks inside quotes.
+    """
+    size = os.path.getsize(path)
+    targets = [0] + [size * i // n_parts for i in range(1, n_parts)]
+    bounds = []
+    quotes = 0
+    with open(path, "rb") as fh:
+        block_start = 0
+        while targets and block_start < size:
+            block = fh.read(block_size)
+            block_end = block_start + len(block)
+            while targets and targets[0] < block_end:
+                pos = block.find(b"\n", max(targets[0], block_start) - block_start)
+                while pos >= 0 and (quotes + block.count(b'"', 0, pos)) % 2:
+                    pos = block.find(b"\n", pos + 1)
+                if pos < 0:
+                    # No record ends in this block after the target; keep looking in the next
+                    targets[0] = block_end
+                    break
+                bound = block_start + pos + 1
+                if not bounds or bound > bounds[-1]:
+                    bounds.append(bound)
+                targets.pop(0)
+            quotes += block.count(b'"')
+            block_start = block_end
+    if not bounds:
+        bounds.append(size)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return bounds
+
+
+def _process_range(path, start, end, columns):
+    """Parse, preprocess and bridge the rows in bytes ``start .. end``."""
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+    df = preprocess(pd.read_csv(io.BytesIO(data), header=None, names=columns))
+    return df, bridge.build_bridges(df)
+
+
+def _context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+
+def read_catalog(path, workers):
+    """``(df, bridges)`` for the catalog CSV at ``path``, built by ``workers`` processes."""
+    bounds = row_boundaries(path, workers)
+    columns = csv_columns(path)
+    ranges = list(zip(bounds[:-1], bounds[1:]))
+    logger.info(f"Parsing {path} in {len(ranges)} row ranges across {workers} processes")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_context()) as pool:
+        parts = list(pool.map(_process_range, *zip(*[(path, start, end, columns) for start, end in ranges])))
+
+    df = schema.concat_frames([frame for frame, _ in parts])
+    bridges = {kind: bridge.EntityBridge.concat([part[kind] for _, part in parts])
+               for kind in bridge.BRIDGE_COLUMNS}
+    logger.info(f"Data loaded successfully. Shape: {df.shape}")
+    return df, bridges
+
@@ -0,0 +1,125 @@
+"""Lightweight span timing for the stages of a dashboard rerun.
+
+``Profiler.span(stage)`` records wall time for a block of code into a
+bounded, thread-safe ring of recent spans, which ``stats()`` summarizes as
+p50/p95 per stage. Peak allocation is recorded too when memory tracing is
+on (``NETFLIX_PROFILE_MEMORY=1``). It is off by default because
+``tracemalloc`` slows every allocation down. Its peak counter is
+process-wide, so with several sessions rendering at once the figure is
+an upper bound.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_SPANS = int(os.environ.get("NETFLIX_PROFILE_SPANS", 20000))
+TRACE_MEMORY = os.environ.get("NETFLIX_PROFILE_MEMORY", "") not in ("", "0")
+
+STAT_COLUMNS = ["stage", "count", "p50_ms", "p95_ms", "max_ms", "p95_peak_mb"]
+
+
+class Profiler:
+    """Bounded store of (run, stage, wall time, peak bytes) spans."""
+
+    def __init__(self, max_spans=DEFAULT_MAX_SPANS, trace_memory=TRACE_MEMORY):
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._runs = 0
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def begin_run(self):
+        """Start a new rerun; spans on this thread are tagged with its id."""
+        with self._lock:
+            self._runs += 1
+            self._local.run = self._runs
+        return self._runs
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, stage):
+        """Time the enclosed block as ``stage``; spans may nest."""
+        stack = self._stack()
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # The peak counter is global: remember the enclosing span's peak
+            # so far before resetting it for this one.
+            if stack:
+                stack[-1] = max(stack[-1], peak)
+            tracemalloc.reset_peak()
+            stack.append(current)
+            baseline = current
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000.0
+            peak_bytes = None
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(stack.pop(), peak)
+                peak_bytes = max(0, peak - baseline)
+                if stack:
+                    stack[-1] = max(stack[-1], peak)
+            with self._lock:
+                self._spans.append((getattr(self._local, "run", 0), stage, time.time(), wall_ms, peak_bytes))
+
+    def spans(self, last=None):
+        """Recent spans as a frame, oldest first."""
+        with self._lock:
+            rows = list(self._spans)
+        if last:
+            rows = rows[-last:]
+        return pd.DataFrame(rows, columns=["run", "stage", "timestamp", "wall_ms", "peak_bytes"])
+
+    def stats(self, last=None):
+        """p50/p95/max wall time and p95 peak allocation per stage."""
+        spans = self.spans(last)
+        if spans.empty:
+            return pd.DataFrame(columns=STAT_COLUMNS)
+        rows = []
+        for stage, group in spans.groupby("stage", sort=False):
+            wall = group["wall_ms"].to_numpy()
+            peak = group["peak_bytes"].dropna().to_numpy(dtype=np.float64)
+            rows.append((
+                stage,
+                len(wall),
+                float(np.percentile(wall, 50)),
+                float(np.percentile(wall, 95)),
+                float(wall.max()),
+                float(np.percentile(peak, 95)) / 2**20 if len(peak) else None,
+            ))
+        stats = pd.DataFrame(rows, columns=STAT_COLUMNS)
+        return stats.sort_values("p95_ms", ascending=False, kind="stable").reset_index(drop=True)
+
+    def to_json(self, last=None):
+        """Summary and raw spans as a JSON document for offline analysis."""
+        spans = self.spans(last)
+        spans["timestamp"] = [datetime.fromtimestamp(t).isoformat() for t in spans["timestamp"]]
+        stats = self.stats(last)
+        return json.dumps({
+            "generated_at": datetime.now().isoformat(),
+            "trace_memory": self.trace_memory,
+            "stats": json.loads(stats.to_json(orient="records")),
+            "spans": json.loads(spans.to_json(orient="records")),
+        }, indent=2)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
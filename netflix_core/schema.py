@@ -0,0 +1,166 @@
+"""Compact column dtypes for the preprocessed catalog.
+
+Low-cardinality columns become categoricals. ``type``, ``month_added`` and
+``Content_For`` have fixed category orders, so months sort in calendar
+order and audiences from youngest to oldest wherever they are grouped or
+charted. ``rating``, ``country`` and ``listed_in`` use their observed values,
+sorted. Years become ``Int16`` and free text stays in Arrow-backed strings.
+Groupbys over categorical keys work on the small integer codes instead of
+hashing strings.
+
+Frames built from separate parts (chunks, row ranges, appended rows) have
+different observed categories, so they are concatenated with
+``concat_frames``, which unions the categories instead of falling back to
+strings::
+
+    python -m netflix_core.schema [netflix.csv]
+
+prints the memory per column and groupby timings before and after.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+CONTENT_TYPES = ["Movie", "TV Show"]
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+AUDIENCES = ["Kids", "Older Kids", "Teens", "Adults"]
+
+# Categoricals with a fixed order, and whether the order is meaningful for comparisons.
+FIXED_CATEGORIES = {
+    "type": (CONTENT_TYPES, False),
+    "month_added": (MONTHS, True),
+    "Content_For": (AUDIENCES, True),
+}
+# Categoricals whose categories are the sorted observed values.
+OBSERVED_CATEGORIES = ("rating", "country", "listed_in")
+SMALL_INTS = {"release_year": "Int16", "year_added": "Int16"}
+TEXT_COLUMNS = ("show_id", "title", "director", "cast", "duration", "description")
+# Arrow-backed strings with NaN for missing values, pandas 3's ``str`` dtype spelled
+# out so pandas 2 does not turn missing values into the string "nan"
+TEXT_DTYPE = pd.StringDtype("pyarrow", na_value=np.nan)
+
+GROUPBYS = (["year_added", "type"], ["Content_For", "type"], ["month_added"], ["rating"])
+
+
+def _fixed(values, categories, ordered):
+    """Categorical of ``values`` with ``categories`` first, mapping each distinct value once.
+
+    Unexpected values are kept, after the known ones, rather than turned into NaN.
+    """
+    codes, uniques = pd.factorize(values)
+    known = set(categories)
+    categories = categories + sorted(value for value in uniques if value not in known)
+    # The trailing -1 is what code -1 (a missing value) picks up
+    positions = np.append(pd.Index(categories).get_indexer(uniques), -1)
+    return pd.Categorical.from_codes(positions[codes], categories=categories, ordered=ordered)
+
+
+def optimize(df):
+    """Convert ``df``'s columns to the compact dtypes, in place."""
+    for column, (categories, ordered) in FIXED_CATEGORIES.items():
+        if column in df and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = _fixed(df[column], categories, ordered)
+    for column in OBSERVED_CATEGORIES:
+        if column in df and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    for column, dtype in SMALL_INTS.items():
+        if column in df:
+            df[column] = df[column].astype(dtype)
+    for column in TEXT_COLUMNS:
+        if column in df and df[column].dtype == object:
+            df[column] = df[column].astype(TEXT_DTYPE)
+    return df
+
+
+def _union_dtype(column, parts):
+    """One categorical dtype covering the values of every part of a column."""
+    categories = {}
+    for part in parts:
+        if isinstance(part.dtype, pd.CategoricalDtype):
+            categories.update(dict.fromkeys(part.cat.categories))
+        else:
+            categories.update(dict.fromkeys(pd.unique(part.dropna())))
+    categories = list(categories)
+    if column in OBSERVED_CATEGORIES:
+        categories.sort()
+    ordered = column in FIXED_CATEGORIES and FIXED_CATEGORIES[column][1]
+    return pd.CategoricalDtype(categories, ordered=ordered)
+
+
+def concat_frames(frames):
+    """Concatenate frames of the same columns as if they had been built whole.
+
+    Categorical columns get the union of the parts' categories, in the
+    schema's order. A part where a column is entirely missing infers a
+    different dtype (float for an empty text column), so it is cast to the
+    dtype the other parts agree on.
+    """
+    frames = [frame for frame in frames if len(frame)] or frames[:1]
+    for column in frames[0].columns:
+        parts = [frame[column] for frame in frames]
+        if any(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            dtype = _union_dtype(column, parts)
+            # Unordered categorical dtypes compare equal whatever their category order
+            cast = [part.dtype != dtype or not part.cat.categories.equals(dtype.categories) for part in parts]
+        else:
+            dtypes = {part.dtype for part in parts if part.notna().any()}
+            if len(dtypes) != 1:
+                continue
+            dtype = dtypes.pop()
+            cast = [part.dtype != dtype and not part.notna().any() for part in parts]
+        frames = [frame.astype({column: dtype}) if needed else frame for frame, needed in zip(frames, cast)]
+    return pd.concat(frames, ignore_index=True)
+
+
+def memory_report(before, after):
+    """Deep memory (MB) and dtype per column of two versions of a frame, plus a total row."""
+    mb = 1024 ** 2
+    report = pd.DataFrame({
+        "dtype_before": before.dtypes.astype(str),
+        "mb_before": before.memory_usage(deep=True, index=False) / mb,
+        "dtype_after": after.dtypes.astype(str),
+        "mb_after": after.memory_usage(deep=True, index=False) / mb,
+    })
+    report.loc["total"] = ["", report["mb_before"].sum(), "", report["mb_after"].sum()]
+    report["saved_pct"] = (1 - report["mb_after"] / report["mb_before"]) * 100
+    return report
+
+
+def _time_groupby(df, keys, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        df.groupby(keys, observed=True).size()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(argv=None):
+    from netflix_core.catalog import preprocess
+
+    parser = argparse.ArgumentParser(description="Report memory and groupby speed of the compact dtypes.")
+    parser.add_argument("path", nargs="?", default="netflix.csv")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    plain = preprocess(pd.read_csv(args.path), optimize=False)
+    start = time.perf_counter()
+    compact = optimize(plain.copy())
+    optimize_s = time.perf_counter() - start
+
+    pd.set_option("display.width", 120)
+    print(f"{len(plain):,} rows; optimize took {optimize_s * 1000:.1f} ms")
+    print(memory_report(plain, compact).round(2).to_string())
+    print()
+    print(f"{'groupby':<28}{'before ms':>10}{'after ms':>10}{'speedup':>9}")
+    for keys in GROUPBYS:
+        slow = _time_groupby(plain, keys, args.repeat)
+        fast = _time_groupby(compact, keys, args.repeat)
+        print(f"{', '.join(keys):<28}{slow * 1000:>10.2f}{fast * 1000:>10.2f}{slow / fast:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""Host-wide store of the preprocessed catalog, one copy per dataset version.
+
+Each Streamlit worker process used to hold a private copy of the frame and
+rebuild the bridge tables from it, so memory grew with the number of
+workers on a node. The store keeps one copy per dataset version (the CSV's
+SHA-256, ``Catalog.version``) under ``SHARED_DIR``, by default on the
+``/dev/shm`` tmpfs. Files are uncompressed, single-chunk Arrow IPC, laid
+out so pandas can wrap their buffers as they are: categoricals as integer
+codes, nullable integers as values plus a byte mask, datetimes as int64
+and text as Arrow strings. Processes attach through memory maps, so every
+process and session on the host reads the same pages and nothing is
+copied, parsed or hashed on attach. Attached arrays are read-only.
+pyarrow is imported on first use, like in ``snapshot``.
+
+A version is built by one process at a time under an exclusive file lock,
+published by renaming a complete directory into place and never modified
+afterwards. Each version records the CSV it was built from, and only the
+``SHARED_KEEP`` most recent versions of each CSV are kept, so datasets
+served from one host never evict each other. A process still mapping a
+removed version keeps its pages until it lets go.
+Set ``NETFLIX_SHARED_DIR`` to move the store, or to an empty string to
+keep a private copy per process::
+
+    python -m netflix_core.sharedstore [netflix.csv]
+
+attaches (publishing first if needed) and reports this process's private
+and shared memory.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from netflix_core import snapshot
+from netflix_core.bridge import EntityBridge
+from netflix_core.kpis import KpiSnapshot
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds are not serialized across processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default_dir():
+    if os.path.isdir("/dev/shm"):
+        return os.path.join("/dev/shm", "netflix_core")
+    return os.path.join(".cache", "shared")
+
+
+SHARED_DIR = os.environ.get("NETFLIX_SHARED_DIR", _default_dir())
+SHARED_KEEP = int(os.environ.get("NETFLIX_SHARED_KEEP", 2))
+
+_META_COLUMNS = b"netflix_core.columns"
+_META_N_TITLES = b"netflix_core.n_titles"
+# File in a version directory holding the absolute path of its source CSV
+_SOURCE_FILE = "source"
+_MASK_SUFFIX = ":mask"
+MASKED_ARRAYS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+
+def version_dir(version, root=SHARED_DIR):
+    # The preprocessing version is part of the key, like the snapshot file name
+    return os.path.join(root, f"v{snapshot.SNAPSHOT_VERSION}-{version[:16]}")
+
+
+def lock_path(directory):
+    return directory + ".lock"
+
+
+# --- Frame encoding ---
+
+def _encode_column(name, values):
+    """(spec, {column name: Arrow array}) for one frame column."""
+    import pyarrow as pa
+
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        spec = {"kind": "category", "categories": dtype.categories.tolist(), "ordered": bool(dtype.ordered)}
+        return spec, {name: pa.array(values.cat.codes.to_numpy())}
+    if isinstance(values.array, MASKED_ARRAYS):
+        # The mask is stored as bytes, which pandas can view as bool; Arrow's bitmaps would need unpacking
+        array = values.array
+        spec = {"kind": "masked", "dtype": str(dtype)}
+        return spec, {name: pa.array(array._data), name + _MASK_SUFFIX: pa.array(array._mask.view(np.uint8))}
+    if dtype.kind == "M":
+        spec = {"kind": "datetime", "dtype": str(dtype)}
+        return spec, {name: pa.array(values.to_numpy().view(np.int64))}
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        return {"kind": "numpy", "dtype": str(dtype)}, {name: pa.array(values.to_numpy(), from_pandas=False)}
+    return {"kind": "arrow"}, {name: pa.array(values.array)}
+
+
+def _decode_column(spec, table, name):
+    if spec["kind"] == "arrow":
+        return table.column(name).to_pandas().array
+    values = table.column(name).chunk(0).to_numpy(zero_copy_only=True)
+    if spec["kind"] == "category":
+        dtype = pd.CategoricalDtype(spec["categories"], ordered=spec["ordered"])
+        return pd.Categorical.from_codes(values, dtype=dtype, validate=False)
+    if spec["kind"] == "masked":
+        mask = table.column(name + _MASK_SUFFIX).chunk(0).to_numpy(zero_copy_only=True).view(bool)
+        return pd.api.types.pandas_dtype(spec["dtype"]).construct_array_type()(values, mask)
+    if spec["kind"] == "datetime":
+        return values.view(spec["dtype"])
+    return values
+
+
+def encode_frame(df):
+    """``df`` as an Arrow table whose buffers pandas can wrap without copying."""
+    import pyarrow as pa
+
+    specs, arrays = [], {}
+    for name in df.columns:
+        spec, columns = _encode_column(name, df[name])
+        specs.append(dict(spec, name=name))
+        arrays.update(columns)
+    table = pa.table(arrays)
+    return table.replace_schema_metadata({_META_COLUMNS: json.dumps(specs).encode()})
+
+
+def decode_frame(table):
+    """The frame of an ``encode_frame`` table, sharing its buffers."""
+    specs = json.loads(table.schema.metadata[_META_COLUMNS])
+    return pd.DataFrame({spec["name"]: _decode_column(spec, table, spec["name"]) for spec in specs}, copy=False)
+
+
+# --- Files ---
+
+def _write_table(table, path):
+    import pyarrow as pa
+
+    # One record batch per file, so every column is a single buffer numpy can view
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table.combine_chunks())
+
+
+def _map_table(path):
+    import pyarrow as pa
+
+    return pa.ipc.open_file(pa.memory_map(path)).read_all()
+
+
+def _write_bridge(bridge, directory):
+    import pyarrow as pa
+
+    table = pa.table({"title_idx": bridge.title_idx, "entity_id": bridge.entity_id})
+    table = table.replace_schema_metadata({_META_N_TITLES: str(bridge.n_titles).encode()})
+    _write_table(table, os.path.join(directory, f"bridge-{bridge.kind}.arrow"))
+    vocab = pa.table({"name": pa.array(np.asarray(bridge.vocab, dtype=object), type=pa.large_string())})
+    _write_table(vocab, os.path.join(directory, f"vocab-{bridge.kind}.arrow"))
+
+
+def _map_bridge(kind, directory):
+    links = _map_table(os.path.join(directory, f"bridge-{kind}.arrow"))
+    vocab = _map_table(os.path.join(directory, f"vocab-{kind}.arrow"))
+    return EntityBridge(
+        kind,
+        pd.Index(vocab.column("name").to_pandas().array, copy=False),
+        links.column("title_idx").chunk(0).to_numpy(zero_copy_only=True),
+        links.column("entity_id").chunk(0).to_numpy(zero_copy_only=True),
+        int(links.schema.metadata[_META_N_TITLES]),
+    )
+
+
+@contextlib.contextmanager
+def lock(version, root=SHARED_DIR):
+    """Hold the host-wide build lock for ``version``."""
+    os.makedirs(root, exist_ok=True)
+    with open(lock_path(version_dir(version, root)), "a+") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def publish(version, df, bridges, kpis, root=SHARED_DIR, source=None):
+    """Write a version to the store unless it is already there.
+
+    ``source`` is the CSV the version was built from; older versions of
+    the same CSV are pruned once it is published.
+    """
+    target = version_dir(version, root)
+    if os.path.isdir(target):
+        return
+    os.makedirs(root, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=root, prefix=".tmp-")
+    try:
+        _write_table(encode_frame(df), os.path.join(tmp, "frame.arrow"))
+        for part in bridges.values():
+            _write_bridge(part, tmp)
+        with open(os.path.join(tmp, "kpis.json"), "w", encoding="utf-8") as fh:
+            fh.write(kpis.to_json())
+        if source is not None:
+            with open(os.path.join(tmp, _SOURCE_FILE), "w", encoding="utf-8") as fh:
+                fh.write(os.path.abspath(source))
+        os.rename(tmp, target)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+        if os.path.isdir(target):
+            # Another process without the lock (e.g. on Windows) got there first
+            return
+        raise
+    logger.info(f"Published dataset version {version[:16]} to the shared store {target}")
+    if source is not None:
+        prune(source, root, keep=target)
+
+
+def attach(version, root=SHARED_DIR):
+    """``(df, bridges, kpis)`` mapped from the store, or None if the version is not there."""
+    import pyarrow as pa
+
+    directory = version_dir(version, root)
+    if not os.path.isdir(directory):
+        return None
+    try:
+        df = decode_frame(_map_table(os.path.join(directory, "frame.arrow")))
+        bridges = {kind: _map_bridge(kind, directory) for kind in bridge_kinds(directory)}
+        with open(os.path.join(directory, "kpis.json"), encoding="utf-8") as fh:
+            kpis = KpiSnapshot.from_json(fh.read())
+    except (OSError, KeyError, ValueError, pa.ArrowInvalid) as exc:
+        logger.warning(f"Shared store entry {directory} is unreadable ({exc}); rebuilding it")
+        shutil.rmtree(directory, ignore_errors=True)
+        return None
+    logger.info(f"Attached dataset version {version[:16]} from the shared store. Shape: {df.shape}")
+    return df, bridges, kpis
+
+
+def bridge_kinds(directory):
+    return sorted(name[len("bridge-"):-len(".arrow")] for name in os.listdir(directory)
+                  if name.startswith("bridge-") and name.endswith(".arrow"))
+
+
+def version_source(directory):
+    """Absolute path of the CSV a version was built from, or None if it was not recorded."""
+    try:
+        with open(os.path.join(directory, _SOURCE_FILE), encoding="utf-8") as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def versions(root=SHARED_DIR, source=None):
+    """Published version directories, newest first; with ``source``, only those of that CSV."""
+    if not os.path.isdir(root):
+        return []
+    paths = [os.path.join(root, name) for name in os.listdir(root) if name.startswith("v")]
+    paths = [path for path in paths if os.path.isdir(path)]
+    if source is not None:
+        paths = [path for path in paths if version_source(path) == os.path.abspath(source)]
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+
+def prune(source, root=SHARED_DIR, keep=None, n_keep=SHARED_KEEP):
+    """Remove all but the ``n_keep`` newest versions of ``source``, never removing ``keep``.
+
+    Versions of other CSVs, or without a recorded source, are left alone.
+    """
+    stale = [path for path in versions(root, source) if path != keep][max(n_keep - 1, 0):]
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+        _remove_lock(lock_path(path))
+        logger.info(f"Removed stale shared store entry {path}")
+
+
+def _remove_lock(path):
+    """Delete a version's lock file unless a process holds it."""
+    try:
+        with open(path, "a+") as fh:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return
+            os.remove(path)
+    except OSError:
+        pass
+
+
+def _memory():
+    """{field: MB} from /proc/self/smaps_rollup, empty where unavailable."""
+    try:
+        with open("/proc/self/smaps_rollup") as fh:
+            lines = [line.split() for line in fh]
+    except OSError:
+        return {}
+    return {parts[0].rstrip(":"): int(parts[1]) / 1024 for parts in lines if len(parts) == 3 and parts[2] == "kB"}
+
+
+def main(argv=None):
+    from netflix_core.catalog import Catalog
+
+    parser = argparse.ArgumentParser(description="Attach the catalog from the host-wide shared store.")
+    parser.add_argument("path", nargs="?", default="netflix.csv")
+    parser.add_argument("--root", default=SHARED_DIR)
+    args = parser.parse_args(argv)
+
+    before = _memory()
+    catalog = Catalog.from_path(args.path, shared_dir=args.root)
+    catalog.warm("kpis", "bridges")
+    after = _memory()
+    print(f"{len(catalog):,} rows, version {catalog.version[:16]}, shared: {catalog.shared}")
+    for path in versions(args.root):
+        size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+        print(f"  {path}  {size / 2**20:.1f} MB")
+    if before and after:
+        for field in ("Rss", "Pss", "Private_Dirty", "Shared_Clean", "Shmem" if "Shmem" in after else "Private_Clean"):
+            print(f"{field:<14}{before.get(field, 0):>9.1f} MB -> {after.get(field, 0):>9.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+"""Columnar on-disk snapshot of the preprocessed catalog.
+
+The snapshot is an uncompressed Arrow IPC (Feather v2) file keyed on the
+SHA-256 of the source CSV, so it can be memory-mapped on load and is
+rebuilt only when the CSV content (or ``SNAPSHOT_VERSION``) changes.
+
+It also records how many bytes of the CSV it covers. When the CSV has
+only grown since, only the appended rows are parsed, and they are written
+as a segment: a snapshot of just those rows that names the snapshot it
+extends. Reading a segment reads its chain and concatenates it, so after
+``SNAPSHOT_SEGMENTS`` segments the next store writes the whole frame
+again. pyarrow is imported on first use, so importing this module costs
+nothing at startup.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+
+from netflix_core import schema
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the preprocessing changes the shape or meaning of a column.
+SNAPSHOT_VERSION = 4
+
+SNAPSHOT_DIR = os.environ.get("NETFLIX_SNAPSHOT_DIR", os.path.join(".cache", "snapshots"))
+# Appended segments chained to one full snapshot before it is rewritten whole.
+SNAPSHOT_SEGMENTS = int(os.environ.get("NETFLIX_SNAPSHOT_SEGMENTS", 8))
+
+_META_VERSION = b"netflix_core.snapshot_version"
+_META_SOURCE = b"netflix_core.source_sha256"
+_META_SIZE = b"netflix_core.source_bytes"
+_META_BASE = b"netflix_core.base_sha256"
+_META_SEGMENTS = b"netflix_core.segments"
+
+
+def source_stat(path):
+    """Cheap (size, mtime) fingerprint used as an in-process cache key."""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def file_digest(path, chunk_size=1 << 20, size=None):
+    """SHA-256 of the file contents (or its first ``size`` bytes), read in chunks."""
+    h = hashlib.sha256()
+    remaining = size
+    with open(path, "rb") as fh:
+        while remaining is None or remaining > 0:
+            chunk = fh.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            h.update(chunk)
+            if remaining is not None:
+                remaining -= len(chunk)
+    return h.hexdigest()
+
+
+def is_append(path, digest, size):
+    """True if ``path`` is the ``size``-byte file hashed to ``digest`` plus new rows.
+
+    The old content must end on a line break, so the new bytes start a new
+    row rather than extending the last one.
+    """
+    if size is None or os.path.getsize(path) <= size:
+        return False
+    with open(path, "rb") as fh:
+        fh.seek(size - 1)
+        if fh.read(1) != b"\n":
+            return False
+    return file_digest(path, size=size) == digest
+
+
+_DIGESTS = {}
+
+
+def source_digest(path):
+    """``file_digest`` memoized on the file's (size, mtime) in this process.
+
+    Cheap enough to call on every rerun, and usable as a dataset version
+    for caches that should invalidate when the CSV changes.
+    """
+    key = (os.path.abspath(path),) + source_stat(path)
+    digest = _DIGESTS.get(key)
+    if digest is None:
+        digest = _DIGESTS[key] = file_digest(path)
+    return digest
+
+
+def snapshot_path(csv_path, digest, cache_dir=SNAPSHOT_DIR):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f"{stem}-v{SNAPSHOT_VERSION}-{digest[:16]}.feather")
+
+
+def write_snapshot(df, path, digest, source_size=None, base=None, segments=0):
+    """Atomically write ``df`` as an uncompressed Feather file.
+
+    With ``base``, the digest of another snapshot in the same directory,
+    ``df`` holds only the rows that follow that snapshot's, and it is the
+    ``segments``-th segment of the chain.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_META_VERSION] = str(SNAPSHOT_VERSION).encode()
+    metadata[_META_SOURCE] = digest.encode()
+    if source_size is not None:
+        metadata[_META_SIZE] = str(source_size).encode()
+    if base is not None:
+        metadata[_META_BASE] = base.encode()
+        metadata[_META_SEGMENTS] = str(segments).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        # Compression would defeat memory-mapping, so keep the buffers raw.
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _read_table(path, digest):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    try:
+        table = feather.read_table(path, memory_map=True)
+    except (OSError, pa.ArrowInvalid) as exc:
+        logger.warning(f"Snapshot {path} is unreadable ({exc}); rebuilding")
+        return None
+    metadata = table.schema.metadata or {}
+    if (metadata.get(_META_VERSION) != str(SNAPSHOT_VERSION).encode()
+            or metadata.get(_META_SOURCE) != digest.encode()):
+        logger.warning(f"Snapshot {path} does not match the source; rebuilding")
+        return None
+    return table
+
+
+def _base_path(path, base):
+    """Path of the snapshot ``base`` that the segment at ``path`` extends."""
+    prefix = os.path.basename(path).rsplit("-", 1)[0]
+    return os.path.join(os.path.dirname(path), f"{prefix}-{base[:16]}.feather")
+
+
+def read_snapshot(path, digest):
+    """Memory-map a snapshot, returning None if it is stale or unreadable.
+
+    Columns are not consolidated into 2-D blocks, so strings and dates stay
+    views of the mapped file and only the nullable-int masks and category
+    codes are copied. A segment is read with the snapshots it extends and
+    concatenated.
+    """
+    frames = []
+    while True:
+        table = _read_table(path, digest)
+        if table is None:
+            return None
+        # pandas 2 reads the text columns back as object, so restore their dtype
+        frames.append(schema.optimize(table.to_pandas(split_blocks=True)))
+        base = (table.schema.metadata or {}).get(_META_BASE)
+        if base is None:
+            break
+        digest = base.decode()
+        path = _base_path(path, digest)
+    return frames[0] if len(frames) == 1 else schema.concat_frames(frames[::-1])
+
+
+def _metadata(path):
+    import pyarrow as pa
+
+    try:
+        with pa.memory_map(path) as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if metadata.get(_META_VERSION) != str(SNAPSHOT_VERSION).encode() or _META_SOURCE not in metadata:
+        return None
+    return metadata
+
+
+def snapshot_source(path):
+    """(source digest, source bytes) recorded in a snapshot, or None if unreadable."""
+    metadata = _metadata(path)
+    if metadata is None:
+        return None
+    size = metadata.get(_META_SIZE)
+    return metadata[_META_SOURCE].decode(), int(size) if size is not None else None
+
+
+def chain(path):
+    """Paths of the snapshot at ``path`` and of every snapshot it extends, newest first.
+
+    Stops at the first missing or unreadable snapshot.
+    """
+    paths = []
+    metadata = _metadata(path)
+    while metadata is not None:
+        paths.append(path)
+        base = metadata.get(_META_BASE)
+        if base is None:
+            break
+        path = _base_path(path, base.decode())
+        metadata = _metadata(path)
+    return paths
+
+
+def segments(path):
+    """Number of appended segments in the snapshot at ``path``; 0 for a whole frame."""
+    metadata = _metadata(path) or {}
+    return int(metadata.get(_META_SEGMENTS, 0))
+
+
+def find_append_base(csv_path, cache_dir=SNAPSHOT_DIR):
+    """(snapshot path, digest, bytes) of a snapshot that ``csv_path`` only appends to."""
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    if not os.path.isdir(cache_dir):
+        return None
+    for name in sorted(os.listdir(cache_dir)):
+        if not (name.startswith(f"{stem}-v{SNAPSHOT_VERSION}-") and name.endswith(".feather")):
+            continue
+        path = os.path.join(cache_dir, name)
+        source = snapshot_source(path)
+        if source is not None and is_append(csv_path, *source):
+            return (path,) + source
+    return None
+
+
+def store(df, csv_path, digest, source_size, cache_dir=SNAPSHOT_DIR, base=None):
+    """Persist ``df`` as the snapshot of ``csv_path`` and drop older ones.
+
+    With ``base``, a ``(digest, rows)`` pair saying that the first ``rows``
+    rows of ``df`` are the snapshot of that digest, only the rows after
+    them are written, as a segment of that snapshot.
+    """
+    path = snapshot_path(csv_path, digest, cache_dir)
+    try:
+        depth = _next_segment(snapshot_path(csv_path, base[0], cache_dir)) if base is not None else None
+        if depth is not None and depth <= SNAPSHOT_SEGMENTS:
+            base_digest, rows = base
+            write_snapshot(df.iloc[rows:], path, digest, source_size, base_digest, depth)
+            logger.info(f"Wrote {len(df) - rows:,} appended rows as snapshot segment {path}")
+        else:
+            write_snapshot(df, path, digest, source_size)
+            logger.info(f"Wrote catalog snapshot {path}")
+        _prune_stale(csv_path, path, cache_dir)
+    except OSError as exc:
+        # A read-only filesystem should not stop the dashboard from loading.
+        logger.warning(f"Could not write snapshot {path}: {exc}")
+
+
+def _next_segment(base_path):
+    """Depth of a new segment on the snapshot at ``base_path``; None unless its whole chain is on disk."""
+    depth = segments(base_path)
+    return depth + 1 if len(chain(base_path)) == depth + 1 else None
+
+
+def _prune_stale(csv_path, keep, cache_dir):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    if not os.path.isdir(cache_dir):
+        return
+    kept = set(chain(keep)) | {keep}
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith(f"{stem}-v") and name.endswith(".feather") and path not in kept:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_or_build(csv_path, build, cache_dir=SNAPSHOT_DIR, append=None):
+    """Return the preprocessed catalog for ``csv_path``.
+
+    Loads the matching snapshot when one exists. Otherwise, if ``append``
+    is given and an older snapshot covers a prefix of the file, returns
+    ``append(old_df, csv_path, offset)`` for the bytes after it, stored as
+    a segment of that snapshot; failing that, calls ``build(csv_path)``.
+    The result is persisted for the next cold start.
+    """
+    size = source_stat(csv_path)[0]
+    digest = source_digest(csv_path)
+    path = snapshot_path(csv_path, digest, cache_dir)
+
+    if os.path.exists(path):
+        df = read_snapshot(path, digest)
+        if df is not None:
+            logger.info(f"Loaded catalog snapshot {path}. Shape: {df.shape}")
+            return df
+
+    df = extends = None
+    base = find_append_base(csv_path, cache_dir) if append is not None else None
+    if base is not None:
+        base_path, base_digest, offset = base
+        base_df = read_snapshot(base_path, base_digest)
+        if base_df is not None:
+            logger.info(f"{csv_path} grew by {size - offset:,} bytes since snapshot {base_path}; "
+                        f"parsing only the appended rows")
+            df = append(base_df, csv_path, offset)
+            extends = (base_digest, len(base_df))
+    if df is None:
+        df = build(csv_path)
+    store(df, csv_path, digest, size, cache_dir, base=extends)
+    return df
@@ -0,0 +1,428 @@
+"""Streaming ingestion for catalogs larger than memory.
+
+``stream_aggregates`` reads the CSV in fixed-size chunks, runs each chunk
+through the same ``preprocess`` as the in-memory path, and folds it into
+``CatalogAggregates``: the counts, tallies, duration histograms,
+genre x country co-occurrences and saturation cube partials behind the
+dashboard's charts. A chunk is dropped as soon as it has been folded in,
+so peak memory follows the chunk size. The running state grows only with
+the number of distinct keys (genres, countries, years, combinations),
+never with the number of rows.
+
+Row-level views (raw preview, simulator example titles, the bitmap index)
+are not available from aggregates. Cast and director tallies are optional
+because their vocabularies grow with the catalog. The dashboard switches
+to these aggregates for a CSV larger than ``NETFLIX_STREAMING_BYTES``
+(``should_stream``) and then shows only the views they cover::
+
+    python -m netflix_core.streaming netflix.csv [--chunk-rows 100000] [--verify]
+"""
+import argparse
+import collections
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from netflix_core import analytics, cooccurrence, cube, kpis, schema
+from netflix_core.bridge import BRIDGE_COLUMNS, EntityBridge
+from netflix_core.catalog import preprocess
+
+CHUNK_ROWS = 100_000
+DEFAULT_KINDS = ("country", "genre")
+# CSV size above which the dashboard streams aggregates instead of loading the catalog; 0 never does.
+STREAMING_BYTES = int(os.environ.get("NETFLIX_STREAMING_BYTES", 0))
+
+
+class _Vocabulary:
+    """Global ids for values seen across chunks, in first-seen order."""
+
+    def __init__(self):
+        self.ids = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def map(self, values):
+        """Global ids for a chunk's values, registering new ones."""
+        ids = self.ids
+        return np.fromiter((ids.setdefault(value, len(ids)) for value in values),
+                           dtype=np.int64, count=len(values))
+
+    @property
+    def values(self):
+        return pd.Index(list(self.ids), dtype=object)
+
+
+class EntityTally:
+    """Running link counts per entity of one bridge kind."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.vocab = _Vocabulary()
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def add(self, bridge):
+        """Fold one chunk's bridge in; returns its links' global entity ids."""
+        entity_id = self.vocab.map(bridge.vocab)[bridge.entity_id]
+        if len(self.vocab) > len(self.counts):
+            grown = np.zeros(max(len(self.vocab), 2 * len(self.counts)), dtype=np.int64)
+            grown[:len(self.counts)] = self.counts
+            self.counts = grown
+        self.counts += np.bincount(entity_id, minlength=len(self.counts))
+        return entity_id
+
+    def value_counts(self):
+        """Same result as ``EntityBridge.value_counts`` over the whole catalog."""
+        counts = pd.Series(self.counts[:len(self.vocab)], index=self.vocab.values.rename(self.kind),
+                           name="count")
+        return counts.sort_values(ascending=False, kind="stable")
+
+    def top(self, n, exclude=()):
+        counts = self.value_counts()
+        if exclude:
+            counts = counts[~counts.index.isin(list(exclude))]
+        return counts.head(n)
+
+
+def _fold(total, part):
+    """Add a chunk's keyed counts into a running Counter, keeping first-seen order.
+
+    Categories a chunk does not contain count zero and are skipped.
+    """
+    total.update(part[part > 0].to_dict())
+    return total
+
+
+def _counter_frame(counter, columns):
+    """Sorted frame of a Counter keyed by tuples, plus a Count column."""
+    if not counter:
+        return pd.DataFrame(columns=columns + ["Count"])
+    index = pd.MultiIndex.from_tuples(list(counter), names=columns)
+    counts = pd.Series(list(counter.values()), index=index, name="Count", dtype=np.int64)
+    return counts.sort_index().reset_index()
+
+
+class CatalogAggregates:
+    """Everything the dashboard's aggregate views need, folded chunk by chunk.
+
+    The query methods mirror the matching ``analytics`` functions and return
+    the same frames and dicts for the same catalog.
+    """
+
+    def __init__(self, kinds=DEFAULT_KINDS):
+        self.kinds = tuple(dict.fromkeys(("country", "genre") + tuple(kinds)))
+        self.n_rows = 0
+        self.chunks = 0
+        self.tallies = {kind: EntityTally(kind) for kind in self.kinds}
+        self.counts = {name: collections.Counter() for name in (
+            "type", "country_raw", "listed_in_raw", "rating", "audience",
+            "audience_type", "added_year_type", "month", "release_year_type",
+            "country_type", "genre_country")}
+        # (titles, release_year sum, release_year count) per audience
+        self.audience_years = {}
+        self.durations = {content_type: collections.Counter() for content_type in analytics.CONTENT_TYPES}
+        self.type_values = _Vocabulary()
+        self.audience_values = _Vocabulary()
+        self.country_values = _Vocabulary()
+        self.cube_partials = None
+
+    def __len__(self):
+        return self.n_rows
+
+    def add(self, chunk):
+        """Fold one preprocessed chunk in."""
+        offset, self.n_rows = self.n_rows, self.n_rows + len(chunk)
+        self.chunks += 1
+        counts = self.counts
+
+        _fold(counts["type"], chunk["type"].value_counts(sort=False))
+        _fold(counts["country_raw"], chunk["country"].value_counts(sort=False))
+        _fold(counts["listed_in_raw"], chunk["listed_in"].value_counts(sort=False))
+        _fold(counts["rating"], chunk["rating"].value_counts(sort=False))
+        _fold(counts["audience"], chunk["Content_For"].value_counts(sort=False))
+        _fold(counts["audience_type"], chunk.groupby(["Content_For", "type"], sort=False, observed=True).size())
+        _fold(counts["added_year_type"], chunk.groupby(["year_added", "type"], sort=False, observed=True).size())
+        _fold(counts["month"], chunk["month_added"].value_counts(sort=False))
+        _fold(counts["release_year_type"], chunk.groupby(["release_year", "type"], sort=False, observed=True).size())
+
+        years = chunk.groupby("Content_For", sort=False, observed=True).agg(
+            titles=("title", "count"), year_sum=("release_year", "sum"), year_count=("release_year", "count"))
+        for audience, row in years.iterrows():
+            before = self.audience_years.get(audience, (0, 0, 0))
+            self.audience_years[audience] = tuple(a + int(b) for a, b in zip(before, row))
+
+        for content_type, column in analytics.DURATION_COLUMNS.items():
+            values = chunk.loc[chunk["type"] == content_type, column].dropna()
+            _fold(self.durations[content_type], values.value_counts(sort=False))
+
+        bridges = {kind: EntityBridge.from_series(kind, chunk[BRIDGE_COLUMNS[kind]]) for kind in self.kinds}
+        entity_ids = {kind: self.tallies[kind].add(bridge) for kind, bridge in bridges.items()}
+
+        # Titles per (country, type), each title counted once per country as the index does
+        country = bridges["country"]
+        types = chunk["type"].to_numpy(dtype=object)
+        pairs = pd.DataFrame({"title": country.title_idx, "country": entity_ids["country"]}).drop_duplicates()
+        country_type = pd.DataFrame({
+            "country": pairs["country"].to_numpy(),
+            "type": types[pairs["title"].to_numpy()],
+        }).dropna().groupby(["country", "type"], sort=False, observed=True).size()
+        _fold(counts["country_type"], country_type)
+
+        # Genre x country title counts, mapped from the chunk's ids to global ids
+        genre = bridges["genre"]
+        block = (cooccurrence.incidence_matrix(genre).T @ cooccurrence.incidence_matrix(country)).tocoo()
+        genre_ids = self.tallies["genre"].vocab.map(genre.vocab)
+        country_ids = self.tallies["country"].vocab.map(country.vocab)
+        _fold(counts["genre_country"], pd.Series(
+            block.data, index=pd.MultiIndex.from_arrays([genre_ids[block.row], country_ids[block.col]])))
+
+        # Saturation cube partials in global code spaces
+        links, type_values, audience_values, country_values = cube.cube_links(chunk, genre, offset)
+        links["genre"] = genre_ids[links["genre"].to_numpy()]
+        for column, vocab, values in (("type", self.type_values, type_values),
+                                      ("audience", self.audience_values, audience_values),
+                                      ("country", self.country_values, country_values)):
+            links[column] = vocab.map(values)[links[column].to_numpy()]
+        # Types and audiences seen only on rows without genres still take a code, as factorize does
+        self.type_values.map(type_values)
+        self.audience_values.map(audience_values)
+        self.country_values.map(country_values)
+        partials = cube.cube_partials(links)
+        self.cube_partials = partials if self.cube_partials is None else cube.merge_partials(
+            self.cube_partials, partials)
+
+    # --- Queries, mirroring netflix_core.analytics ---
+
+    def kpis(self):
+        types = self.counts["type"]
+        total = self.n_rows
+        movies = int(types.get("Movie", 0))
+        tv_shows = int(types.get("TV Show", 0))
+        countries = self.counts["country_raw"]
+        top = max(countries.values())
+        years = [year for year, _ in self.counts["release_year_type"]]
+        return {
+            "total_titles": total,
+            "movies": movies,
+            "tv_shows": tv_shows,
+            "movie_pct": movies / total * 100 if total else 0.0,
+            "tv_pct": tv_shows / total * 100 if total else 0.0,
+            "countries": len(countries),
+            "genres": len(self.counts["listed_in_raw"]),
+            # Series.mode() breaks ties by sorting the values
+            "top_market": min(name for name, n in countries.items() if n == top),
+            "earliest_release": int(min(years)),
+            "latest_release": int(max(years)),
+        }
+
+    def _value_counts(self, name, label):
+        frame = pd.DataFrame(self.counts[name].most_common(), columns=[label, "Count"])
+        frame["Count"] = frame["Count"].astype(np.int64)
+        return frame
+
+    def type_distribution(self):
+        return analytics._with_percentage(self._value_counts("type", "Type"))
+
+    def top_entities(self, kind, n, exclude=(), label=None):
+        counts = self.tallies[kind].top(n, exclude=list(exclude))
+        return analytics._counts_frame(counts, [label or kind.capitalize(), "Count"])
+
+    def country_type_counts(self, n_countries=5):
+        vocab = self.tallies["country"].vocab
+        types = sorted(self.type_values.ids)
+        counts = self.counts["country_type"]
+        rows = []
+        for country in self.tallies["country"].top(n_countries, exclude=["Unknown"]).index:
+            for content_type in types:
+                count = counts.get((vocab.ids[country], content_type), 0)
+                if count:
+                    rows.append({"Country": country, "Type": content_type, "Count": count})
+        return pd.DataFrame(rows)
+
+    def audience_distribution(self):
+        return analytics._with_percentage(self._value_counts("audience", "Audience"))
+
+    def rating_counts(self, n=10):
+        return self._value_counts("rating", "Rating").head(n)
+
+    def audience_by_type(self):
+        counts = _counter_frame(self.counts["audience_type"], ["Content_For", "type"])
+        # Audiences in the schema's order, as the categorical groupby gives them
+        rank = {audience: i for i, audience in enumerate(schema.AUDIENCES)}
+        counts = counts.sort_values("Content_For", key=lambda audience: audience.map(rank), kind="stable")
+        return counts.reset_index(drop=True)
+
+    def audience_stats(self):
+        stats = pd.DataFrame([
+            {"Audience": audience, "Total Content": titles,
+             "Avg Release Year": year_sum / year_count if year_count else np.nan}
+            for audience, (titles, year_sum, year_count) in sorted(self.audience_years.items())
+        ])
+        return stats.sort_values("Total Content", ascending=False)
+
+    def additions_by_year(self):
+        return _counter_frame(self.counts["added_year_type"], ["year_added", "type"]).dropna()
+
+    def monthly_additions(self):
+        counts = self._value_counts("month", "Month")
+        counts["Month"] = pd.Categorical(counts["Month"], categories=analytics.MONTHS, ordered=True)
+        return counts.sort_values("Month")
+
+    def release_year_counts(self, years=30):
+        counts = _counter_frame(self.counts["release_year_type"], ["release_year", "type"])
+        return counts[counts["release_year"] >= counts["release_year"].max() - years].reset_index(drop=True)
+
+    def recent_release_share(self, years=5):
+        counts = self.counts["release_year_type"]
+        latest = max(year for year, _ in counts)
+        recent = sum(n for (year, _), n in counts.items() if year >= latest - years)
+        return recent, recent / self.n_rows * 100
+
+    def duration_histogram(self, content_type):
+        """Titles per duration value (minutes for movies, seasons for TV), ascending."""
+        counts = pd.Series(self.durations[content_type], dtype=np.int64)
+        return counts.sort_index().rename_axis(analytics.DURATION_COLUMNS[content_type]).rename("Count")
+
+    def duration_stats(self, content_type):
+        histogram = self.duration_histogram(content_type)
+        values = histogram.index.to_numpy(dtype=np.float64)
+        weights = histogram.to_numpy()
+        total = weights.sum()
+        # Median as pandas takes it: the mean of the two middle values for an even count
+        cumulative = np.cumsum(weights)
+        lower = values[np.searchsorted(cumulative, (total - 1) // 2 + 1)]
+        upper = values[np.searchsorted(cumulative, total // 2 + 1)]
+        return {
+            "mean": float((values * weights).sum() / total),
+            "median": float((lower + upper) / 2),
+            "mode": float(values[weights == weights.max()].min()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+        }
+
+    def genre_country_block(self, top_n=10):
+        """Same block as ``CooccurrenceMatrix.top_block`` for genre x country."""
+        genres = self.tallies["genre"]
+        countries = self.tallies["country"]
+        rows = sorted(genres.value_counts().head(top_n).index)
+        cols = sorted(c for c in countries.value_counts().head(top_n).index if c != "Unknown")
+        counts = self.counts["genre_country"]
+        values = np.array([[counts.get((genres.vocab.ids[g], countries.vocab.ids[c]), 0) for c in cols]
+                           for g in rows], dtype=np.int32).reshape(len(rows), len(cols))
+        block = pd.DataFrame(values, index=pd.Index(rows, name="genre"),
+                             columns=pd.Index(cols, name="country"))
+        return block.loc[block.sum(axis=1) > 0, block.sum(axis=0) > 0]
+
+    @property
+    def saturation_cube(self):
+        stats, markets = self.cube_partials
+        return cube.finish_cube(stats, markets, self.tallies["genre"].vocab.values.to_numpy(),
+                                self.type_values.values, self.audience_values.values,
+                                self.country_values.values)
+
+    def opportunity_ranking(self):
+        return cube.ranked_opportunities(self.saturation_cube)
+
+
+def read_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Preprocessed chunks of the catalog CSV at ``path``."""
+    with pd.read_csv(path, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            yield preprocess(chunk)
+
+
+def stream_aggregates(path, chunk_rows=CHUNK_ROWS, kinds=DEFAULT_KINDS):
+    """Aggregate the catalog at ``path`` without ever holding it in memory."""
+    aggregates = CatalogAggregates(kinds)
+    for chunk in read_chunks(path, chunk_rows):
+        aggregates.add(chunk)
+    return aggregates
+
+
+def should_stream(path, threshold=None):
+    """True if the CSV at ``path`` is larger than ``threshold`` bytes (default ``STREAMING_BYTES``)."""
+    threshold = STREAMING_BYTES if threshold is None else threshold
+    return threshold > 0 and os.path.getsize(path) > threshold
+
+
+def verify(aggregates, catalog):
+    """Names of the aggregate views that differ from ``analytics`` on ``catalog``."""
+    # Chunks cannot see duplicates across each other, so only the headline KPIs are compared
+    snapshot = analytics.kpis(catalog)
+    checks = {
+        "kpis": (aggregates.kpis(), {key: getattr(snapshot, key) for key in kpis.HEADLINE_FIELDS}),
+        "type_distribution": (aggregates.type_distribution(), analytics.type_distribution(catalog)),
+        "top_genres": (aggregates.top_entities("genre", 15), analytics.top_entities(catalog, "genre", 15)),
+        "top_countries": (aggregates.top_entities("country", 15, exclude=["Unknown"]),
+                          analytics.top_entities(catalog, "country", 15, exclude=["Unknown"])),
+        "country_type_counts": (aggregates.country_type_counts(), analytics.country_type_counts(catalog)),
+        "audience_distribution": (aggregates.audience_distribution(), analytics.audience_distribution(catalog)),
+        "rating_counts": (aggregates.rating_counts(), analytics.rating_counts(catalog)),
+        "audience_by_type": (aggregates.audience_by_type(), analytics.audience_by_type(catalog)),
+        "audience_stats": (aggregates.audience_stats(), analytics.audience_stats(catalog)),
+        "additions_by_year": (aggregates.additions_by_year(), analytics.additions_by_year(catalog)),
+        "monthly_additions": (aggregates.monthly_additions(), analytics.monthly_additions(catalog)),
+        "release_year_counts": (aggregates.release_year_counts(), analytics.release_year_counts(catalog)),
+        "recent_release_share": (aggregates.recent_release_share(), analytics.recent_release_share(catalog)),
+        "genre_country_block": (aggregates.genre_country_block(), analytics.genre_country_block(catalog)),
+        "saturation_cube": (aggregates.saturation_cube, catalog.saturation_cube),
+    }
+    for content_type in analytics.CONTENT_TYPES:
+        expected = analytics.durations(catalog, content_type).dropna().value_counts().sort_index()
+        checks[f"duration_histogram:{content_type}"] = (aggregates.duration_histogram(content_type).to_numpy(),
+                                                        expected.to_numpy())
+        checks[f"duration_stats:{content_type}"] = (
+            aggregates.duration_stats(content_type),
+            {k: float(v) for k, v in analytics.duration_stats(catalog, content_type).items()})
+
+    mismatches = []
+    for name, (got, expected) in checks.items():
+        if isinstance(got, pd.DataFrame):
+            got, expected = got.reset_index(drop=True), expected.reset_index(drop=True)
+            same = got.shape == expected.shape and np.array_equal(
+                got.astype(str).to_numpy(), expected.astype(str).to_numpy())
+        elif isinstance(got, np.ndarray):
+            same = np.array_equal(got, expected)
+        else:
+            same = got == expected
+        if not same:
+            mismatches.append(name)
+    return mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate a catalog CSV in bounded-memory chunks.")
+    parser.add_argument("path", nargs="?", default="netflix.csv")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--kinds", default=",".join(DEFAULT_KINDS),
+                        help="entity tallies to keep, e.g. country,genre,cast,director")
+    parser.add_argument("--verify", action="store_true",
+                        help="also load the catalog in memory and compare every view")
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    aggregates = stream_aggregates(args.path, args.chunk_rows, args.kinds.split(","))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"Streamed {len(aggregates):,} rows in {aggregates.chunks} chunks of {args.chunk_rows:,}: "
+          f"{elapsed:.1f}s, peak {peak / 2**20:.1f} MB")
+
+    if not args.verify:
+        return 0
+    from netflix_core.catalog import Catalog, read_catalog
+    mismatches = verify(aggregates, Catalog(read_catalog(args.path)))
+    for name in mismatches:
+        print(f"MISMATCH: {name}")
+    if not mismatches:
+        print("All aggregate views match the in-memory catalog")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Deterministic synthetic catalogs with the schema of ``netflix.csv``.
+
+A ``CatalogProfile`` captures the marginal distributions of a real raw
+catalog, per content type where they differ:
+
+- type mix, ratings, genres and genres per title;
+- countries per title, cast and director list lengths, missing rates;
+- release years, the ``date_added`` calendar and raw duration strings;
+- the source's formatting quirks: leading spaces in ``date_added``, and
+  durations that landed in the ``rating`` column.
+
+``write_catalog`` samples from a profile in fixed-size chunks, each with
+its own seeded generator, so any size up to tens of millions of rows
+streams to disk in bounded memory. The same (profile, n_rows, seed)
+always yields the same file.
+
+Cast and director names come from a synthetic pool that grows with the
+catalog, with a power-law popularity so a few names recur often. Titles
+and descriptions are placeholders of realistic length.
+"""
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ROWS = 100_000
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+COLUMNS = ["show_id", "type", "title", "director", "cast", "country", "date_added",
+           "release_year", "rating", "duration", "listed_in", "description"]
+
+# Unique names per catalog row in netflix.csv (about 36k cast, 5k directors over 8.8k rows)
+CAST_POOL_PER_ROW = 4.1
+DIRECTOR_POOL_PER_ROW = 0.6
+
+_WORDS = ("a young an old the family city secret journey love war life story friends "
+          "mystery must find their when after who lost new world team home power dark "
+          "past future small town brothers sisters mother father documentary explores").split()
+
+
+def _distribution(series):
+    counts = series.value_counts(normalize=True, sort=True)
+    return counts.index.to_numpy(), counts.to_numpy(dtype=np.float64)
+
+
+def _list_lengths(series):
+    """Distribution of list lengths; missing values count as length 0."""
+    return _distribution(series.str.split(", ").str.len().fillna(0).astype(np.int64))
+
+
+class CatalogProfile:
+    """Marginal distributions of a raw catalog, used to sample synthetic rows."""
+
+    def __init__(self, df):
+        self.types = _distribution(df["type"])
+        self.by_type = {}
+        for content_type, group in df.groupby("type", observed=True):
+            genres = group["listed_in"].dropna().str.split(", ").explode()
+            clean = group["duration"].notna()
+            self.by_type[content_type] = {
+                "rating": _distribution(group.loc[clean, "rating"]),
+                "duration": _distribution(group.loc[clean, "duration"]),
+                "genre": _distribution(genres),
+                "genre_count": _list_lengths(group["listed_in"]),
+                "swapped_duration": float((~clean).mean()),
+            }
+        self.country = _distribution(df["country"].dropna().str.split(", ").explode())
+        self.country_count = _list_lengths(df["country"])
+        self.cast_count = _list_lengths(df["cast"])
+        self.director_count = _list_lengths(df["director"])
+        self.release_year = _distribution(df["release_year"])
+
+        dates = df["date_added"]
+        parsed = pd.to_datetime(dates.str.strip(), format="%B %d, %Y", errors="coerce")
+        self.added_year = _distribution(parsed.dt.year.dropna().astype(np.int64))
+        self.added_month = _distribution(parsed.dt.month.dropna().astype(np.int64))
+        self.date_missing = float(dates.isna().mean())
+        self.date_leading_space = float(dates.dropna().str.startswith(" ").mean())
+        self.description_length = int(df["description"].str.len().median())
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(pd.read_csv(path))
+
+
+def _sample(rng, distribution, size):
+    values, probs = distribution
+    return values[rng.choice(len(values), size=size, p=probs)]
+
+
+def _distinct_sample(rng, distribution, counts):
+    """Per row, ``counts[i]`` distinct values drawn by weight (Gumbel top-k)."""
+    values, probs = distribution
+    out = np.empty(len(counts), dtype=object)
+    log_p = np.log(probs).astype(np.float32)
+    for k in np.unique(counts):
+        rows = np.flatnonzero(counts == k)
+        if k == 0:
+            out[rows] = None
+            continue
+        # A zero draw gives a -inf key, which is simply never picked
+        with np.errstate(divide="ignore"):
+            keys = log_p - np.log(-np.log(rng.random((len(rows), len(values)), dtype=np.float32)))
+        top = np.argpartition(-keys, k - 1, axis=1)[:, :k]
+        out[rows] = _join(values[top])
+    return out
+
+
+def _pool_sample(rng, prefix, pool_size, counts):
+    """Per row, ``counts[i]`` names from a power-law popular pool."""
+    out = np.empty(len(counts), dtype=object)
+    for k in np.unique(counts):
+        rows = np.flatnonzero(counts == k)
+        if k == 0:
+            out[rows] = None
+            continue
+        ids = (pool_size * rng.random((len(rows), k)) ** 2).astype(np.int64)
+        out[rows] = _join(np.char.add(prefix, ids.astype(str)))
+    return out
+
+
+def _join(matrix):
+    """Join each row of a 2-D string array with ', '."""
+    joined = matrix[:, 0].astype(object)
+    for j in range(1, matrix.shape[1]):
+        joined = joined + ", " + matrix[:, j].astype(object)
+    return joined
+
+
+def _descriptions(rng, length, n=512):
+    """A pool of placeholder descriptions around ``length`` characters."""
+    pool = []
+    for _ in range(n):
+        words, size = [], 0
+        while size < length:
+            word = _WORDS[rng.integers(len(_WORDS))]
+            words.append(word)
+            size += len(word) + 1
+        pool.append(" ".join(words).capitalize() + ".")
+    return np.array(pool, dtype=object)
+
+
+def generate_chunk(profile, start, n_rows, total_rows, seed=0):
+    """Rows ``start .. start + n_rows`` of a ``total_rows`` synthetic catalog."""
+    rng = np.random.default_rng([seed, start])
+    ids = np.arange(start + 1, start + n_rows + 1)
+    types = _sample(rng, profile.types, n_rows)
+
+    rating = np.empty(n_rows, dtype=object)
+    duration = np.empty(n_rows, dtype=object)
+    listed_in = np.empty(n_rows, dtype=object)
+    for content_type, dist in profile.by_type.items():
+        rows = np.flatnonzero(types == content_type)
+        rating[rows] = _sample(rng, dist["rating"], len(rows))
+        duration[rows] = _sample(rng, dist["duration"], len(rows))
+        listed_in[rows] = _distinct_sample(rng, dist["genre"], _sample(rng, dist["genre_count"], len(rows)))
+        # Reproduce the source's rows whose duration sits in the rating column
+        swapped = rows[rng.random(len(rows)) < dist["swapped_duration"]]
+        rating[swapped] = duration[swapped]
+        duration[swapped] = None
+
+    release_year = _sample(rng, profile.release_year, n_rows)
+    added_year = np.maximum(_sample(rng, profile.added_year, n_rows), release_year)
+    added = pd.Series(np.asarray(MONTHS, dtype=object)[_sample(rng, profile.added_month, n_rows) - 1])
+    added = added + " " + pd.Series(rng.integers(1, 29, n_rows)).astype(str) + ", " + pd.Series(added_year).astype(str)
+    added = added.to_numpy(dtype=object)
+    padded = rng.random(n_rows) < profile.date_leading_space
+    added[padded] = " " + added[padded]
+    added[rng.random(n_rows) < profile.date_missing] = None
+
+    return pd.DataFrame({
+        "show_id": np.char.add("s", ids.astype(str)).astype(object),
+        "type": types,
+        "title": np.char.add("Synthetic Title ", ids.astype(str)).astype(object),
+        "director": _pool_sample(rng, "Director ", max(1, int(total_rows * DIRECTOR_POOL_PER_ROW)),
+                                 _sample(rng, profile.director_count, n_rows)),
+        "cast": _pool_sample(rng, "Performer ", max(1, int(total_rows * CAST_POOL_PER_ROW)),
+                             _sample(rng, profile.cast_count, n_rows)),
+        "country": _distinct_sample(rng, profile.country, _sample(rng, profile.country_count, n_rows)),
+        "date_added": added,
+        "release_year": release_year,
+        "rating": rating,
+        "duration": duration,
+        "listed_in": listed_in,
+        "description": _descriptions(rng, profile.description_length)[rng.integers(512, size=n_rows)],
+    }, columns=COLUMNS)
+
+
+def generate(profile, n_rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """An in-memory synthetic catalog of ``n_rows`` rows."""
+    return pd.concat([generate_chunk(profile, start, min(chunk_rows, n_rows - start), n_rows, seed)
+                      for start in range(0, n_rows, chunk_rows)], ignore_index=True)
+
+
+def write_catalog(path, profile, n_rows, seed=0, chunk_rows=CHUNK_ROWS):
+    """Stream a synthetic catalog of ``n_rows`` rows to a CSV at ``path``."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as fh:
+        for start in range(0, n_rows, chunk_rows):
+            chunk = generate_chunk(profile, start, min(chunk_rows, n_rows - start), n_rows, seed)
+            chunk.to_csv(fh, header=start == 0, index=False)
+    os.replace(tmp_path, path)
+    logger.info(f"Wrote {n_rows:,} synthetic rows to {path}")
+    return path
@@ -0,0 +1,13 @@
+import os
+
+import pytest
+
+from netflix_core.catalog import Catalog
+
+NETFLIX_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "netflix.csv")
+
+
+@pytest.fixture(scope="session")
+def catalog(tmp_path_factory):
+    """The bundled catalog, with a private snapshot directory and no shared store."""
+    return Catalog.from_path(NETFLIX_CSV, cache_dir=str(tmp_path_factory.mktemp("snapshots")), shared_dir="")
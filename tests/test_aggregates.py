@@ -0,0 +1,104 @@
+"""Analytics of a row selection equal the same analytics over a catalog of those rows."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from netflix_core import analytics
+from netflix_core.catalog import Catalog
+from netflix_core.filters import Filters
+from netflix_core.kpis import KpiSnapshot
+
+SELECTIONS = [
+    {"countries": ["Japan"], "types": ["TV Show"]},
+    {"types": ["Movie"]},
+    {"countries": ["India"]},
+    {"genres": ["Dramas"], "countries": ["United States"]},
+    {"genres": ["Anime Series", "Kids' TV"]},
+    {"ratings": ["TV-MA", "R"], "release_years": (2015, 2021)},
+    {"audiences": ["Kids"]},
+]
+
+COUNTS = [
+    ("type_distribution", ()),
+    ("audience_distribution", ()),
+    ("rating_counts", (10,)),
+    ("country_type_counts", (5,)),
+    ("audience_by_type", ()),
+    ("additions_by_year", ()),
+    ("monthly_additions", ()),
+    ("release_year_counts", (30,)),
+]
+
+
+def _selected(catalog, selection):
+    filters = Filters.make(**selection)
+    engine = catalog.filter_engine
+    return engine.bitmap(filters), catalog.subset(engine.rows(filters))
+
+
+@pytest.mark.parametrize("selection", SELECTIONS, ids=repr)
+@pytest.mark.parametrize("top_n", [5, 10])
+def test_genre_country_block_matches_subset(catalog, selection, top_n):
+    bitmap, subset = _selected(catalog, selection)
+    block = analytics.genre_country_block(catalog, top_n, selection=bitmap)
+    expected = subset.cooccurrence("genre", "country").top_block(top_n, top_n, exclude_cols=["Unknown"])
+    assert block.shape[0] <= top_n and block.shape[1] <= top_n
+    pd.testing.assert_frame_equal(block, expected)
+
+
+def test_genre_country_block_of_everything_matches_selection_path(catalog):
+    everything = catalog.index.all_rows()
+    pd.testing.assert_frame_equal(analytics.genre_country_block(catalog, 10, selection=everything),
+                                  analytics.genre_country_block(catalog, 10))
+
+
+@pytest.mark.parametrize("selection", SELECTIONS, ids=repr)
+def test_counts_match_subset(catalog, selection):
+    bitmap, subset = _selected(catalog, selection)
+    for name, args in COUNTS:
+        function = getattr(analytics, name)
+        pd.testing.assert_frame_equal(function(catalog, *args, selection=bitmap), function(subset, *args), obj=name)
+    for kind in ("country", "genre", "director"):
+        pd.testing.assert_frame_equal(analytics.top_entities(catalog, kind, 10, ["Unknown"], selection=bitmap),
+                                      analytics.top_entities(subset, kind, 10, ["Unknown"]), obj=kind)
+
+
+@pytest.mark.parametrize("selection", SELECTIONS, ids=repr)
+def test_kpis_and_tables_match_subset(catalog, selection):
+    bitmap, subset = _selected(catalog, selection)
+    expected = subset.kpis._replace(memory_mb=catalog.kpis.memory_mb)
+    assert analytics.kpis(catalog, selection=bitmap)._replace(version=None) == expected
+    for name in ("numeric_summary", "categorical_summary", "audience_stats", "opportunity_ranking"):
+        function = getattr(analytics, name)
+        pd.testing.assert_frame_equal(function(catalog, selection=bitmap), function(subset), obj=name)
+    assert analytics.recent_release_share(catalog, 5, selection=bitmap) == analytics.recent_release_share(subset, 5)
+    pd.testing.assert_frame_equal(analytics.head(catalog, 10, selection=bitmap).reset_index(drop=True),
+                                  subset.df.head(10).reset_index(drop=True))
+
+
+@pytest.mark.parametrize("selection", SELECTIONS, ids=repr)
+def test_simulator_matches_subset(catalog, selection):
+    bitmap, subset = _selected(catalog, selection)
+    for genre, content_type, audience in [("Dramas", "Movie", "Adults"), ("Kids' TV", "TV Show", "Kids"),
+                                          ("International Movies", "Movie", "Teens")]:
+        metrics, examples = analytics.simulate(catalog, genre, content_type, audience, selection=bitmap)
+        expected_metrics, expected_examples = analytics.simulate(subset, genre, content_type, audience)
+        if expected_metrics is None:
+            assert metrics is None
+        else:
+            pd.testing.assert_series_equal(metrics, expected_metrics)
+        assert examples["title"].tolist() == expected_examples["title"].tolist()
+
+
+def test_selection_kpis_count_duplicates_and_missing(catalog):
+    # Repeated rows, so every selection below has duplicates to count
+    rows = np.concatenate([np.arange(300), np.arange(0, 300, 7), np.arange(150, 200)])
+    duplicated = Catalog(catalog.df.take(rows).reset_index(drop=True), version="dup")
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        selected = np.flatnonzero(rng.random(len(duplicated)) < 0.6)
+        bitmap = np.packbits(np.isin(np.arange(len(duplicated)), selected))
+        expected = KpiSnapshot.from_frame(duplicated.df.take(selected))
+        actual = KpiSnapshot.from_selection(duplicated, bitmap)
+        assert actual.duplicates == expected.duplicates > 0
+        assert actual._replace(memory_mb=expected.memory_mb) == expected
@@ -0,0 +1,17 @@
+"""Date parsing stays correct when its cache of distinct values overflows."""
+import pandas as pd
+
+from netflix_core import dates
+
+
+def test_cache_overflow_keeps_cached_values(monkeypatch):
+    monkeypatch.setattr(dates, "CACHE_SIZE", 3)
+    monkeypatch.setattr(dates, "_CACHE", {})
+    dates.parse_dates(pd.Series(["January 1, 2020", "February 2, 2020"]))
+    # One cached value plus two unseen ones overflow the cache of three
+    values = pd.Series(["January 1, 2020", "March 3, 2020", "April 4, 2020", None])
+    parsed, report = dates.parse_dates(values)
+    expected = pd.to_datetime(pd.Series(["2020-01-01", "2020-03-03", "2020-04-04", None])).astype("datetime64[us]")
+    pd.testing.assert_series_equal(parsed, expected)
+    assert report["exact"] == 3 and report["missing"] == 1
+    assert len(dates._CACHE) <= 3
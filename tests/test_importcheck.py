@@ -0,0 +1,17 @@
+"""The dashboard's cold start defers its heavy imports (see ``netflix_core.importcheck``).
+
+The time budget depends on the machine, so only the CLI checks it.
+"""
+import os
+
+from netflix_core import importcheck
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "netflix_app.py")
+
+
+def test_app_imports_defer_charting_modules():
+    assert importcheck.measure(APP, repeat=1)["loaded"] == []
+
+
+def test_core_imports_defer_plotly_scipy_pyarrow():
+    assert importcheck.core_loaded(APP) == []
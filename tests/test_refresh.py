@@ -0,0 +1,56 @@
+"""Refreshing a catalog whose CSV grew equals loading the grown CSV from scratch."""
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+from netflix_core import aggregates, snapshot
+from netflix_core.catalog import Catalog, CatalogSource, read_catalog
+from netflix_core.kpis import KpiSnapshot
+
+from conftest import NETFLIX_CSV
+
+
+def _write(path, rows, mode="w"):
+    with open(path, mode, encoding="utf-8", newline="") as fh:
+        csv.writer(fh, lineterminator="\n").writerows(rows)
+
+
+def _assert_same_engine(extended, fresh):
+    for column in aggregates.COLUMNS:
+        assert extended.labels[column].equals(fresh.labels[column])
+        assert np.array_equal(extended.codes[column], fresh.codes[column])
+    for name, counts in fresh.full.arrays.items():
+        assert np.array_equal(extended._measures[name][0], fresh._measures[name][0]), name
+        assert np.array_equal(extended.full.arrays[name], counts), name
+
+
+def test_appended_rows_extend_catalog_and_snapshot(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, "SNAPSHOT_SEGMENTS", 2)
+    with open(NETFLIX_CSV, encoding="utf-8", newline="") as fh:
+        rows = list(csv.reader(fh))
+    path, cache_dir = str(tmp_path / "catalog.csv"), str(tmp_path / "snapshots")
+    _write(path, rows[:4000])
+    source = CatalogSource(path, cache_dir, shared_dir="")
+    source.get().warm("aggregates", "saturation_cube", "kpis")
+
+    depths = []
+    for start, stop in ((4000, 5000), (5000, 6000), (6000, len(rows))):
+        # Repeat earlier rows and a new one so the appended rows hold duplicates
+        _write(path, rows[start:stop] + rows[1:4] + rows[start:start + 1], "a")
+        refreshed = source.get()
+        full = read_catalog(path)
+        fresh = Catalog(full)
+        pd.testing.assert_frame_equal(refreshed.df, full)
+        # The concatenated frame is laid out differently, so only its memory differs
+        assert refreshed.kpis._replace(version=None, memory_mb=0) == KpiSnapshot.from_frame(full)._replace(memory_mb=0)
+        _assert_same_engine(refreshed.aggregates, fresh.aggregates)
+        pd.testing.assert_frame_equal(refreshed.saturation_cube, fresh.saturation_cube)
+
+        stored = snapshot.snapshot_path(path, refreshed.version, cache_dir)
+        depths.append(snapshot.segments(stored))
+        assert len(snapshot.chain(stored)) == depths[-1] + 1 == len(os.listdir(cache_dir))
+        pd.testing.assert_frame_equal(snapshot.read_snapshot(stored, refreshed.version), full)
+    # Past SNAPSHOT_SEGMENTS the whole frame is written again
+    assert depths == [1, 2, 0]
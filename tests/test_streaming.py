@@ -0,0 +1,26 @@
+"""The streamed aggregates behind the dashboard's streaming mode equal the in-memory views."""
+import numpy as np
+
+from netflix_core import analytics, figures, streaming
+
+from conftest import NETFLIX_CSV
+
+
+def test_streamed_views_match_catalog(catalog):
+    streamed = streaming.stream_aggregates(NETFLIX_CSV, chunk_rows=2000)
+    assert streaming.verify(streamed, catalog) == []
+
+
+def test_weighted_duration_bins_match_raw_values(catalog):
+    streamed = streaming.stream_aggregates(NETFLIX_CSV, chunk_rows=2000)
+    for content_type, nbins in (("Movie", 30), ("TV Show", 15)):
+        histogram = streamed.duration_histogram(content_type)
+        weighted = figures.histogram_bins(histogram.index.to_numpy(dtype=np.float64), nbins, histogram.to_numpy())
+        raw = figures.histogram_bins(analytics.durations(catalog, content_type), nbins)
+        assert np.array_equal(weighted[0], raw[0]) and np.array_equal(weighted[1], raw[1])
+
+
+def test_should_stream_above_threshold():
+    assert not streaming.should_stream(NETFLIX_CSV, threshold=0)
+    assert streaming.should_stream(NETFLIX_CSV, threshold=1000)
+    assert not streaming.should_stream(NETFLIX_CSV, threshold=1 << 40)